@@ -5,13 +5,21 @@ This file contains all the admins for attendance module
 from django.contrib import admin
 from django.contrib.admin import ModelAdmin
 
-from attendance.models import Attendance
+from attendance.models import Attendance, AttendanceRollup
 
 
 @admin.register(Attendance)
 class AttendanceAdmin(ModelAdmin):
-    list_display = ("id", "roster_user_schedule", "image")
+    list_display = ("id", "roster_user_schedule", "image", "image_status")
+    list_filter = ("image_status",)
     search_fields = (
         "roster_user_schedule__user__email",
         "roster_user_schedule__roster__title",
     )
+
+
+@admin.register(AttendanceRollup)
+class AttendanceRollupAdmin(ModelAdmin):
+    list_display = ("id", "roster", "user", "date", "shift", "is_late")
+    list_filter = ("shift", "is_late")
+    search_fields = ("user__email", "roster__title")
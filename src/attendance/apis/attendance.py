@@ -2,30 +2,63 @@
 This file contains all the APIs related to attendance model
 """
 
+from datetime import timedelta
+
+from django.conf import settings
 from django.core.validators import FileExtensionValidator
+from django.utils.timezone import now
 from rest_framework import serializers
-from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_202_ACCEPTED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+)
 from rest_framework.views import APIView
 
+from attendance.constants import (
+    ATTENDANCE_SYNC_MAX_AGE_DAYS,
+    ATTENDANCE_TIME_CANNOT_BE_IN_FUTURE,
+    ATTENDANCE_TIME_TOO_OLD,
+    DUPLICATE_IDEMPOTENCY_KEY,
+    EXPECTED_NON_EMPTY_LIST,
+    IMAGE_INDEX_OUT_OF_RANGE,
+    MAX_ATTENDANCE_BATCH_SIZE,
+    MAX_BATCH_SIZE_EXCEEDED,
+    RECORD_DUPLICATE,
+    RECORD_INVALID,
+)
 from attendance.models import Attendance
 from attendance.serializers import AttendanceSerializer
-from attendance.services import create_attendance
+from attendance.services import (
+    bulk_create_attendances,
+    create_attendance,
+    get_synced_attendance_ids,
+)
 from rosters.serializers import RosterUserScheduleSerializer
+from users.constants import OBJECT_NOT_FOUND
 from users.permissions import IsStaffMember
 from utils.files import ValidateFileSize
+from utils.query_budget import QueryBudgetMixin
 from utils.response import CustomResponse
+from utils.upload_handlers import get_rejected_uploads
 
 
-class CreateAttendanceAPI(APIView):
+class CreateAttendanceAPI(QueryBudgetMixin, APIView):
     """
-    This API is used to create attendance for a staff member
-    Response codes: 201, 400
+    This API is used to create attendance for a staff member, for the given roster user
+    schedule or else for their shift open for attendance now.
+    In the async image processing mode the image is only staged and a receipt is returned,
+    the image status can be followed with the retrieve attendance API.
+    Response codes: 201, 202, 400
     """
 
     permission_classes = (IsStaffMember,)
+    query_budget = 8
 
     class InputSerializer(serializers.Serializer):
-        roster_user_schedule = serializers.IntegerField()
+        roster_user_schedule = serializers.IntegerField(required=False)
         image = serializers.ImageField(
             validators=[
                 ValidateFileSize(max_file_size=Attendance.MAX_FILE_SIZE_ALLOWED),
@@ -35,6 +68,17 @@ class CreateAttendanceAPI(APIView):
             ]
         )
 
+    class AsyncInputSerializer(InputSerializer):
+        # The image content is validated by the worker
+        image = serializers.FileField(
+            validators=[
+                ValidateFileSize(max_file_size=Attendance.MAX_FILE_SIZE_ALLOWED),
+                FileExtensionValidator(
+                    allowed_extensions=Attendance.EXTENSIONS_ALLOWED
+                ),
+            ]
+        )
+
     class OutputSerializer(AttendanceSerializer):
         roster_user_schedule = RosterUserScheduleSerializer()
 
@@ -42,17 +86,222 @@ class CreateAttendanceAPI(APIView):
             model = Attendance
             fields = ("id", "roster_user_schedule", "image")
 
+    class ReceiptOutputSerializer(AttendanceSerializer):
+        image_status = serializers.CharField(source="get_image_status_display")
+
+        class Meta:
+            model = Attendance
+            fields = ("id", "roster_user_schedule", "image_status")
+
     def post(self, request, *args, **kwargs):
-        serializer = self.InputSerializer(data=request.data)
+        rejected_uploads = get_rejected_uploads(request=request)
+        if rejected_uploads:
+            return CustomResponse(errors=rejected_uploads, status=HTTP_400_BAD_REQUEST)
+
+        process_async = settings.ATTENDANCE_IMAGE_PROCESSING_MODE == "async"
+        input_serializer = (
+            self.AsyncInputSerializer if process_async else self.InputSerializer
+        )
+        serializer = input_serializer(data=request.data)
         if not serializer.is_valid():
             return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
         validated_data = serializer.validated_data
 
-        success, attendance = create_attendance(**validated_data)
+        success, attendance = create_attendance(
+            user=request.user.id, **validated_data, process_async=process_async
+        )
         if not success:
             return CustomResponse(errors=attendance, status=HTTP_400_BAD_REQUEST)
 
+        if process_async:
+            return CustomResponse(
+                data=self.ReceiptOutputSerializer(instance=attendance).data,
+                status=HTTP_202_ACCEPTED,
+            )
+
         return CustomResponse(
             data=self.OutputSerializer(instance=attendance).data,
             status=HTTP_201_CREATED,
         )
+
+
+class BatchCreateAttendanceAPI(QueryBudgetMixin, APIView):
+    """
+    This API is used by kiosks to sync the attendance records of a staff member queued while
+    offline. The multipart body has a `records` JSON list and the images of the records as
+    `images` files, every record refers to its image by index. Records already synced with
+    the same idempotency key are reported as duplicates, so a batch can be replayed safely.
+    Response codes: 200, 400
+    """
+
+    permission_classes = (IsStaffMember,)
+    query_budget = 11
+
+    class InputSerializer(serializers.Serializer):
+        records = serializers.JSONField(binary=True)
+
+        def validate_records(self, value):
+            if not isinstance(value, list) or not value:
+                raise serializers.ValidationError(EXPECTED_NON_EMPTY_LIST)
+            if len(value) > MAX_ATTENDANCE_BATCH_SIZE:
+                raise serializers.ValidationError(
+                    MAX_BATCH_SIZE_EXCEEDED.format(max_size=MAX_ATTENDANCE_BATCH_SIZE)
+                )
+            return value
+
+    class RecordSerializer(serializers.Serializer):
+        idempotency_key = serializers.UUIDField()
+        attendance_time = serializers.DateTimeField()
+        roster_user_schedule = serializers.IntegerField(required=False)
+        image = serializers.IntegerField(min_value=0)
+
+        def validate_attendance_time(self, value):
+            if value > now():
+                raise serializers.ValidationError(ATTENDANCE_TIME_CANNOT_BE_IN_FUTURE)
+            if value < now() - timedelta(days=ATTENDANCE_SYNC_MAX_AGE_DAYS):
+                raise serializers.ValidationError(
+                    ATTENDANCE_TIME_TOO_OLD.format(days=ATTENDANCE_SYNC_MAX_AGE_DAYS)
+                )
+            return value
+
+    def post(self, request, *args, **kwargs):
+        rejected_uploads = get_rejected_uploads(request=request)
+        if rejected_uploads:
+            return CustomResponse(errors=rejected_uploads, status=HTTP_400_BAD_REQUEST)
+
+        serializer = self.InputSerializer(data=request.data)
+        if not serializer.is_valid():
+            return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
+        records = serializer.validated_data["records"]
+
+        process_async = settings.ATTENDANCE_IMAGE_PROCESSING_MODE == "async"
+        # The images are validated like the ones of the create attendance API
+        image_serializer = (
+            CreateAttendanceAPI.AsyncInputSerializer
+            if process_async
+            else CreateAttendanceAPI.InputSerializer
+        )
+        images = request.FILES.getlist("images")
+
+        results = [None] * len(records)
+        # Checked before the images, so that a replayed batch is answered without them
+        checked_records, idempotency_keys = [], set()
+        for index, record in enumerate(records):
+            record_serializer = self.RecordSerializer(data=record)
+            errors = None
+            if not record_serializer.is_valid():
+                errors = record_serializer.errors
+            elif record_serializer.validated_data["image"] >= len(images):
+                errors = {
+                    "image": [
+                        IMAGE_INDEX_OUT_OF_RANGE.format(
+                            index=record_serializer.validated_data["image"]
+                        )
+                    ]
+                }
+            elif (
+                record_serializer.validated_data["idempotency_key"] in idempotency_keys
+            ):
+                errors = {"idempotency_key": [DUPLICATE_IDEMPOTENCY_KEY]}
+
+            if errors:
+                results[index] = self.get_invalid_result(record=record, errors=errors)
+                continue
+
+            idempotency_keys.add(record_serializer.validated_data["idempotency_key"])
+            checked_records.append((index, record_serializer.validated_data))
+
+        synced_ids = get_synced_attendance_ids(
+            created_by=request.user.id,
+            records=[validated_data for _, validated_data in checked_records],
+        )
+        valid_records, valid_indexes = [], []
+        for index, validated_data in checked_records:
+            if validated_data["idempotency_key"] in synced_ids:
+                results[index] = {
+                    "idempotency_key": validated_data["idempotency_key"],
+                    "status": RECORD_DUPLICATE,
+                    "id": synced_ids[validated_data["idempotency_key"]],
+                    "errors": None,
+                }
+                continue
+
+            image = image_serializer(data={"image": images[validated_data["image"]]})
+            if not image.is_valid():
+                results[index] = self.get_invalid_result(
+                    record=records[index], errors=image.errors
+                )
+                continue
+
+            valid_records.append(
+                {**validated_data, "image": image.validated_data["image"]}
+            )
+            valid_indexes.append(index)
+
+        if valid_records:
+            success, created_results = bulk_create_attendances(
+                user=request.user.id,
+                records=valid_records,
+                created_by=request.user.id,
+                process_async=process_async,
+                synced_ids=synced_ids,
+            )
+            if not success:
+                return CustomResponse(
+                    errors=created_results, status=HTTP_400_BAD_REQUEST
+                )
+            for index, result in zip(valid_indexes, created_results):
+                results[index] = result
+
+        return CustomResponse(data=results, status=HTTP_200_OK)
+
+    @staticmethod
+    def get_invalid_result(record, errors) -> dict:
+        return {
+            "idempotency_key": (
+                record.get("idempotency_key") if isinstance(record, dict) else None
+            ),
+            "status": RECORD_INVALID,
+            "id": None,
+            "errors": errors,
+        }
+
+
+class RetrieveAttendanceAPI(QueryBudgetMixin, APIView):
+    """
+    This API is used to get an attendance of a staff member along with its image status
+    Response codes: 200, 404
+    """
+
+    permission_classes = (IsStaffMember,)
+    query_budget = 1
+
+    class OutputSerializer(AttendanceSerializer):
+        image_status = serializers.CharField(source="get_image_status_display")
+
+        class Meta:
+            model = Attendance
+            fields = (
+                "id",
+                "roster_user_schedule",
+                "image",
+                "image_status",
+                "image_error",
+                "attendance_time",
+            )
+
+    def get(self, request, *args, **kwargs):
+        try:
+            attendance = Attendance.alive.get(
+                id=kwargs["pk"],
+                roster_user_schedule__user_id=request.user.id,
+            )
+        except Attendance.DoesNotExist:
+            return CustomResponse(
+                errors=OBJECT_NOT_FOUND.format(object="Attendance"),
+                status=HTTP_404_NOT_FOUND,
+            )
+
+        return CustomResponse(
+            data=self.OutputSerializer(instance=attendance).data, status=HTTP_200_OK
+        )
@@ -0,0 +1,85 @@
+"""
+This file contains all the APIs related to attendance reports
+"""
+
+from datetime import timedelta
+from operator import itemgetter
+
+from rest_framework import serializers
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from rest_framework.views import APIView
+
+from attendance.constants import (
+    MAX_ATTENDANCE_REPORT_RANGE_DAYS,
+    REPORT_PERIOD_WEEK,
+    REPORT_PERIODS,
+)
+from attendance.services import get_attendance_report
+from rosters.constants import (
+    SHIFT_OCCURRENCE_RANGE_TOO_LONG,
+    START_DATE_MUST_NOT_BE_AFTER_END_DATE,
+)
+from users.permissions import IsManager
+from utils.query_budget import QueryBudgetMixin
+from utils.response import CustomResponse
+from utils.serializers import CompiledSerializer
+
+
+class AttendanceReportAPI(QueryBudgetMixin, APIView):
+    """
+    This API is used to get the number of scheduled, present, late and absent shifts per
+    roster of a manager for every day, week or month between two dates
+    Query params: start_date, end_date, period, roster
+    Response codes: 200, 400
+    """
+
+    permission_classes = (IsManager,)
+    query_budget = 2
+
+    class FilterSerializer(serializers.Serializer):
+        start_date = serializers.DateField()
+        end_date = serializers.DateField()
+        period = serializers.ChoiceField(
+            choices=REPORT_PERIODS, default=REPORT_PERIOD_WEEK
+        )
+        roster = serializers.IntegerField(required=False)
+
+        def validate(self, attrs):
+            if attrs["start_date"] > attrs["end_date"]:
+                raise serializers.ValidationError(START_DATE_MUST_NOT_BE_AFTER_END_DATE)
+            if attrs["end_date"] - attrs["start_date"] >= timedelta(
+                days=MAX_ATTENDANCE_REPORT_RANGE_DAYS
+            ):
+                raise serializers.ValidationError(
+                    SHIFT_OCCURRENCE_RANGE_TOO_LONG.format(
+                        days=MAX_ATTENDANCE_REPORT_RANGE_DAYS
+                    )
+                )
+            return attrs
+
+    output_serializer = CompiledSerializer(
+        columns=(),
+        fields={
+            "period_start": lambda row: row["period_start"].isoformat(),
+            "roster": lambda row: {
+                "id": row["roster_id"],
+                "title": row["roster__title"],
+            },
+            "scheduled": itemgetter("scheduled"),
+            "present": itemgetter("present"),
+            "late": itemgetter("late"),
+            "absent": itemgetter("absent"),
+        },
+    )
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.FilterSerializer(data=request.query_params.dict())
+        if not serializer.is_valid():
+            return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
+
+        report = get_attendance_report(
+            manager=request.user.id, **serializer.validated_data
+        )
+        return CustomResponse(
+            data=self.output_serializer.many(report), status=HTTP_200_OK
+        )
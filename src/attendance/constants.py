@@ -0,0 +1,23 @@
+"""
+This file contains all the constants related to attendance module
+"""
+
+IMAGE_PROCESSING_FAILED = "Image could not be processed."
+MAX_ATTENDANCE_BATCH_SIZE = 50
+ATTENDANCE_SYNC_MAX_AGE_DAYS = 7
+ATTENDANCE_TIME_CANNOT_BE_IN_FUTURE = "Attendance time cannot be in future."
+ATTENDANCE_TIME_TOO_OLD = "Attendance older than {days} days cannot be synced."
+EXPECTED_NON_EMPTY_LIST = "Expected a non empty list of records."
+MAX_BATCH_SIZE_EXCEEDED = "At most {max_size} records can be synced at once."
+IMAGE_INDEX_OUT_OF_RANGE = "No image uploaded at index {index}."
+DUPLICATE_IDEMPOTENCY_KEY = "Idempotency keys must be unique in a batch."
+# Status of the attendance records of a batch
+RECORD_CREATED = "created"
+RECORD_DUPLICATE = "duplicate"
+RECORD_INVALID = "invalid"
+# Periods the attendance report can be grouped by
+REPORT_PERIOD_DAY = "day"
+REPORT_PERIOD_WEEK = "week"
+REPORT_PERIOD_MONTH = "month"
+REPORT_PERIODS = (REPORT_PERIOD_DAY, REPORT_PERIOD_WEEK, REPORT_PERIOD_MONTH)
+MAX_ATTENDANCE_REPORT_RANGE_DAYS = 366
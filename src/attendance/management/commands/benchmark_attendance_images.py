@@ -0,0 +1,157 @@
+"""
+This command is used to compare the sync and async image processing modes of the create
+attendance API: concurrent kiosks clock a staff member in with the same image, and the
+throughput and latency percentiles of the requests are reported for each mode, along with
+the time the worker pool takes to process the images in the async mode. A write latency
+can be added to the storage of the processed images, to simulate a remote storage.
+
+The attendances and images are really created, so run it against a scratch database and
+media root, with a staff member having a shift open for attendance now. SQLite locks on
+concurrent writes, so use --kiosks 1 there.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from os import urandom
+from typing import Iterator, List
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import Client, override_settings
+from PIL import Image
+
+from attendance.models import Attendance
+from rosters.management.commands.load_test_list_apis import get_percentile
+from users.models import User
+from users.tokens import get_token_for_user
+from utils.files import CONTENT_ADDRESSED_STORAGE
+
+IMAGE_PROCESSING_MODES = ("sync", "async")
+# Seconds between two looks at the images left pending by the async mode
+PENDING_POLL_INTERVAL = 0.1
+
+
+@contextmanager
+def storage_write_latency(seconds: float) -> Iterator[None]:
+    """
+    This context manager is used to delay every write of the processed images storage
+    """
+    save = CONTENT_ADDRESSED_STORAGE._save
+
+    def delayed_save(name, content):
+        time.sleep(seconds)
+        return save(name, content)
+
+    CONTENT_ADDRESSED_STORAGE._save = delayed_save
+    try:
+        yield
+    finally:
+        del CONTENT_ADDRESSED_STORAGE._save
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync and async image processing modes of the create attendance API"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "staff_member_email", help="Email of a staff member on shift now"
+        )
+        parser.add_argument(
+            "--kiosks", type=int, default=8, help="Number of concurrent kiosks"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=15, help="Number of clock-ins per kiosk"
+        )
+        parser.add_argument(
+            "--image-size",
+            type=int,
+            nargs=2,
+            default=(1600, 1200),
+            metavar=("WIDTH", "HEIGHT"),
+            help="Size of the uploaded JPEG, of random pixels",
+        )
+        parser.add_argument(
+            "--storage-latency",
+            type=float,
+            default=0,
+            help="Milliseconds added to every write of the processed images",
+        )
+
+    def handle(self, *args, **options):
+        staff_member = User.objects.filter(email=options["staff_member_email"]).first()
+        if staff_member is None:
+            raise CommandError(f"User {options['staff_member_email']} does not exist")
+        access_token = get_token_for_user(user=staff_member).access_token
+        width, height = options["image_size"]
+        content = BytesIO()
+        Image.frombytes("RGB", (width, height), urandom(width * height * 3)).save(
+            content, format="JPEG", quality=90
+        )
+        image = content.getvalue()
+
+        self.stdout.write(
+            f"{options['kiosks']} kiosks x {options['requests']} clock-ins of "
+            f"{len(image) / 1024 / 1024:.1f} MB images, storage latency "
+            f"{options['storage_latency']:.0f} ms"
+        )
+        with storage_write_latency(seconds=options["storage_latency"] / 1000):
+            for mode in IMAGE_PROCESSING_MODES:
+                with override_settings(ATTENDANCE_IMAGE_PROCESSING_MODE=mode):
+                    self.run(
+                        mode=mode,
+                        access_token=access_token,
+                        image=image,
+                        kiosks=options["kiosks"],
+                        requests=options["requests"],
+                    )
+
+    def run(
+        self, mode: str, access_token: str, image: bytes, kiosks: int, requests: int
+    ):
+        def clock_in(_) -> float:
+            client = Client(headers={"Authorization": f"Bearer {access_token}"})
+            started_at = time.perf_counter()
+            response = client.post(
+                "/attendance/",
+                {
+                    "image": SimpleUploadedFile(
+                        name="attendance.jpg", content=image, content_type="image/jpeg"
+                    )
+                },
+            )
+            latency = time.perf_counter() - started_at
+            # As the request handlers do, the test clients leave it out
+            close_old_connections()
+            if response.status_code not in (201, 202):
+                raise CommandError(
+                    f"Create attendance answered {response.status_code}: "
+                    f"{response.content.decode()}"
+                )
+            attendance_ids.append(response.json()["data"]["id"])
+            return latency
+
+        attendance_ids: List[int] = []
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=kiosks) as executor:
+            latencies = sorted(executor.map(clock_in, range(kiosks * requests)))
+        duration = time.perf_counter() - started_at
+        self.stdout.write(
+            f"{mode}: {len(latencies) / duration:.1f} req/s, "
+            f"p50 {get_percentile(latencies, 0.5) * 1000:.0f} ms, "
+            f"p99 {get_percentile(latencies, 0.99) * 1000:.0f} ms"
+        )
+
+        if mode == "async":
+            while Attendance.objects.filter(
+                id__in=attendance_ids, image_status=Attendance.ImageStatus.PENDING
+            ).exists():
+                time.sleep(PENDING_POLL_INTERVAL)
+            self.stdout.write(
+                f"{mode}: all images processed {time.perf_counter() - started_at:.1f}s "
+                "after the first request"
+            )
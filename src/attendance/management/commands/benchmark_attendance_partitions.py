@@ -0,0 +1,149 @@
+"""
+This command is used to measure the attendance queries on PostgreSQL against a table filled
+with generated attendance records, spread evenly over the last months. Run it once with the
+attendance table partitioned (migration 0008) and once migrated back to 0007 to compare.
+The generated records are rolled back unless --keep is given.
+"""
+
+import json
+from datetime import datetime, timedelta
+from time import perf_counter
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.timezone import localdate, make_aware
+
+from attendance.models import Attendance
+from attendance.services.partition import (
+    create_attendance_partitions,
+    get_month_start,
+    is_attendance_partitioned,
+)
+from rosters.models import RosterUserSchedule
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Measure the attendance queries against generated attendance records"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1_000_000,
+            help="Number of attendance records to generate, e.g. 50000000",
+        )
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=24,
+            help="Number of months back the records are spread over",
+        )
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the generated records"
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Attendance partitioning is only used on PostgreSQL")
+        roster_user_schedule = RosterUserSchedule.alive.order_by("id").first()
+        if roster_user_schedule is None:
+            raise CommandError("At least one roster user schedule is needed")
+
+        self.stdout.write(
+            f"Attendance table partitioned: {is_attendance_partitioned()}"
+        )
+        try:
+            with transaction.atomic():
+                self.run(
+                    roster_user_schedule=roster_user_schedule,
+                    rows=options["rows"],
+                    months=options["months"],
+                )
+                if not options["keep"]:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("Generated records rolled back")
+
+    def run(self, roster_user_schedule, rows, months):
+        today = localdate()
+        first_month = get_month_start(day=today, months=-months)
+        start = make_aware(datetime.combine(first_month, datetime.min.time()))
+        if is_attendance_partitioned():
+            create_attendance_partitions(start_month=first_month, months=months + 1)
+
+        started_at = perf_counter()
+        with connection.cursor() as cursor:
+            # Every generated record is synced by the staff member with its own key
+            cursor.execute(
+                f"INSERT INTO {connection.ops.quote_name(Attendance._meta.db_table)} "
+                "(date_created, date_updated, attendance_time, roster_user_schedule_id, "
+                "created_by_id, image_status, image_error, idempotency_key) "
+                "SELECT now(), now(), %s + (%s - %s) * (number::float / %s), %s, %s, "
+                "%s, '', gen_random_uuid() FROM generate_series(1, %s) number",
+                [
+                    start,
+                    make_aware(datetime.combine(today, datetime.min.time())),
+                    start,
+                    rows,
+                    roster_user_schedule.id,
+                    roster_user_schedule.user_id,
+                    Attendance.ImageStatus.PROCESSED,
+                    rows,
+                ],
+            )
+            cursor.execute(
+                f"ANALYZE {connection.ops.quote_name(Attendance._meta.db_table)}"
+            )
+        self.stdout.write(
+            f"Inserted {rows} records in {perf_counter() - started_at:.1f}s"
+        )
+
+        day_start = make_aware(
+            datetime.combine(today - timedelta(days=1), datetime.min.time())
+        )
+        day_end = day_start + timedelta(days=1)
+        attendance_id = (
+            Attendance.objects.filter(attendance_time__gte=day_start)
+            .values_list("id", flat=True)
+            .first()
+        )
+        # (name, queryset) of the queries run by the batch sync, the rollup rebuild and
+        # the attendance retrieve API
+        queries = [
+            (
+                "batch sync duplicate lookup",
+                Attendance.objects.filter(
+                    created_by_id=roster_user_schedule.user_id,
+                    idempotency_key__in=[uuid4() for _ in range(50)],
+                    attendance_time__range=(day_start, day_end),
+                ).values_list("idempotency_key", "id"),
+            ),
+            (
+                "rollup rebuild of a day",
+                Attendance.objects.filter(
+                    attendance_time__gte=day_start, attendance_time__lt=day_end
+                ).values_list("attendance_time", "roster_user_schedule_id"),
+            ),
+            (
+                "attendance retrieve",
+                Attendance.alive.filter(id=attendance_id),
+            ),
+        ]
+        self.stdout.write("Query: execution time (tables scanned)")
+        for name, queryset in queries:
+            plan = json.loads(queryset.explain(format="json", analyze=True))[0]
+            self.stdout.write(
+                f"{name}: {plan['Execution Time']:.2f}ms "
+                f"({self.count_scanned_tables(plan['Plan'])})"
+            )
+
+    @classmethod
+    def count_scanned_tables(cls, node) -> int:
+        return ("Relation Name" in node) + sum(
+            cls.count_scanned_tables(child) for child in node.get("Plans", ())
+        )
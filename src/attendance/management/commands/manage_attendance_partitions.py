@@ -0,0 +1,58 @@
+"""
+This command is used to create the monthly partitions of the attendance table ahead of time
+and to detach the partitions older than the retention, it is meant to be run daily
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.timezone import localdate
+
+from attendance.services.partition import (
+    create_attendance_partitions,
+    detach_attendance_partitions,
+    get_month_start,
+    is_attendance_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = "Create future attendance partitions and detach the expired ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=settings.ATTENDANCE_PARTITION_MONTHS_AHEAD,
+            help="Number of months after the current one to create partitions for",
+        )
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=settings.ATTENDANCE_PARTITION_RETENTION_MONTHS,
+            help="Number of months before the current one to keep attached, 0 keeps all",
+        )
+        parser.add_argument(
+            "--archive-schema",
+            default=settings.ATTENDANCE_PARTITION_ARCHIVE_SCHEMA,
+            help="Schema the detached partitions are moved to",
+        )
+
+    def handle(self, *args, **options):
+        if not is_attendance_partitioned():
+            self.stdout.write("Attendance table is not partitioned, nothing to do")
+            return
+
+        current_month = get_month_start(day=localdate())
+        created = create_attendance_partitions(
+            start_month=current_month, months=options["months_ahead"] + 1
+        )
+        self.stdout.write(f"Created partitions: {', '.join(created) or '-'}")
+
+        if options["retention_months"]:
+            detached = detach_attendance_partitions(
+                before_month=get_month_start(
+                    day=current_month, months=-options["retention_months"]
+                ),
+                archive_schema=options["archive_schema"] or None,
+            )
+            self.stdout.write(f"Detached partitions: {', '.join(detached) or '-'}")
@@ -0,0 +1,57 @@
+"""
+This command is used to move the attendance images stored under per user paths to the
+content addressed storage, the images with the same content end up sharing one file
+"""
+
+import os
+
+from django.core.management.base import BaseCommand
+
+from attendance.models import Attendance
+from utils.files import CONTENT_ADDRESSED_STORAGE, FILE_STORAGE
+
+
+class Command(BaseCommand):
+    help = "Move attendance images to the content addressed storage"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        image_field = Attendance._meta.get_field("image")
+        converted = missing = 0
+        names = set()
+
+        attendances = (
+            Attendance.objects.exclude(image__isnull=True)
+            .exclude(image="")
+            .exclude(image_status=Attendance.ImageStatus.PENDING)
+            .only("id", "image")
+            .iterator(chunk_size=options["chunk_size"])
+        )
+        for attendance in attendances:
+            old_name = attendance.image.name
+            if CONTENT_ADDRESSED_STORAGE.is_content_addressed(old_name):
+                continue
+            if not FILE_STORAGE.exists(old_name):
+                missing += 1
+                self.stderr.write(f"Attendance {attendance.id}: {old_name} not found")
+                continue
+
+            with FILE_STORAGE.open(old_name) as file:
+                name = CONTENT_ADDRESSED_STORAGE.save(
+                    image_field.generate_filename(
+                        attendance, os.path.basename(old_name)
+                    ),
+                    file,
+                )
+            Attendance.objects.filter(id=attendance.id).update(image=name)
+            if not Attendance.objects.filter(image=old_name).exists():
+                FILE_STORAGE.delete(old_name)
+
+            converted += 1
+            names.add(name)
+
+        self.stdout.write(
+            f"Converted: {converted}, distinct images: {len(names)}, missing: {missing}"
+        )
@@ -0,0 +1,27 @@
+"""
+This command is used to process the attendance images left pending, e.g. when the process
+running the image workers was restarted before processing them
+"""
+
+from django.core.management.base import BaseCommand
+
+from attendance.models import Attendance
+from attendance.services import process_attendance_image
+
+
+class Command(BaseCommand):
+    help = "Process the pending attendance images"
+
+    def handle(self, *args, **options):
+        processed = failed = 0
+        for attendance in Attendance.objects.filter(
+            image_status=Attendance.ImageStatus.PENDING
+        ).iterator():
+            success, error = process_attendance_image(attendance=attendance)
+            if success:
+                processed += 1
+            else:
+                failed += 1
+                self.stderr.write(f"Attendance {attendance.id}: {error}")
+
+        self.stdout.write(f"Processed: {processed}, failed: {failed}")
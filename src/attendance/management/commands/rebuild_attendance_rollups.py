@@ -0,0 +1,37 @@
+"""
+This command is used to rebuild the daily attendance rollups from the attendance records,
+e.g. after the rollups were introduced or attendance was backfilled
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import localdate
+
+from attendance.services import rebuild_attendance_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily attendance rollups of the last days"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=31,
+            help="Number of days back to rebuild, today included, defaults to 31",
+        )
+
+    def handle(self, *args, **options):
+        end_date = localdate()
+        start_date = end_date - timedelta(days=options["days"] - 1)
+
+        total = 0
+        # One day at a time, so that only the rollups of a day are held in memory
+        for offset in range(options["days"]):
+            day = start_date + timedelta(days=offset)
+            total += rebuild_attendance_rollups(start_date=day, end_date=day)
+
+        self.stdout.write(
+            f"Rebuilt {total} attendance rollups from {start_date} to {end_date}"
+        )
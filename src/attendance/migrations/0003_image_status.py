@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendance", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attendance",
+            name="image_error",
+            field=models.CharField(blank=True, max_length=256),
+        ),
+        migrations.AddField(
+            model_name="attendance",
+            name="image_status",
+            field=models.PositiveSmallIntegerField(
+                choices=[(1, "Pending"), (2, "Processed"), (3, "Failed")], default=2
+            ),
+        ),
+    ]
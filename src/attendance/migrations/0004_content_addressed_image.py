@@ -0,0 +1,34 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:59
+
+import django.core.validators
+from django.db import migrations, models
+
+import utils.files
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendance", "0003_image_status"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="attendance",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                db_index=True,
+                max_length=255,
+                null=True,
+                storage=utils.files.get_content_addressed_storage,
+                upload_to="files/attendance/images/",
+                validators=[
+                    utils.files.ValidateFileSize(max_file_size=5),
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=("jpeg", "png", "jpg")
+                    ),
+                ],
+            ),
+        ),
+    ]
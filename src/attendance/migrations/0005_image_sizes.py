@@ -0,0 +1,47 @@
+# Generated by Django 4.2.11 on 2026-10-17 12:01
+
+import django.core.validators
+from django.db import migrations, models
+
+import utils.files
+import utils.images
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendance", "0004_content_addressed_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attendance",
+            name="image_original_size",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="attendance",
+            name="image_size",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="attendance",
+            name="image",
+            field=utils.images.NormalizedImageField(
+                blank=True,
+                db_index=True,
+                max_length=255,
+                null=True,
+                original_size_field="image_original_size",
+                size_field="image_size",
+                storage=utils.files.get_content_addressed_storage,
+                upload_to="files/attendance/images/",
+                validators=[
+                    utils.files.ValidateFileSize(max_file_size=5),
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=("jpeg", "png", "jpg", "webp")
+                    ),
+                ],
+            ),
+        ),
+    ]
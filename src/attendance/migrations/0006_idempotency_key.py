@@ -0,0 +1,26 @@
+# Generated by Django 4.2.11 on 2026-10-17 12:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendance", "0005_image_sizes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attendance",
+            name="idempotency_key",
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="attendance",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("idempotency_key__isnull", False)),
+                fields=("created_by", "idempotency_key"),
+                name="attendance_created_by_idempotency_key_unique_constraint",
+            ),
+        ),
+    ]
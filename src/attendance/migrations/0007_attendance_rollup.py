@@ -0,0 +1,104 @@
+# Generated by Django 4.2.11 on 2026-10-17 12:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("rosters", "0005_shift_resolution_index"),
+        ("attendance", "0006_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendanceRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "date_created",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("date_updated", models.DateTimeField(auto_now=True)),
+                ("date_deleted", models.DateTimeField(blank=True, null=True)),
+                ("date", models.DateField()),
+                (
+                    "shift",
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, "Morning Shift"), (2, "Evening Shift")]
+                    ),
+                ),
+                ("attendance_count", models.PositiveIntegerField(default=0)),
+                ("first_attendance_time", models.DateTimeField()),
+                ("is_late", models.BooleanField(default=False)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="%(class)s_created_by",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "roster",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="rosters.roster"
+                    ),
+                ),
+                (
+                    "roster_user_schedule",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="rosters.rosteruserschedule",
+                    ),
+                ),
+                (
+                    "updated_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="%(class)s_updated_by",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Attendance Rollup",
+                "verbose_name_plural": "Attendance Rollups",
+                "indexes": [
+                    models.Index(
+                        fields=["roster", "date"], name="rollup_roster_date_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="attendancerollup",
+            constraint=models.UniqueConstraint(
+                fields=("roster", "user", "date", "shift"),
+                name="rollup_roster_user_date_shift_unique_constraint",
+            ),
+        ),
+    ]
@@ -0,0 +1,231 @@
+"""
+Turns the attendance table into a table range partitioned by month of attendance_time on
+PostgreSQL (13 or later), other databases are left untouched.
+
+The existing rows are copied into the monthly partitions, which takes a while on large
+tables, so run it in a maintenance window.
+
+PostgreSQL requires the partition key in every unique index of a partitioned table, so the
+primary key of the table becomes (id, attendance_time). The uniqueness the model declares is
+enforced by ATTENDANCE_KEY_TABLE instead, one row per attendance kept in sync by a trigger:
+its primary key keeps the ids unique and its partial unique index, named after the model
+constraint, keeps the idempotency keys unique per created_by. Inserting a duplicate fails
+with an IntegrityError as it did before.
+
+The migration state is left as is: the columns, the index and foreign key names (generated by
+the schema editor as for the other migrations) and the enforced constraints are unchanged.
+"""
+
+from datetime import date, datetime
+
+from django.db import migrations
+from django.utils.timezone import localdate, make_aware
+
+TABLE = "attendance_attendance"
+UNPARTITIONED_TABLE = "attendance_attendance_unpartitioned"
+ATTENDANCE_KEY_TABLE = "attendance_attendance_key"
+ATTENDANCE_KEY_FUNCTION = "attendance_attendance_key_sync"
+MONTHS_AHEAD = 3
+
+CREATE_ATTENDANCE_KEY_FUNCTION = f"""
+CREATE FUNCTION {ATTENDANCE_KEY_FUNCTION}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        TRUNCATE {ATTENDANCE_KEY_TABLE};
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO {ATTENDANCE_KEY_TABLE} (id, created_by_id, idempotency_key)
+        VALUES (NEW.id, NEW.created_by_id, NEW.idempotency_key);
+    ELSIF TG_OP = 'UPDATE' THEN
+        UPDATE {ATTENDANCE_KEY_TABLE}
+        SET id = NEW.id, created_by_id = NEW.created_by_id,
+            idempotency_key = NEW.idempotency_key
+        WHERE id = OLD.id;
+    ELSE
+        DELETE FROM {ATTENDANCE_KEY_TABLE} WHERE id = OLD.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+# Rows moved between partitions by an update fire the delete and insert triggers
+CREATE_ATTENDANCE_KEY_TRIGGERS = (
+    f"CREATE TRIGGER {ATTENDANCE_KEY_FUNCTION}_insert_delete AFTER INSERT OR DELETE "
+    f"ON {TABLE} FOR EACH ROW EXECUTE FUNCTION {ATTENDANCE_KEY_FUNCTION}()",
+    f"CREATE TRIGGER {ATTENDANCE_KEY_FUNCTION}_update AFTER UPDATE ON {TABLE} "
+    "FOR EACH ROW WHEN (OLD.id IS DISTINCT FROM NEW.id "
+    "OR OLD.created_by_id IS DISTINCT FROM NEW.created_by_id "
+    "OR OLD.idempotency_key IS DISTINCT FROM NEW.idempotency_key) "
+    f"EXECUTE FUNCTION {ATTENDANCE_KEY_FUNCTION}()",
+    f"CREATE TRIGGER {ATTENDANCE_KEY_FUNCTION}_truncate AFTER TRUNCATE ON {TABLE} "
+    f"FOR EACH STATEMENT EXECUTE FUNCTION {ATTENDANCE_KEY_FUNCTION}()",
+)
+
+
+def month_start(day, months=0):
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def rename_table(cursor):
+    """
+    Renames the attendance table out of the way and frees the names of its sequence, primary
+    key and indexes for the new table, the indexes are not needed to copy the rows
+    """
+    cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {UNPARTITIONED_TABLE}")
+    cursor.execute(
+        f"ALTER TABLE {UNPARTITIONED_TABLE} RENAME CONSTRAINT {TABLE}_pkey "
+        f"TO {UNPARTITIONED_TABLE}_pkey"
+    )
+    cursor.execute(
+        f"SELECT pg_get_serial_sequence('{UNPARTITIONED_TABLE}', 'id'), "
+        "ARRAY(SELECT indexrelid::regclass::text FROM pg_index "
+        f"WHERE indrelid = '{UNPARTITIONED_TABLE}'::regclass AND NOT indisprimary)"
+    )
+    sequence, indexes = cursor.fetchone()
+    cursor.execute(f"ALTER SEQUENCE {sequence} RENAME TO {UNPARTITIONED_TABLE}_id_seq")
+    for index in indexes:
+        cursor.execute(f"DROP INDEX {index}")
+
+
+def create_table(schema_editor, model, partitioned):
+    """
+    Creates the attendance table like the renamed one with the NOT NULL and CHECK
+    constraints, the indexes and foreign keys of the model and the enforcement of its
+    unique constraint, which is the attendance key table when partitioned
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {UNPARTITIONED_TABLE} INCLUDING CONSTRAINTS)"
+            + (" PARTITION BY RANGE (attendance_time)" if partitioned else "")
+        )
+        if partitioned:
+            # Identity columns are not supported on partitioned tables before PostgreSQL 17
+            cursor.execute(f"CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+            cursor.execute(
+                f"ALTER TABLE {TABLE} ALTER COLUMN id "
+                f"SET DEFAULT nextval('{TABLE}_id_seq')"
+            )
+            cursor.execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id, attendance_time)")
+        else:
+            cursor.execute(
+                f"ALTER TABLE {TABLE} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY"
+            )
+            cursor.execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id)")
+
+    for statement in schema_editor._model_indexes_sql(model):
+        schema_editor.execute(statement)
+    for field in model._meta.local_fields:
+        if field.remote_field and field.db_constraint:
+            schema_editor.execute(
+                schema_editor._create_fk_sql(
+                    model, field, "_fk_%(to_table)s_%(to_column)s"
+                )
+            )
+    if not partitioned:
+        for constraint in model._meta.constraints:
+            schema_editor.add_constraint(model, constraint)
+
+
+def create_partitions(cursor, first_month, last_month):
+    month = first_month
+    while month <= last_month:
+        cursor.execute(
+            f"CREATE TABLE {TABLE}_p{month.year:04d}_{month.month:02d} "
+            f"PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)",
+            [
+                make_aware(datetime.combine(month, datetime.min.time())),
+                make_aware(
+                    datetime.combine(month_start(month, 1), datetime.min.time())
+                ),
+            ],
+        )
+        month = month_start(month, 1)
+    # Rows outside of the monthly partitions, until the partitions are created ahead
+    cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+
+def create_attendance_key_table(schema_editor, model):
+    """
+    Creates the attendance key table filled with the keys of the attendance rows and the
+    triggers keeping it in sync, its unique index is named after the unique constraint of
+    the model so that removing the constraint in a later migration drops it
+    """
+    (constraint,) = model._meta.constraints
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {ATTENDANCE_KEY_TABLE} (id integer PRIMARY KEY, "
+            "created_by_id bigint NULL, idempotency_key uuid NULL)"
+        )
+        cursor.execute(
+            f"INSERT INTO {ATTENDANCE_KEY_TABLE} (id, created_by_id, idempotency_key) "
+            f"SELECT id, created_by_id, idempotency_key FROM {TABLE}"
+        )
+        cursor.execute(
+            f"CREATE UNIQUE INDEX {constraint.name} ON {ATTENDANCE_KEY_TABLE} "
+            "(created_by_id, idempotency_key) WHERE idempotency_key IS NOT NULL"
+        )
+        cursor.execute(CREATE_ATTENDANCE_KEY_FUNCTION)
+        for statement in CREATE_ATTENDANCE_KEY_TRIGGERS:
+            cursor.execute(statement)
+
+
+def copy_rows(cursor):
+    cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {UNPARTITIONED_TABLE}")
+    # Drops the sequence of the renamed table too
+    cursor.execute(f"DROP TABLE {UNPARTITIONED_TABLE}")
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+        f"COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)"
+    )
+
+
+def partition_attendance(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    model = apps.get_model("attendance", "Attendance")
+    with schema_editor.connection.cursor() as cursor:
+        rename_table(cursor=cursor)
+        create_table(schema_editor=schema_editor, model=model, partitioned=True)
+        cursor.execute(f"SELECT MIN(attendance_time) FROM {UNPARTITIONED_TABLE}")
+        oldest = cursor.fetchone()[0]
+        create_partitions(
+            cursor=cursor,
+            first_month=month_start(oldest.date() if oldest else localdate()),
+            last_month=month_start(localdate(), months=MONTHS_AHEAD),
+        )
+        copy_rows(cursor=cursor)
+    create_attendance_key_table(schema_editor=schema_editor, model=model)
+
+
+def unpartition_attendance(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    model = apps.get_model("attendance", "Attendance")
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE {ATTENDANCE_KEY_TABLE}")
+        # Dropping the function drops its triggers
+        cursor.execute(f"DROP FUNCTION {ATTENDANCE_KEY_FUNCTION}() CASCADE")
+        rename_table(cursor=cursor)
+        create_table(schema_editor=schema_editor, model=model, partitioned=False)
+        # Dropping the partitioned table drops its partitions too
+        copy_rows(cursor=cursor)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("attendance", "0007_attendance_rollup"),
+        ("rosters", "0005_shift_resolution_index"),
+        ("users", "0002_photo_sizes"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(partition_attendance, unpartition_attendance),
+            ],
+            # The model still describes the table, see above
+            state_operations=[],
+        ),
+    ]
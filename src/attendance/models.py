@@ -6,8 +6,10 @@ from django.core.validators import FileExtensionValidator
 from django.db import models
 from django.utils.timezone import now
 
-from rosters.models import RosterUserSchedule
-from utils.files import FILE_STORAGE, RenameFile, ValidateFileSize
+from rosters.models import Roster, RosterUserSchedule
+from users.models import User
+from utils.files import ValidateFileSize, get_content_addressed_storage
+from utils.images import NormalizedImageField
 from utils.models import BaseModel
 
 
@@ -18,24 +20,88 @@ class Attendance(BaseModel):
 
     MAX_FILE_SIZE_ALLOWED = 5  # MB
     EXTENSIONS_ALLOWED = ("jpeg", "png", "jpg")
+    # Normalized images are stored as JPEG or WebP
+    STORED_EXTENSIONS_ALLOWED = EXTENSIONS_ALLOWED + ("webp",)
+    STAGING_UPLOAD_TO = "files/attendance/staging/{name}.{extension}"
+
+    class ImageStatus(models.IntegerChoices):
+        PENDING = 1
+        PROCESSED = 2
+        FAILED = 3
 
     roster_user_schedule = models.ForeignKey(
         RosterUserSchedule, on_delete=models.PROTECT
     )
-    image = models.ImageField(
-        storage=FILE_STORAGE,
-        upload_to=RenameFile(
-            "files/attendance/{instance.roster_user_schedule.user_id}/{instance.date_created}.{extension}"
-        ),
+    # Stored once per distinct content, see ContentAddressedStorage
+    image = NormalizedImageField(
+        storage=get_content_addressed_storage,
+        upload_to="files/attendance/images/",
+        max_length=255,
+        db_index=True,
+        original_size_field="image_original_size",
+        size_field="image_size",
         validators=[
             ValidateFileSize(max_file_size=MAX_FILE_SIZE_ALLOWED),
-            FileExtensionValidator(allowed_extensions=EXTENSIONS_ALLOWED),
+            FileExtensionValidator(allowed_extensions=STORED_EXTENSIONS_ALLOWED),
         ],
         null=True,
         blank=True,
     )
+    # Byte counts of the uploaded and of the stored (normalized) image
+    image_original_size = models.PositiveIntegerField(null=True, blank=True)
+    image_size = models.PositiveIntegerField(null=True, blank=True)
+    # Pending images are staged raw under STAGING_UPLOAD_TO until a worker processes them
+    image_status = models.PositiveSmallIntegerField(
+        choices=ImageStatus.choices, default=ImageStatus.PROCESSED
+    )
+    image_error = models.CharField(max_length=256, blank=True)
     attendance_time = models.DateTimeField(default=now)
+    # Client generated key of the attendance records synced in batches by the kiosks
+    idempotency_key = models.UUIDField(null=True, blank=True)
 
     class Meta:
         verbose_name = "Attendance"
         verbose_name_plural = "Attendance"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["created_by", "idempotency_key"],
+                name="attendance_created_by_idempotency_key_unique_constraint",
+                condition=models.Q(idempotency_key__isnull=False),
+            )
+        ]
+
+
+class AttendanceRollup(BaseModel):
+    """
+    This model is used to store the attendance of a user for a dated shift of a roster, one
+    row per roster, user, date and shift maintained as attendance is created, so that the
+    attendance reports do not scan the raw attendance records
+    """
+
+    roster = models.ForeignKey(Roster, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.PROTECT)
+    roster_user_schedule = models.ForeignKey(
+        RosterUserSchedule, on_delete=models.CASCADE
+    )
+    date = models.DateField()
+    shift = models.PositiveSmallIntegerField(choices=RosterUserSchedule.Shift.choices)
+    attendance_count = models.PositiveIntegerField(default=0)
+    first_attendance_time = models.DateTimeField()
+    # Whether the first attendance was marked after ATTENDANCE_GRACE_MINUTES past the start
+    is_late = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f"{self.roster_id}-{self.user_id}-{self.date}-{self.shift}"
+
+    class Meta:
+        verbose_name = "Attendance Rollup"
+        verbose_name_plural = "Attendance Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["roster", "user", "date", "shift"],
+                name="rollup_roster_user_date_shift_unique_constraint",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["roster", "date"], name="rollup_roster_date_idx"),
+        ]
@@ -1 +1,8 @@
-from .create import create_attendance
+from .create import (
+    bulk_create_attendances,
+    create_attendance,
+    get_synced_attendance_ids,
+)
+from .process import process_attendance_image
+from .report import get_attendance_report
+from .rollup import rebuild_attendance_rollups, record_attendance_rollups
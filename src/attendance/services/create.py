@@ -2,39 +2,266 @@
 This file contains all the create services for attendance module.
 """
 
-from typing import Tuple, Union
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, TypedDict, Union
+from uuid import UUID, uuid4
 
 from django.core.exceptions import ValidationError
+from django.core.files import File
 from django.core.files.images import ImageFile
-from django.db.models import Q
+from django.db import IntegrityError, transaction
 from django.utils.timezone import now
 
+from attendance.constants import RECORD_CREATED, RECORD_DUPLICATE, RECORD_INVALID
 from attendance.models import Attendance
-from rosters.models import RosterUserSchedule
+from attendance.services.rollup import record_attendance_rollups
+from attendance.tasks import submit_attendance_image
+from rosters.services import (
+    resolve_roster_user_schedule,
+    resolve_roster_user_schedules,
+)
 from users.models import User
+from utils.files import FILE_STORAGE
+
+
+class AttendanceRecord(TypedDict):
+    idempotency_key: UUID
+    attendance_time: datetime
+    image: Union[ImageFile, File]
+    roster_user_schedule: Optional[int]
+
+
+# Resolved by the service or set to the syncing user, validating them would query each row
+BATCH_EXCLUDED_CLEAN_FIELDS = ("roster_user_schedule", "created_by", "updated_by")
+
+
+class AttendanceRecordResult(TypedDict):
+    idempotency_key: UUID
+    status: str
+    id: Optional[int]
+    errors: Optional[str]
+
+
+def stage_image(attendance: Attendance, image: Union[ImageFile, File]) -> str:
+    """
+    This function is used to store the raw upload of an attendance image to be processed by
+    the worker pool and to mark the attendance image as pending
+    """
+    staged_name = FILE_STORAGE.save(
+        Attendance.STAGING_UPLOAD_TO.format(
+            name=uuid4().hex, extension=image.name.split(".")[-1]
+        ),
+        image,
+    )
+    # Assigning the name only, the staged file is already in the storage
+    attendance.image = staged_name
+    attendance.image_status = Attendance.ImageStatus.PENDING
+    return staged_name
 
 
 def create_attendance(
-    roster_user_schedule: Union[int, RosterUserSchedule],
-    image: ImageFile,
+    user: Union[int, User],
+    image: Union[ImageFile, File],
+    roster_user_schedule: Optional[int] = None,
     created_by: User = None,
+    process_async: bool = False,
 ) -> Tuple[bool, Union[str, Attendance]]:
     """
-    This service is used to create attendance
+    This service is used to create attendance of a user for the shift open for attendance now,
+    which is resolved when no roster user schedule id is given and validated otherwise.
+    The attendance is added to the daily rollups in the same transaction.
+    With process_async the raw upload is only staged and the attendance is created with a
+    pending image, which is processed by the worker pool once the transaction commits.
     """
+    attendance_time = now()
+    success, roster_user_schedule = resolve_roster_user_schedule(
+        user=user, moment=attendance_time, roster_user_schedule_id=roster_user_schedule
+    )
+    if not success:
+        return False, roster_user_schedule
+
     attendance = Attendance(
-        roster_user_schedule_id=(
-            roster_user_schedule.id
-            if isinstance(roster_user_schedule, RosterUserSchedule)
-            else roster_user_schedule
-        ),
+        roster_user_schedule=roster_user_schedule,
         image=image,
+        attendance_time=attendance_time,
         created_by=created_by,
     )
 
+    staged_name = None
+    if process_async:
+        staged_name = stage_image(attendance=attendance, image=image)
+
     try:
-        attendance.save()
+        with transaction.atomic():
+            attendance.save()
+            record_attendance_rollups(attendances=[attendance])
     except ValidationError as error:
+        if staged_name:
+            FILE_STORAGE.delete(staged_name)
         return False, str(error)
 
+    if process_async:
+        transaction.on_commit(lambda: submit_attendance_image(attendance.id))
+
     return True, attendance
+
+
+def _insert_attendances(
+    attendances: List[Tuple[int, Attendance]], results: List[AttendanceRecordResult]
+) -> None:
+    """
+    This function is used to insert attendances with one query, falling back to row by row
+    inserts when a concurrent replay of the batch already inserted some of them, and to add
+    the inserted attendances to the daily rollups
+    """
+    try:
+        with transaction.atomic():
+            Attendance.objects.bulk_create(
+                objs=[attendance for _, attendance in attendances]
+            )
+        created = attendances
+    except IntegrityError:
+        created = []
+        for index, attendance in attendances:
+            try:
+                with transaction.atomic():
+                    attendance.save(skip_clean=True)
+                created.append((index, attendance))
+            except IntegrityError:
+                # Synced concurrently, the image staged for this attendance is not needed
+                if attendance.image_status == Attendance.ImageStatus.PENDING:
+                    FILE_STORAGE.delete(attendance.image.name)
+                results[index]["status"] = RECORD_DUPLICATE
+                results[index]["id"] = (
+                    Attendance.objects.filter(
+                        created_by_id=attendance.created_by_id,
+                        idempotency_key=attendance.idempotency_key,
+                    )
+                    .values_list("id", flat=True)
+                    .first()
+                )
+
+    for index, attendance in created:
+        results[index]["status"] = RECORD_CREATED
+        results[index]["id"] = attendance.id
+
+    record_attendance_rollups(attendances=[attendance for _, attendance in created])
+
+
+def get_synced_attendance_ids(
+    created_by: Union[int, User], records: Iterable[AttendanceRecord]
+) -> Dict[UUID, int]:
+    """
+    This function is used to get the ids of the attendances already synced by created_by
+    for the idempotency keys of the records, with one query
+    """
+    created_by_id = created_by.id if isinstance(created_by, User) else created_by
+    idempotency_keys, attendance_times = [], []
+    for record in records:
+        idempotency_keys.append(record["idempotency_key"])
+        attendance_times.append(record["attendance_time"])
+    if not idempotency_keys:
+        return {}
+
+    # A replayed record repeats its attendance time, bounding the lookup by the attendance
+    # times of the batch lets PostgreSQL scan only the partitions of those months
+    return dict(
+        Attendance.objects.filter(
+            created_by_id=created_by_id,
+            idempotency_key__in=idempotency_keys,
+            attendance_time__range=(min(attendance_times), max(attendance_times)),
+        ).values_list("idempotency_key", "id")
+    )
+
+
+def bulk_create_attendances(
+    user: Union[int, User],
+    records: List[AttendanceRecord],
+    created_by: Union[int, User],
+    process_async: bool = False,
+    synced_ids: Optional[Dict[UUID, int]] = None,
+) -> Tuple[bool, Union[str, List[AttendanceRecordResult]]]:
+    """
+    This service is used to create the attendance records of a user synced by a kiosk, with
+    a fixed number of queries per batch. Records whose idempotency key was already synced by
+    created_by are reported as duplicates with the id of the existing attendance, so
+    replaying a batch creates nothing. synced_ids can be given when the caller already
+    looked them up with get_synced_attendance_ids. Every attendance is validated like the
+    ones of create_attendance before any is inserted. The status of every record is returned
+    in order.
+    """
+    created_by_id = created_by.id if isinstance(created_by, User) else created_by
+    results: List[AttendanceRecordResult] = [
+        {
+            "idempotency_key": record["idempotency_key"],
+            "status": RECORD_INVALID,
+            "id": None,
+            "errors": None,
+        }
+        for record in records
+    ]
+
+    if synced_ids is None:
+        synced_ids = get_synced_attendance_ids(
+            created_by=created_by_id, records=records
+        )
+    new_records = []
+    for index, record in enumerate(records):
+        if record["idempotency_key"] in synced_ids:
+            results[index]["status"] = RECORD_DUPLICATE
+            results[index]["id"] = synced_ids[record["idempotency_key"]]
+        else:
+            new_records.append((index, record))
+
+    roster_user_schedules = resolve_roster_user_schedules(
+        user=user,
+        moments=[record["attendance_time"] for _, record in new_records],
+        roster_user_schedule_ids=[
+            record.get("roster_user_schedule") for _, record in new_records
+        ],
+    )
+
+    attendances = []
+    for (index, record), roster_user_schedule in zip(
+        new_records, roster_user_schedules
+    ):
+        if isinstance(roster_user_schedule, str):
+            results[index]["errors"] = roster_user_schedule
+            continue
+
+        attendance = Attendance(
+            roster_user_schedule=roster_user_schedule,
+            image=record["image"],
+            attendance_time=record["attendance_time"],
+            idempotency_key=record["idempotency_key"],
+            created_by_id=created_by_id,
+        )
+        # The idempotency key constraint is checked by the insert, for the whole batch
+        try:
+            attendance.full_clean(
+                exclude=BATCH_EXCLUDED_CLEAN_FIELDS, validate_constraints=False
+            )
+        except ValidationError as error:
+            results[index]["errors"] = str(error)
+            continue
+
+        if process_async:
+            stage_image(attendance=attendance, image=record["image"])
+        attendances.append((index, attendance))
+
+    if attendances:
+        with transaction.atomic():
+            _insert_attendances(attendances=attendances, results=results)
+
+    if process_async:
+        attendance_ids = [
+            result["id"] for result in results if result["status"] == RECORD_CREATED
+        ]
+        transaction.on_commit(
+            lambda: [
+                submit_attendance_image(attendance_id)
+                for attendance_id in attendance_ids
+            ]
+        )
+
+    return True, results
@@ -0,0 +1,163 @@
+"""
+This file contains all the partition services for attendance module.
+"""
+
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.utils.timezone import make_aware
+
+from attendance.models import Attendance
+
+PARTITION_NAME = "{table}_p{year:04d}_{month:02d}"
+DEFAULT_PARTITION_NAME = "{table}_default"
+# Keeps the ids and idempotency keys unique across the partitions, see migration 0008
+ATTENDANCE_KEY_TABLE = "attendance_attendance_key"
+
+
+def get_month_start(day: date, months: int = 0) -> date:
+    """
+    Returns the first day of the month the given number of months after the month of day
+    """
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def is_attendance_partitioned() -> bool:
+    """
+    Returns whether the attendance table is a partitioned table, which is only the case on
+    PostgreSQL once the partitioning migration has run
+    """
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass(%s))",
+            [Attendance._meta.db_table],
+        )
+        return cursor.fetchone()[0]
+
+
+def get_attendance_partitions() -> List[Tuple[str, Optional[date]]]:
+    """
+    Returns the name and month of the monthly partitions attached to the attendance table,
+    oldest first. The default partition is left out.
+    """
+    table = Attendance._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(%s) ORDER BY child.relname",
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        if name == DEFAULT_PARTITION_NAME.format(table=table):
+            continue
+        year, month = name.rsplit("_p", 1)[1].split("_")
+        partitions.append((name, date(int(year), int(month), 1)))
+    return partitions
+
+
+def create_attendance_partitions(start_month: date, months: int) -> List[str]:
+    """
+    This service is used to create the monthly partitions of the attendance table from the
+    month of start_month for the given number of months, bounded by local midnight of the
+    first day of each month. Existing partitions are skipped. Returns the created names.
+
+    PostgreSQL refuses a partition for a range the default partition has rows in, so the
+    default partition is detached meanwhile and its rows in the range of the new partitions
+    are moved to them. The rows are moved between detached tables, leaving the attendance
+    key table as is, and the attendance table is locked until the transaction commits.
+    """
+    table = Attendance._meta.db_table
+    default_name = DEFAULT_PARTITION_NAME.format(table=table)
+    existing = {name for name, _ in get_attendance_partitions()}
+    partitions = []
+    for offset in range(months):
+        month_start = get_month_start(day=start_month, months=offset)
+        name = PARTITION_NAME.format(
+            table=table, year=month_start.year, month=month_start.month
+        )
+        if name not in existing:
+            partitions.append(
+                (
+                    name,
+                    make_aware(datetime.combine(month_start, datetime.min.time())),
+                    make_aware(
+                        datetime.combine(
+                            get_month_start(day=month_start, months=1),
+                            datetime.min.time(),
+                        )
+                    ),
+                )
+            )
+    if not partitions:
+        return []
+
+    table = connection.ops.quote_name(table)
+    default_partition = connection.ops.quote_name(default_name)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {default_partition}")
+        for name, lower_bound, upper_bound in partitions:
+            partition = connection.ops.quote_name(name)
+            cursor.execute(
+                f"CREATE TABLE {partition} (LIKE {table} INCLUDING CONSTRAINTS)"
+            )
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {default_partition} "
+                "WHERE attendance_time >= %s AND attendance_time < %s RETURNING *) "
+                f"INSERT INTO {partition} SELECT * FROM moved",
+                [lower_bound, upper_bound],
+            )
+            cursor.execute(
+                f"ALTER TABLE {table} ATTACH PARTITION {partition} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                [lower_bound, upper_bound],
+            )
+        cursor.execute(
+            f"ALTER TABLE {table} ATTACH PARTITION {default_partition} DEFAULT"
+        )
+    return [name for name, _, _ in partitions]
+
+
+def detach_attendance_partitions(
+    before_month: date, archive_schema: Optional[str] = None
+) -> List[str]:
+    """
+    This service is used to detach the monthly partitions of the attendance table older than
+    the month of before_month. Detached partitions are kept as plain tables, moved to the
+    archive schema when one is given, so their rows can still be exported or dropped later.
+    Their keys are removed from the attendance key table. Returns the detached names.
+    """
+    table = connection.ops.quote_name(Attendance._meta.db_table)
+    detached = []
+    with connection.cursor() as cursor:
+        for name, month_start in get_attendance_partitions():
+            if month_start >= get_month_start(day=before_month):
+                break
+            with transaction.atomic():
+                cursor.execute(
+                    f"ALTER TABLE {table} DETACH PARTITION "
+                    f"{connection.ops.quote_name(name)}"
+                )
+                cursor.execute(
+                    f"DELETE FROM {connection.ops.quote_name(ATTENDANCE_KEY_TABLE)} "
+                    f"WHERE id IN (SELECT id FROM {connection.ops.quote_name(name)})"
+                )
+                if archive_schema:
+                    cursor.execute(
+                        "CREATE SCHEMA IF NOT EXISTS "
+                        f"{connection.ops.quote_name(archive_schema)}"
+                    )
+                    cursor.execute(
+                        f"ALTER TABLE {connection.ops.quote_name(name)} SET SCHEMA "
+                        f"{connection.ops.quote_name(archive_schema)}"
+                    )
+            detached.append(name)
+    return detached
@@ -0,0 +1,69 @@
+"""
+This file contains all the image processing services for attendance module.
+"""
+
+import logging
+import os
+from typing import Tuple, Union
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from PIL import Image
+
+from attendance.constants import IMAGE_PROCESSING_FAILED
+from attendance.models import Attendance
+from utils.constants import INVALID_IMAGE, VARIABLE_MUST_BE_INSTANCE
+from utils.files import FILE_STORAGE
+
+logger = logging.getLogger(__name__)
+
+
+def process_attendance_image(
+    attendance: Attendance,
+) -> Tuple[bool, Union[str, Attendance]]:
+    """
+    This service is used to validate the staged image of a pending attendance and to normalize
+    and store it at its final path. The staged file is removed and the image status is updated either way.
+    """
+    assert isinstance(attendance, Attendance), VARIABLE_MUST_BE_INSTANCE.format(
+        variable="attendance", model="Attendance"
+    )
+
+    staged_name = attendance.image.name
+    error = None
+    try:
+        with FILE_STORAGE.open(staged_name) as staged_file:
+            Image.open(staged_file).verify()
+            staged_file.seek(0)
+            attendance.image.save(
+                os.path.basename(staged_name), File(staged_file), save=False
+            )
+    except (OSError, SyntaxError, Image.DecompressionBombError, ValidationError):
+        error = INVALID_IMAGE
+    except Exception:
+        logger.exception("Processing image of attendance %s failed", attendance.id)
+        error = IMAGE_PROCESSING_FAILED
+
+    if error:
+        attendance.image = None
+        attendance.image_status = Attendance.ImageStatus.FAILED
+        attendance.image_error = error
+    else:
+        attendance.image_status = Attendance.ImageStatus.PROCESSED
+
+    attendance.save(
+        update_fields=[
+            "image",
+            "image_original_size",
+            "image_size",
+            "image_status",
+            "image_error",
+            "date_updated",
+        ],
+        skip_clean=True,
+    )
+    FILE_STORAGE.delete(staged_name)
+
+    if error:
+        return False, error
+    return True, attendance
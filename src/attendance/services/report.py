@@ -0,0 +1,109 @@
+"""
+This file contains all the report services for attendance module.
+"""
+
+from datetime import date
+from typing import List, Optional, Union
+
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils.timezone import localtime
+
+from attendance.constants import REPORT_PERIOD_DAY, REPORT_PERIOD_WEEK
+from attendance.models import AttendanceRollup
+from rosters.models import RosterManager, ShiftOccurrence
+from users.models import User
+
+
+def get_period_trunc(period: str):
+    """
+    Returns the database function truncating a date to the start of its period
+    """
+    if period == REPORT_PERIOD_DAY:
+        return TruncDay
+    if period == REPORT_PERIOD_WEEK:
+        return TruncWeek
+    return TruncMonth
+
+
+def get_attendance_report(
+    manager: Union[int, User],
+    period: str,
+    start_date: date,
+    end_date: date,
+    roster: Optional[int] = None,
+) -> List[dict]:
+    """
+    This service is used to summarize the attendance of the rosters of a manager per period
+    between two dates, both inclusive, with two grouped queries: one over the shift
+    occurrences for the scheduled shifts and one over the daily rollups for the attended
+    ones, so the cost grows with the number of rollups and not of attendance records.
+    A scheduled shift is counted as absent once it has ended without any attendance.
+    """
+    current_time = localtime()
+    ended = Q(date__lt=current_time.date()) | Q(
+        date=current_time.date(), end_time__lte=current_time.time()
+    )
+    trunc = get_period_trunc(period=period)
+    filters = Q(
+        date__range=(start_date, end_date),
+        roster__date_deleted__isnull=True,
+        roster_id__in=RosterManager.alive.filter(
+            manager_id=manager.id if isinstance(manager, User) else manager,
+        ).values("roster_id"),
+    )
+    if roster:
+        filters &= Q(roster_id=roster)
+
+    report = {}
+    shift_occurrences = (
+        ShiftOccurrence.objects.filter(filters)
+        .annotate(period_start=trunc("date"))
+        .values("roster_id", "roster__title", "period_start")
+        .annotate(
+            scheduled=Count("id"),
+            ended=Count("id", filter=ended),
+        )
+        .order_by()
+    )
+    for row in shift_occurrences:
+        report[(row["roster_id"], row["period_start"])] = {
+            **row,
+            "present": 0,
+            "late": 0,
+            "ended_present": 0,
+        }
+
+    rollups = (
+        AttendanceRollup.objects.filter(filters)
+        .annotate(period_start=trunc("date"))
+        .values("roster_id", "roster__title", "period_start")
+        .annotate(
+            present=Count("id"),
+            late=Count("id", filter=Q(is_late=True)),
+            ended_present=Count(
+                "id",
+                filter=Q(date__lt=current_time.date())
+                | Q(
+                    date=current_time.date(),
+                    roster_user_schedule__end_time__lte=current_time.time(),
+                ),
+            ),
+        )
+        .order_by()
+    )
+    for row in rollups:
+        report.setdefault(
+            (row["roster_id"], row["period_start"]),
+            {**row, "scheduled": 0, "ended": 0},
+        ).update(
+            present=row["present"],
+            late=row["late"],
+            ended_present=row["ended_present"],
+        )
+
+    for row in report.values():
+        row["absent"] = max(row.pop("ended") - row.pop("ended_present"), 0)
+    return sorted(
+        report.values(), key=lambda row: (row["period_start"], row["roster__title"])
+    )
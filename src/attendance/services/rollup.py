@@ -0,0 +1,175 @@
+"""
+This file contains all the rollup services for attendance module.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.timezone import localtime, make_aware
+
+from attendance.models import Attendance, AttendanceRollup
+from rosters.models import RosterUserSchedule
+
+ROLLUP_BATCH_SIZE = 1000
+ROLLUP_UPDATE_FIELDS = (
+    "roster_user_schedule",
+    "attendance_count",
+    "first_attendance_time",
+    "is_late",
+)
+
+RollupKey = Tuple[int, int, date, int]
+
+
+def is_late_attendance(
+    roster_user_schedule: RosterUserSchedule, attendance_time: datetime
+) -> bool:
+    """
+    Returns whether attendance marked at the given moment is late for the shift of the
+    schedule, that is after ATTENDANCE_GRACE_MINUTES past the start of the shift
+    """
+    attendance_time = localtime(attendance_time)
+    late_after = attendance_time.replace(
+        hour=roster_user_schedule.start_time.hour,
+        minute=roster_user_schedule.start_time.minute,
+        second=roster_user_schedule.start_time.second,
+        microsecond=0,
+    ) + timedelta(minutes=settings.ATTENDANCE_GRACE_MINUTES)
+    return attendance_time > late_after
+
+
+def build_attendance_rollups(
+    attendances: Iterable[Attendance],
+) -> Dict[RollupKey, AttendanceRollup]:
+    """
+    This function is used to fold attendances into unsaved rollups keyed by roster, user,
+    date and shift. The roster user schedules of the attendances must be loaded.
+    """
+    rollups = {}
+    for attendance in attendances:
+        roster_user_schedule = attendance.roster_user_schedule
+        attendance_time = localtime(attendance.attendance_time)
+        key = (
+            roster_user_schedule.roster_id,
+            roster_user_schedule.user_id,
+            attendance_time.date(),
+            roster_user_schedule.shift,
+        )
+        is_late = is_late_attendance(
+            roster_user_schedule=roster_user_schedule,
+            attendance_time=attendance_time,
+        )
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollups[key] = AttendanceRollup(
+                roster_id=key[0],
+                user_id=key[1],
+                date=key[2],
+                shift=key[3],
+                roster_user_schedule_id=roster_user_schedule.id,
+                attendance_count=1,
+                first_attendance_time=attendance_time,
+                is_late=is_late,
+            )
+            continue
+
+        rollup.attendance_count += 1
+        if attendance_time < rollup.first_attendance_time:
+            rollup.first_attendance_time = attendance_time
+            rollup.roster_user_schedule_id = roster_user_schedule.id
+        # Lateness follows the first attendance, so one on time attendance is enough
+        rollup.is_late = rollup.is_late and is_late
+    return rollups
+
+
+def _merge_attendance_rollups(rollups: Dict[RollupKey, AttendanceRollup]) -> None:
+    """
+    This function is used to merge rollups into the stored ones with a fixed number of
+    queries, locking the stored rows so that concurrent merges do not lose counts
+    """
+    keys = Q()
+    for roster_id, user_id, day, shift in rollups:
+        keys |= Q(roster_id=roster_id, user_id=user_id, date=day, shift=shift)
+
+    existing_rollups = []
+    for existing_rollup in AttendanceRollup.objects.select_for_update().filter(keys):
+        rollup = rollups.pop(
+            (
+                existing_rollup.roster_id,
+                existing_rollup.user_id,
+                existing_rollup.date,
+                existing_rollup.shift,
+            )
+        )
+        existing_rollup.attendance_count += rollup.attendance_count
+        if rollup.first_attendance_time < existing_rollup.first_attendance_time:
+            existing_rollup.first_attendance_time = rollup.first_attendance_time
+            existing_rollup.roster_user_schedule_id = rollup.roster_user_schedule_id
+        existing_rollup.is_late = existing_rollup.is_late and rollup.is_late
+        existing_rollups.append(existing_rollup)
+
+    if existing_rollups:
+        AttendanceRollup.objects.bulk_update(
+            objs=existing_rollups, fields=ROLLUP_UPDATE_FIELDS
+        )
+    if rollups:
+        AttendanceRollup.objects.bulk_create(objs=list(rollups.values()))
+
+
+def record_attendance_rollups(attendances: List[Attendance]) -> int:
+    """
+    This service is used to add created attendances to the daily rollups, with a fixed number
+    of queries however many attendances are given. The roster user schedules of the
+    attendances must be loaded. Returns the number of rollups touched.
+    """
+    if not attendances:
+        return 0
+
+    rollups = build_attendance_rollups(attendances=attendances)
+    try:
+        with transaction.atomic():
+            _merge_attendance_rollups(rollups=dict(rollups))
+    except IntegrityError:
+        # A rollup inserted concurrently after the lookup fails the insert, the retry finds it
+        with transaction.atomic():
+            _merge_attendance_rollups(rollups=dict(rollups))
+    return len(rollups)
+
+
+def rebuild_attendance_rollups(start_date: date, end_date: date) -> int:
+    """
+    This service is used to rebuild the rollups between two dates, both inclusive, from the
+    raw attendance records, e.g. after a backfill. Returns the number of rollups created.
+    """
+    # Bounds on the attendance time itself, unlike a date lookup, let PostgreSQL scan only
+    # the partitions of the dates
+    attendances = (
+        Attendance.objects.filter(
+            attendance_time__gte=make_aware(
+                datetime.combine(start_date, datetime.min.time())
+            ),
+            attendance_time__lt=make_aware(
+                datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+            ),
+        )
+        .select_related("roster_user_schedule")
+        .only(
+            "attendance_time",
+            "roster_user_schedule__roster",
+            "roster_user_schedule__user",
+            "roster_user_schedule__shift",
+            "roster_user_schedule__start_time",
+        )
+    )
+    rollups = build_attendance_rollups(
+        attendances=attendances.iterator(chunk_size=ROLLUP_BATCH_SIZE)
+    )
+    with transaction.atomic():
+        AttendanceRollup.objects.filter(date__range=(start_date, end_date)).delete()
+        AttendanceRollup.objects.bulk_create(
+            objs=rollups.values(), batch_size=ROLLUP_BATCH_SIZE
+        )
+    return len(rollups)
@@ -0,0 +1,27 @@
+"""
+This file contains all the signal receivers for attendance module
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from attendance.models import Attendance
+
+
+@receiver(post_delete, sender=Attendance)
+def delete_unreferenced_image(sender, instance, **kwargs):
+    """
+    Images are shared by the attendance rows with the same image content, the file is only
+    deleted with the last attendance referencing it. Soft deleted rows still reference it.
+    """
+    if not instance.image:
+        return
+
+    name, storage = instance.image.name, instance.image.storage
+
+    def delete_image():
+        if not Attendance.objects.filter(image=name).exists():
+            storage.delete(name)
+
+    transaction.on_commit(delete_image)
@@ -0,0 +1,50 @@
+"""
+This file contains the worker pool processing the attendance images in the background
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from attendance.models import Attendance
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ATTENDANCE_IMAGE_WORKERS,
+                thread_name_prefix="attendance-image",
+            )
+    return _executor
+
+
+def run_attendance_image_task(attendance_id: int) -> bool:
+    """
+    Processes the pending image of an attendance, returns False if there is none
+    """
+    # Imported here as the attendance services submit to this module
+    from attendance.services import process_attendance_image
+
+    try:
+        attendance = Attendance.objects.filter(
+            id=attendance_id, image_status=Attendance.ImageStatus.PENDING
+        ).first()
+        if attendance is None:
+            return False
+        success, _ = process_attendance_image(attendance=attendance)
+        return success
+    finally:
+        # Worker threads have their own database connections
+        close_old_connections()
+
+
+def submit_attendance_image(attendance_id: int) -> Future:
+    return get_executor().submit(run_attendance_image_task, attendance_id)
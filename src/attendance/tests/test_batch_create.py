@@ -0,0 +1,135 @@
+"""
+This file contains all the tests of the batch sync of the attendance records of the kiosks
+"""
+
+import json
+from datetime import timedelta
+from uuid import uuid4
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.utils.timezone import now
+
+from attendance.constants import RECORD_CREATED, RECORD_DUPLICATE, RECORD_INVALID
+from attendance.models import Attendance
+from attendance.services import bulk_create_attendances
+from users.models import UserRole
+from utils.files import FILE_STORAGE
+from utils.testing import (
+    create_all_day_roster,
+    create_user,
+    get_client_for,
+    get_image,
+    use_temporary_storages,
+)
+
+STAGING_DIRECTORY = Attendance.STAGING_UPLOAD_TO.rsplit("/", 1)[0]
+
+
+class BatchCreateAttendancesTest(TestCase):
+    def setUp(self):
+        use_temporary_storages(test_case=self)
+        manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        create_all_day_roster(manager=manager, staff_member=self.staff_member)
+
+    def get_record(self, image=None, idempotency_key=None) -> dict:
+        return {
+            "idempotency_key": idempotency_key or uuid4(),
+            "attendance_time": now() - timedelta(minutes=1),
+            "image": image or get_image(),
+        }
+
+    def bulk_create(self, records, **kwargs):
+        success, results = bulk_create_attendances(
+            user=self.staff_member,
+            records=records,
+            created_by=self.staff_member,
+            **kwargs,
+        )
+        self.assertTrue(success)
+        return results
+
+    def post_batch(self, records, images):
+        return get_client_for(user=self.staff_member).post(
+            "/attendance/batch/",
+            {
+                "records": json.dumps(records),
+                "images": images,
+            },
+            format="multipart",
+        )
+
+    def test_rows_failing_model_validation_are_not_inserted(self):
+        results = self.bulk_create(
+            records=[
+                self.get_record(),
+                self.get_record(image=get_image(name="a.gif", image_format="GIF")),
+            ]
+        )
+
+        self.assertEqual(
+            [result["status"] for result in results], [RECORD_CREATED, RECORD_INVALID]
+        )
+        self.assertIn("extension", results[1]["errors"])
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_concurrently_synced_rows_release_their_staged_images(self):
+        synced_record = self.get_record()
+        (synced_result,) = self.bulk_create(records=[synced_record])
+
+        # As if the batch was replayed while the first sync was still running
+        results = self.bulk_create(
+            records=[
+                self.get_record(idempotency_key=synced_record["idempotency_key"]),
+                self.get_record(),
+            ],
+            process_async=True,
+            synced_ids={},
+        )
+
+        self.assertEqual(
+            [(result["status"], result["id"]) for result in results],
+            [
+                (RECORD_DUPLICATE, synced_result["id"]),
+                (RECORD_CREATED, results[1]["id"]),
+            ],
+        )
+        staged_image = Attendance.objects.get(id=results[1]["id"]).image.name
+        self.assertEqual(
+            [
+                f"{STAGING_DIRECTORY}/{name}"
+                for name in FILE_STORAGE.listdir(STAGING_DIRECTORY)[1]
+            ],
+            [staged_image],
+        )
+
+    def test_replayed_records_skip_image_validation(self):
+        record = {
+            "idempotency_key": str(uuid4()),
+            "attendance_time": (now() - timedelta(minutes=1)).isoformat(),
+            "image": 0,
+        }
+        response = self.post_batch(records=[record], images=[get_image()])
+        self.assertEqual(response.status_code, 200)
+        attendance_id = response.json()["data"][0]["id"]
+
+        # Passes the signature check of the upload handler, not the Pillow validation
+        truncated_image = SimpleUploadedFile(
+            name="attendance.jpg",
+            content=get_image().read()[:64],
+            content_type="image/jpeg",
+        )
+        response = self.post_batch(
+            records=[record, {**record, "idempotency_key": str(uuid4())}],
+            images=[truncated_image],
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(result["status"], result["id"]) for result in response.json()["data"]],
+            [(RECORD_DUPLICATE, attendance_id), (RECORD_INVALID, None)],
+        )
+        self.assertIn("image", response.json()["data"][1]["errors"])
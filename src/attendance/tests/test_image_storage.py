@@ -0,0 +1,108 @@
+"""
+This file contains all the tests of the content addressed storage of the attendance images
+"""
+
+import os
+from tempfile import TemporaryDirectory
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase
+from django.utils.timezone import now
+
+from attendance.models import Attendance
+from users.models import UserRole
+from utils.files import CONTENT_ADDRESSED_STORAGE
+from utils.storages import ContentAddressedStorage
+from utils.testing import (
+    create_all_day_roster,
+    create_user,
+    get_image,
+    use_temporary_storages,
+)
+
+
+class ContentAddressedStorageTest(SimpleTestCase):
+    def setUp(self):
+        location = TemporaryDirectory()
+        self.addCleanup(location.cleanup)
+        self.storage = ContentAddressedStorage(location=location.name)
+
+    def list_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(directory, filename), self.storage.location)
+            for directory, _, filenames in os.walk(self.storage.location)
+            for filename in filenames
+        )
+
+    def test_identical_contents_share_one_file(self):
+        first_name = self.storage.save("images/first.JPG", ContentFile(b"content"))
+        second_name = self.storage.save("images/second.jpg", ContentFile(b"content"))
+
+        self.assertEqual(first_name, second_name)
+        self.assertTrue(self.storage.is_content_addressed(first_name))
+        self.assertTrue(
+            first_name.startswith("images/") and first_name.endswith(".jpg")
+        )
+        self.assertEqual(self.list_files(), [first_name])
+
+    def test_different_contents_are_stored_apart(self):
+        first_name = self.storage.save("images/image.jpg", ContentFile(b"first"))
+        second_name = self.storage.save("images/image.jpg", ContentFile(b"second"))
+
+        self.assertNotEqual(first_name, second_name)
+        self.assertEqual(self.list_files(), sorted([first_name, second_name]))
+        with self.storage.open(second_name) as file:
+            self.assertEqual(file.read(), b"second")
+
+    def test_uploaded_names_are_not_content_addressed(self):
+        self.assertFalse(
+            self.storage.is_content_addressed("files/attendance/images/image.jpg")
+        )
+
+
+class ImageReferencesTest(TestCase):
+    def setUp(self):
+        use_temporary_storages(test_case=self)
+        manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        roster = create_all_day_roster(manager=manager, staff_member=self.staff_member)
+        self.roster_user_schedule = roster.rosteruserschedule_set.first()
+
+    def create_attendance(self) -> Attendance:
+        attendance = Attendance(
+            roster_user_schedule=self.roster_user_schedule,
+            attendance_time=now(),
+            image=get_image(),
+            created_by=self.staff_member,
+        )
+        attendance.save(skip_clean=True)
+        return attendance
+
+    def delete(self, attendance: Attendance) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            attendance.delete()
+
+    def test_image_is_deleted_with_the_last_attendance_referencing_it(self):
+        first_attendance = self.create_attendance()
+        second_attendance = self.create_attendance()
+        name = first_attendance.image.name
+        self.assertEqual(second_attendance.image.name, name)
+
+        self.delete(attendance=first_attendance)
+        self.assertTrue(CONTENT_ADDRESSED_STORAGE.exists(name))
+
+        self.delete(attendance=second_attendance)
+        self.assertFalse(CONTENT_ADDRESSED_STORAGE.exists(name))
+
+    def test_soft_deleted_attendances_keep_their_image(self):
+        soft_deleted_attendance = self.create_attendance()
+        Attendance.objects.filter(id=soft_deleted_attendance.id).soft_delete()
+        attendance = self.create_attendance()
+
+        self.delete(attendance=attendance)
+
+        self.assertTrue(
+            CONTENT_ADDRESSED_STORAGE.exists(soft_deleted_attendance.image.name)
+        )
@@ -0,0 +1,174 @@
+"""
+This file contains all the tests of the monthly partitions of the attendance table, which
+only exist on PostgreSQL
+"""
+
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import skipIf, skipUnless
+from uuid import uuid4
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.utils.timezone import localdate, make_aware, now
+
+from attendance.models import Attendance
+from attendance.services.partition import (
+    ATTENDANCE_KEY_TABLE,
+    DEFAULT_PARTITION_NAME,
+    PARTITION_NAME,
+    create_attendance_partitions,
+    detach_attendance_partitions,
+    get_month_start,
+    is_attendance_partitioned,
+)
+from users.models import UserRole
+from utils.testing import create_roster_with_schedules, create_user
+
+IS_POSTGRESQL = connection.vendor == "postgresql"
+
+
+@skipIf(IS_POSTGRESQL, "The attendance table is partitioned on PostgreSQL")
+class UnpartitionedAttendanceTest(TestCase):
+    def test_partitions_are_not_managed(self):
+        output = StringIO()
+        call_command("manage_attendance_partitions", stdout=output)
+
+        self.assertFalse(is_attendance_partitioned())
+        self.assertEqual(
+            output.getvalue(), "Attendance table is not partitioned, nothing to do\n"
+        )
+
+
+@skipUnless(IS_POSTGRESQL, "The attendance table is only partitioned on PostgreSQL")
+class AttendancePartitionsTest(TestCase):
+    def setUp(self):
+        manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        roster = create_roster_with_schedules(
+            manager=manager, staff_members=[self.staff_member]
+        )
+        self.roster_user_schedule = roster.rosteruserschedule_set.first()
+
+    def create_attendance(self, **kwargs) -> Attendance:
+        attendance = Attendance(
+            roster_user_schedule=self.roster_user_schedule,
+            created_by=self.staff_member,
+            **kwargs,
+        )
+        # Without the model validation, to hit the database constraints
+        with transaction.atomic():
+            attendance.save(skip_clean=True, force_insert=True)
+        return attendance
+
+    def get_partition_of(self, attendance: Attendance) -> str:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT tableoid::regclass::text FROM {Attendance._meta.db_table} "
+                "WHERE id = %s",
+                [attendance.id],
+            )
+            return cursor.fetchone()[0]
+
+    def count_attendance_keys(self) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {ATTENDANCE_KEY_TABLE}")
+            return cursor.fetchone()[0]
+
+    def test_attendance_is_stored_in_the_partition_of_its_month(self):
+        attendance = self.create_attendance(attendance_time=now())
+
+        self.assertTrue(is_attendance_partitioned())
+        self.assertEqual(
+            self.get_partition_of(attendance),
+            PARTITION_NAME.format(
+                table=Attendance._meta.db_table,
+                year=localdate().year,
+                month=localdate().month,
+            ),
+        )
+
+    def test_idempotency_key_is_unique_across_partitions(self):
+        idempotency_key = uuid4()
+        self.create_attendance(attendance_time=now(), idempotency_key=idempotency_key)
+
+        with self.assertRaises(IntegrityError):
+            self.create_attendance(
+                attendance_time=now() - timedelta(days=62),
+                idempotency_key=idempotency_key,
+            )
+
+    def test_id_is_unique_across_partitions(self):
+        attendance = self.create_attendance(attendance_time=now())
+
+        with self.assertRaises(IntegrityError):
+            self.create_attendance(
+                id=attendance.id, attendance_time=now() - timedelta(days=62)
+            )
+
+    def test_keys_follow_updates_and_deletes(self):
+        idempotency_key = uuid4()
+        attendance = self.create_attendance(
+            attendance_time=now(), idempotency_key=idempotency_key
+        )
+        # Moved to the partition of another month
+        attendance.attendance_time = now() - timedelta(days=62)
+        attendance.save(skip_clean=True)
+        attendance.delete()
+
+        self.assertEqual(self.count_attendance_keys(), 0)
+        self.create_attendance(attendance_time=now(), idempotency_key=idempotency_key)
+
+    def test_partition_creation_moves_the_rows_of_the_default_partition(self):
+        month_start = get_month_start(day=localdate(), months=24)
+        idempotency_key = uuid4()
+        attendance = self.create_attendance(
+            attendance_time=make_aware(
+                datetime.combine(month_start, datetime.min.time())
+            ),
+            idempotency_key=idempotency_key,
+        )
+        self.assertEqual(
+            self.get_partition_of(attendance),
+            DEFAULT_PARTITION_NAME.format(table=Attendance._meta.db_table),
+        )
+
+        created = create_attendance_partitions(start_month=month_start, months=1)
+
+        self.assertEqual(created, [self.get_partition_of(attendance)])
+        self.assertEqual(self.count_attendance_keys(), 1)
+        with self.assertRaises(IntegrityError):
+            self.create_attendance(
+                attendance_time=now(), idempotency_key=idempotency_key
+            )
+
+    def test_detached_partitions_release_their_keys(self):
+        month_start = get_month_start(day=localdate(), months=-24)
+        create_attendance_partitions(start_month=month_start, months=1)
+        idempotency_key = uuid4()
+        self.create_attendance(
+            attendance_time=make_aware(
+                datetime.combine(month_start, datetime.min.time())
+            ),
+            idempotency_key=idempotency_key,
+        )
+
+        detached = detach_attendance_partitions(
+            before_month=get_month_start(day=month_start, months=1)
+        )
+
+        self.assertEqual(
+            detached,
+            [
+                PARTITION_NAME.format(
+                    table=Attendance._meta.db_table,
+                    year=month_start.year,
+                    month=month_start.month,
+                )
+            ],
+        )
+        self.assertEqual(self.count_attendance_keys(), 0)
+        self.create_attendance(attendance_time=now(), idempotency_key=idempotency_key)
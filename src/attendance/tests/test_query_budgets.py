@@ -0,0 +1,83 @@
+"""
+This file contains all the tests of the query budgets of the attendance APIs
+"""
+
+import json
+from datetime import timedelta
+from uuid import uuid4
+
+from django.utils.timezone import localdate, now
+
+from attendance.services import create_attendance
+from users.models import UserRole
+from utils.testing import (
+    QueryBudgetTestCase,
+    create_all_day_roster,
+    create_user,
+    get_client_for,
+    get_image,
+    use_temporary_storages,
+)
+
+
+class AttendanceQueryBudgetTest(QueryBudgetTestCase):
+    def setUp(self):
+        use_temporary_storages(test_case=self)
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        self.manager_client = get_client_for(user=self.manager)
+        self.staff_member_client = get_client_for(user=self.staff_member)
+
+        create_all_day_roster(manager=self.manager, staff_member=self.staff_member)
+
+    def test_create_attendance(self):
+        self.assertWithinQueryBudget(
+            lambda: self.staff_member_client.post(
+                "/attendance/", {"image": get_image()}, format="multipart"
+            ),
+            status_code=201,
+        )
+
+    def test_batch_create_attendances(self):
+        self.assertWithinQueryBudget(
+            lambda: self.staff_member_client.post(
+                "/attendance/batch/",
+                {
+                    "records": json.dumps(
+                        [
+                            {
+                                "idempotency_key": str(uuid4()),
+                                "attendance_time": (
+                                    now() - timedelta(minutes=1)
+                                ).isoformat(),
+                                "image": index,
+                            }
+                            for index in range(2)
+                        ]
+                    ),
+                    "images": [get_image(), get_image(name="other.jpg")],
+                },
+                format="multipart",
+            ),
+            status_code=200,
+        )
+
+    def test_attendance_report(self):
+        create_attendance(user=self.staff_member, image=get_image())
+        today = localdate()
+        self.assertWithinQueryBudget(
+            lambda: self.manager_client.get(
+                f"/attendance/report/?start_date={today - timedelta(days=6)}"
+                f"&end_date={today}"
+            ),
+            status_code=200,
+        )
+
+    def test_retrieve_attendance(self):
+        _, attendance = create_attendance(user=self.staff_member, image=get_image())
+        self.assertWithinQueryBudget(
+            lambda: self.staff_member_client.get(f"/attendance/{attendance.id}/"),
+            status_code=200,
+        )
@@ -0,0 +1,171 @@
+"""
+This file contains all the tests of the daily attendance rollups and the reports built on
+them
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.test import TestCase, override_settings
+from django.utils.timezone import localdate, make_aware
+
+from attendance.constants import REPORT_PERIOD_DAY
+from attendance.models import Attendance, AttendanceRollup
+from attendance.services import (
+    get_attendance_report,
+    rebuild_attendance_rollups,
+    record_attendance_rollups,
+)
+from rosters.services.occurrence import materialize_shift_occurrences
+from users.models import UserRole
+from utils.testing import create_roster_with_schedules, create_user
+
+ROLLUP_FIELDS = (
+    "roster_id",
+    "user_id",
+    "roster_user_schedule_id",
+    "date",
+    "shift",
+    "attendance_count",
+    "first_attendance_time",
+    "is_late",
+)
+
+
+@override_settings(ATTENDANCE_GRACE_MINUTES=10)
+class AttendanceRollupsTest(TestCase):
+    def setUp(self):
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.first_staff_member = create_user(
+            email="first@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        self.second_staff_member = create_user(
+            email="second@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        # Morning shifts from 9 to 13 of both staff members, every day
+        self.roster = create_roster_with_schedules(
+            manager=self.manager,
+            staff_members=[self.first_staff_member, self.second_staff_member],
+        )
+        # The Monday and Tuesday of two weeks ago, whose shifts have ended
+        self.monday = localdate() - timedelta(days=localdate().weekday() + 14)
+        self.tuesday = self.monday + timedelta(days=1)
+        materialize_shift_occurrences(
+            roster_user_schedules=self.roster.rosteruserschedule_set.all(),
+            start_date=self.monday,
+            end_date=self.tuesday,
+        )
+
+    def create_attendance(self, user, day, hour: int, minute: int) -> Attendance:
+        attendance = Attendance(
+            roster_user_schedule=self.roster.rosteruserschedule_set.get(
+                user=user, working_day=day.isoweekday()
+            ),
+            attendance_time=make_aware(
+                datetime.combine(day, time(hour=hour, minute=minute))
+            ),
+            created_by=user,
+        )
+        attendance.save(skip_clean=True)
+        return attendance
+
+    def create_attendances(self):
+        """
+        The first staff member is on time on Monday, twice, and late on Tuesday, the second
+        one is late on Monday and absent on Tuesday
+        """
+        return [
+            self.create_attendance(self.first_staff_member, self.monday, 9, 40),
+            self.create_attendance(self.first_staff_member, self.monday, 9, 5),
+            self.create_attendance(self.first_staff_member, self.tuesday, 9, 30),
+            self.create_attendance(self.second_staff_member, self.monday, 9, 20),
+        ]
+
+    def get_rollups(self):
+        return list(
+            AttendanceRollup.objects.order_by("date", "user_id").values(*ROLLUP_FIELDS)
+        )
+
+    def test_recorded_rollups_match_the_rebuilt_ones(self):
+        attendances = self.create_attendances()
+        # In two batches, the second one merging into the rollups of the first one
+        record_attendance_rollups(attendances=attendances[:1])
+        record_attendance_rollups(attendances=attendances[1:])
+        recorded_rollups = self.get_rollups()
+
+        rebuilt = rebuild_attendance_rollups(
+            start_date=self.monday, end_date=self.tuesday
+        )
+
+        self.assertEqual(rebuilt, 3)
+        self.assertEqual(self.get_rollups(), recorded_rollups)
+        self.assertEqual(
+            [
+                (
+                    rollup["user_id"],
+                    rollup["date"],
+                    rollup["attendance_count"],
+                    rollup["is_late"],
+                )
+                for rollup in recorded_rollups
+            ],
+            [
+                (self.first_staff_member.id, self.monday, 2, False),
+                (self.second_staff_member.id, self.monday, 1, True),
+                (self.first_staff_member.id, self.tuesday, 1, True),
+            ],
+        )
+        self.assertEqual(
+            recorded_rollups[0]["first_attendance_time"], attendances[1].attendance_time
+        )
+
+    def test_rebuild_replaces_the_rollups_of_its_dates_only(self):
+        self.create_attendances()
+        record_attendance_rollups(
+            attendances=list(Attendance.objects.select_related("roster_user_schedule"))
+        )
+        AttendanceRollup.objects.filter(date=self.monday).update(attendance_count=99)
+        AttendanceRollup.objects.filter(date=self.tuesday).update(attendance_count=99)
+
+        rebuild_attendance_rollups(start_date=self.monday, end_date=self.monday)
+
+        self.assertEqual(
+            [
+                (rollup["date"], rollup["attendance_count"])
+                for rollup in self.get_rollups()
+            ],
+            [(self.monday, 2), (self.monday, 1), (self.tuesday, 99)],
+        )
+
+    def test_report_totals_match_the_raw_attendance_records(self):
+        attendances = self.create_attendances()
+        rebuild_attendance_rollups(start_date=self.monday, end_date=self.tuesday)
+
+        report = get_attendance_report(
+            manager=self.manager,
+            period=REPORT_PERIOD_DAY,
+            start_date=self.monday,
+            end_date=self.tuesday,
+        )
+
+        attended_shifts = {
+            (
+                attendance.roster_user_schedule.user_id,
+                attendance.attendance_time.date(),
+            )
+            for attendance in attendances
+        }
+        self.assertEqual(
+            [
+                {key: row[key] for key in ("scheduled", "present", "late", "absent")}
+                for row in report
+            ],
+            [
+                {"scheduled": 2, "present": 2, "late": 1, "absent": 0},
+                {"scheduled": 2, "present": 1, "late": 1, "absent": 1},
+            ],
+        )
+        self.assertEqual(sum(row["present"] for row in report), len(attended_shifts))
+        self.assertEqual(
+            sum(rollup["attendance_count"] for rollup in self.get_rollups()),
+            len(attendances),
+        )
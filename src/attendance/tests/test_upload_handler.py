@@ -0,0 +1,127 @@
+"""
+This file contains all the tests of the upload handler checking the attendance images
+while the request body is read
+"""
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopUpload
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from attendance.models import Attendance
+from users.models import UserRole
+from utils.constants import FILE_SIZE_LIMIT_EXCEEDED, UNSUPPORTED_IMAGE_TYPE
+from utils.testing import (
+    create_all_day_roster,
+    create_user,
+    get_client_for,
+    get_image,
+    use_temporary_storages,
+)
+from utils.upload_handlers import ImageUploadHandler
+
+GIF_HEADER = b"GIF89a\x01\x00\x01\x00"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@override_settings(IMAGE_UPLOAD_FIELDS={"image": 1})
+class ImageUploadHandlerTest(SimpleTestCase):
+    def get_handler(self, field_name: str = "image") -> ImageUploadHandler:
+        handler = ImageUploadHandler(request=RequestFactory().post("/attendance/"))
+        handler.new_file(field_name, "attendance.jpg", "image/jpeg", None)
+        return handler
+
+    def test_images_are_passed_through(self):
+        handler = self.get_handler()
+        content = get_image().read()
+
+        self.assertEqual(handler.receive_data_chunk(content[:4], 0), content[:4])
+        self.assertEqual(handler.receive_data_chunk(content[4:], 4), content[4:])
+        self.assertIsNone(handler.file_complete(len(content)))
+
+    def test_other_signatures_stop_the_upload(self):
+        handler = self.get_handler()
+
+        with self.assertRaises(StopUpload) as context:
+            handler.receive_data_chunk(GIF_HEADER, 0)
+
+        self.assertTrue(context.exception.connection_reset)
+        self.assertEqual(
+            handler.request.rejected_uploads, {"image": [UNSUPPORTED_IMAGE_TYPE]}
+        )
+
+    def test_files_shorter_than_a_signature_are_checked_once_complete(self):
+        handler = self.get_handler()
+        handler.receive_data_chunk(b"\xff\xd8", 0)
+
+        with self.assertRaises(StopUpload):
+            handler.file_complete(2)
+
+        self.assertEqual(
+            handler.request.rejected_uploads, {"image": [UNSUPPORTED_IMAGE_TYPE]}
+        )
+
+    def test_oversized_files_stop_the_upload_before_their_last_chunk(self):
+        handler = self.get_handler()
+        handler.receive_data_chunk(get_image().read()[:64], 0)
+
+        with self.assertRaises(StopUpload):
+            handler.receive_data_chunk(b"\x00" * 64, 1024 * 1024 - 32)
+
+        self.assertEqual(
+            handler.request.rejected_uploads,
+            {"image": [FILE_SIZE_LIMIT_EXCEEDED.format(max_file_size=1)]},
+        )
+
+    def test_other_fields_are_not_checked(self):
+        handler = self.get_handler(field_name="document")
+
+        self.assertEqual(handler.receive_data_chunk(GIF_HEADER, 0), GIF_HEADER)
+        self.assertIsNone(handler.file_complete(len(GIF_HEADER)))
+
+
+class RejectedUploadsTest(TestCase):
+    def setUp(self):
+        use_temporary_storages(test_case=self)
+        manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        create_all_day_roster(manager=manager, staff_member=self.staff_member)
+
+    def test_rejected_images_are_reported_without_creating_attendances(self):
+        response = get_client_for(user=self.staff_member).post(
+            "/attendance/",
+            {
+                "image": SimpleUploadedFile(
+                    name="attendance.jpg",
+                    content=GIF_HEADER,
+                    content_type="image/jpeg",
+                )
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"], {"image": [UNSUPPORTED_IMAGE_TYPE]})
+        self.assertFalse(Attendance.objects.exists())
+
+    @override_settings(IMAGE_UPLOAD_FIELDS={"image": 1})
+    def test_oversized_images_are_reported_without_creating_attendances(self):
+        response = get_client_for(user=self.staff_member).post(
+            "/attendance/",
+            {
+                "image": SimpleUploadedFile(
+                    name="attendance.png",
+                    content=PNG_SIGNATURE + bytes(1024 * 1024),
+                    content_type="image/png",
+                )
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"],
+            {"image": [FILE_SIZE_LIMIT_EXCEEDED.format(max_file_size=1)]},
+        )
+        self.assertFalse(Attendance.objects.exists())
@@ -4,8 +4,23 @@ This file contains all the urls used for attendance module
 
 from django.urls import path
 
-from attendance.apis import attendance
+from attendance.apis import attendance, report
 
 urlpatterns = [
-    path("", attendance.CreateAttendanceAPI.as_view(), name="attendance-create")
+    path("", attendance.CreateAttendanceAPI.as_view(), name="attendance-create"),
+    path(
+        "batch/",
+        attendance.BatchCreateAttendanceAPI.as_view(),
+        name="attendance-batch-create",
+    ),
+    path(
+        "report/",
+        report.AttendanceReportAPI.as_view(),
+        name="attendance-report",
+    ),
+    path(
+        "<int:pk>/",
+        attendance.RetrieveAttendanceAPI.as_view(),
+        name="attendance-retrieve",
+    ),
 ]
@@ -134,6 +134,18 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# ImageUploadHandler rejects oversized or non JPEG/PNG files of IMAGE_UPLOAD_FIELDS while
+# the body is streamed, before the default handlers buffer it
+FILE_UPLOAD_HANDLERS = [
+    "utils.upload_handlers.ImageUploadHandler",
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+
+# Multipart file field names checked by ImageUploadHandler with their max size in MB,
+# matching MAX_FILE_SIZE_ALLOWED of Attendance.image ("images" in batches) and Profile.photo
+IMAGE_UPLOAD_FIELDS = {"image": 5, "images": 5, "photo": 5}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -142,8 +154,115 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication"
+        "users.authentication.StatelessJWTAuthentication"
     ],
     "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"]
     + (["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
 }
+
+# Serialize the read heavy list APIs from `.values()` rows instead of DRF serializers
+COMPILED_SERIALIZERS = environ.get("COMPILED_SERIALIZERS", "True") == "True"
+
+# Serve the async variants of the read heavy list APIs and of the token refresh API. Only
+# worth it under an ASGI server, WSGI runs every async view in an event loop of its own.
+ASYNC_VIEWS = environ.get("ASYNC_VIEWS", "False") == "True"
+
+# What to do when an API exceeds its query budget: "raise", "log" or "off"
+QUERY_BUDGET_MODE = environ.get("QUERY_BUDGET_MODE") or "log"
+
+# What to do when a roster user schedule overlaps another schedule of the same user:
+# "reject", "warn" (log only) or "off"
+ROSTER_SCHEDULE_CONFLICT_MODE = environ.get("ROSTER_SCHEDULE_CONFLICT_MODE") or "reject"
+
+# Number of days ahead for which shift occurrences of the schedules are materialized
+SHIFT_OCCURRENCE_HORIZON_DAYS = int(environ.get("SHIFT_OCCURRENCE_HORIZON_DAYS") or 28)
+
+SIMPLE_JWT = {
+    "TOKEN_USER_CLASS": "users.authentication.StatelessUser",
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Use a shared backend (e.g. redis) in production so invalidations reach every worker,
+# the system checks fail with local memory caches and more than one worker process
+
+CACHES = {
+    "default": {
+        "BACKEND": environ.get("CACHE_BACKEND")
+        or "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": environ.get("CACHE_LOCATION", ""),
+    },
+    # Cached response payloads, kept apart so they can live on a bigger, evicting backend.
+    # Local memory caches sharing a location share their store, hence its own location
+    "responses": {
+        "BACKEND": environ.get("RESPONSE_CACHE_BACKEND")
+        or "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": environ.get("RESPONSE_CACHE_LOCATION") or "responses",
+    },
+}
+
+# Number of worker processes serving the APIs, read from WEB_CONCURRENCY like gunicorn and
+# uvicorn do
+WORKER_PROCESSES = int(environ.get("WEB_CONCURRENCY") or 1)
+
+# Seconds for which the active roles of a user are cached, which bounds how long a worker
+# missing an invalidation can keep granting a revoked role
+USER_ROLES_CACHE_TIMEOUT = int(environ.get("USER_ROLES_CACHE_TIMEOUT") or 60)
+
+# Seconds for which the version of the roles of a user is cached, which bounds how long an
+# access token carrying revoked roles is accepted by a worker missing an invalidation
+USER_ROLES_VERSION_CACHE_TIMEOUT = int(
+    environ.get("USER_ROLES_VERSION_CACHE_TIMEOUT") or 30
+)
+
+# Seconds for which the version of the rosters and schedules listed to a user is cached,
+# which bounds how long edits made outside of the roster services (e.g. a user renamed in
+# the admin) can be answered with 304 Not Modified, and how long a worker missing an
+# invalidation keeps answering it
+ROSTERS_VERSION_CACHE_TIMEOUT = int(environ.get("ROSTERS_VERSION_CACHE_TIMEOUT") or 300)
+
+# Seconds for which a response payload is cached, and for which the other workers wait for
+# the one building a missing payload before building it themselves
+RESPONSE_CACHE_TIMEOUT = int(environ.get("RESPONSE_CACHE_TIMEOUT") or 300)
+RESPONSE_CACHE_LOCK_TIMEOUT = int(environ.get("RESPONSE_CACHE_LOCK_TIMEOUT") or 5)
+
+# Seconds after which the in-process on shift index is rebuilt from the database, the index
+# of each process is also refreshed on schedule changes made by the same process
+ON_SHIFT_INDEX_TTL = int(environ.get("ON_SHIFT_INDEX_TTL") or 60)
+
+# "sync" stores attendance images inside the request, "async" stages the raw upload and
+# returns a receipt while a pool of ATTENDANCE_IMAGE_WORKERS threads processes the image
+ATTENDANCE_IMAGE_PROCESSING_MODE = (
+    environ.get("ATTENDANCE_IMAGE_PROCESSING_MODE") or "sync"
+)
+ATTENDANCE_IMAGE_WORKERS = int(environ.get("ATTENDANCE_IMAGE_WORKERS") or 4)
+
+# Attendance of a shift can be marked from ATTENDANCE_EARLY_MINUTES before its start until
+# ATTENDANCE_LATE_MINUTES after its end
+ATTENDANCE_EARLY_MINUTES = int(environ.get("ATTENDANCE_EARLY_MINUTES") or 30)
+ATTENDANCE_LATE_MINUTES = int(environ.get("ATTENDANCE_LATE_MINUTES") or 0)
+# Attendance marked more than ATTENDANCE_GRACE_MINUTES after the start of a shift is late
+ATTENDANCE_GRACE_MINUTES = int(environ.get("ATTENDANCE_GRACE_MINUTES") or 5)
+
+# On PostgreSQL the attendance table is partitioned by month, partitions are created
+# ATTENDANCE_PARTITION_MONTHS_AHEAD months ahead and the ones older than
+# ATTENDANCE_PARTITION_RETENTION_MONTHS (0 keeps all) are detached, and moved to
+# ATTENDANCE_PARTITION_ARCHIVE_SCHEMA when set
+ATTENDANCE_PARTITION_MONTHS_AHEAD = int(
+    environ.get("ATTENDANCE_PARTITION_MONTHS_AHEAD") or 3
+)
+ATTENDANCE_PARTITION_RETENTION_MONTHS = int(
+    environ.get("ATTENDANCE_PARTITION_RETENTION_MONTHS") or 0
+)
+ATTENDANCE_PARTITION_ARCHIVE_SCHEMA = (
+    environ.get("ATTENDANCE_PARTITION_ARCHIVE_SCHEMA") or ""
+)
+
+# Normalization of the stored images (attendance images, profile photos): downscaled to fit
+# in IMAGE_MAX_DIMENSION pixels and re-encoded as IMAGE_FORMAT ("JPEG" or "WEBP") without
+# EXIF metadata
+IMAGE_NORMALIZATION = environ.get("IMAGE_NORMALIZATION", "True") == "True"
+IMAGE_MAX_DIMENSION = int(environ.get("IMAGE_MAX_DIMENSION") or 1280)
+IMAGE_QUALITY = int(environ.get("IMAGE_QUALITY") or 80)
+IMAGE_FORMAT = environ.get("IMAGE_FORMAT") or "JPEG"
@@ -3,9 +3,57 @@ This file contains all the admins for rosters module
 """
 
 from django.contrib import admin
-from django.contrib.admin import ModelAdmin
+from django.contrib.admin import ModelAdmin, TabularInline
+from django.forms import BaseInlineFormSet
 
-from rosters.models import Roster, RosterManager, RosterUserSchedule
+from rosters.models import Roster, RosterManager, RosterUserSchedule, ShiftOccurrence
+from rosters.services.occurrence import (
+    delete_shift_occurrences,
+    materialize_shift_occurrences,
+)
+from rosters.signals import roster_user_schedules_changed
+from users.roles import deferred_role_validation
+
+
+class RoleValidationInlineFormSet(BaseInlineFormSet):
+    """
+    Inline formset resolving the role checks of all its rows with one query, the failed
+    ones are reported on their rows as a single save reports them
+    """
+
+    def full_clean(self):
+        with deferred_role_validation(raise_errors=False) as failed_role_checks:
+            super().full_clean()
+
+        for role_check in failed_role_checks:
+            for form in self.forms:
+                if form.instance is role_check.key:
+                    form.add_error(None, role_check.message)
+
+
+class RosterManagerInline(TabularInline):
+    model = RosterManager
+    formset = RoleValidationInlineFormSet
+    fields = ("manager",)
+    raw_id_fields = ("manager",)
+    extra = 0
+    # Rows are soft deleted through the APIs
+    can_delete = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).alive()
+
+
+class RosterUserScheduleInline(TabularInline):
+    model = RosterUserSchedule
+    formset = RoleValidationInlineFormSet
+    fields = ("user", "working_day", "shift", "start_time", "end_time")
+    raw_id_fields = ("user",)
+    extra = 0
+    can_delete = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).alive()
 
 
 @admin.register(Roster)
@@ -13,6 +61,31 @@ class RosterAdmin(ModelAdmin):
     list_display = ("id", "title", "is_active")
     search_fields = ("title",)
     list_filter = ("is_active",)
+    inlines = (RosterManagerInline, RosterUserScheduleInline)
+
+    def save_related(self, request, form, formsets, change):
+        # Rows were validated by their formsets, their saves check roles with one query
+        with deferred_role_validation():
+            super().save_related(request, form, formsets, change)
+
+    def save_formset(self, request, form, formset, change):
+        super().save_formset(request, form, formset, change)
+        if formset.model is not RosterUserSchedule:
+            return
+
+        # As the roster services do for the schedules they save
+        changed_ids = [obj.id for obj, _ in formset.changed_objects]
+        roster_user_schedules = [
+            *formset.new_objects,
+            *(obj for obj, _ in formset.changed_objects),
+        ]
+        if roster_user_schedules:
+            delete_shift_occurrences(roster_user_schedule_ids=changed_ids)
+            materialize_shift_occurrences(roster_user_schedules=roster_user_schedules)
+            roster_user_schedules_changed.send(
+                sender=RosterUserSchedule,
+                roster_user_schedule_ids=[obj.id for obj in roster_user_schedules],
+            )
 
 
 @admin.register(RosterUserSchedule)
@@ -34,3 +107,10 @@ class RosterUserScheduleAdmin(ModelAdmin):
 class RosterManagerAdmin(ModelAdmin):
     list_display = ("id", "roster", "manager")
     search_fields = ("roster__title", "manager__email")
+
+
+@admin.register(ShiftOccurrence)
+class ShiftOccurrenceAdmin(ModelAdmin):
+    list_display = ("id", "roster", "user", "date", "shift", "start_time", "end_time")
+    search_fields = ("roster__title", "user__email")
+    list_filter = ("shift", "date")
@@ -2,34 +2,65 @@
 This file contains all the APIs related to roster model
 """
 
+from collections import defaultdict
+from operator import itemgetter
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Prefetch
+from django.db.models import F, Prefetch, prefetch_related_objects
+from django.utils.cache import get_conditional_response
 from rest_framework import serializers
-from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+)
 from rest_framework.views import APIView
 
 from rosters.constants import START_TIME_MUST_BE_BEFORE_THAN_END_TIME
 from rosters.models import Roster, RosterManager, RosterUserSchedule
-from rosters.serializers import RosterSerializer, RosterUserScheduleSerializer
+from rosters.serializers import (
+    SHIFT_LABELS,
+    SHIFT_VALUES,
+    WORKING_DAY_LABELS,
+    WORKING_DAY_VALUES,
+    RosterSerializer,
+    RosterUserScheduleSerializer,
+)
 from rosters.services import (
     bulk_create_roster_user_schedules,
     create_roster,
     create_roster_manager,
+    delete_roster,
+    restore_roster,
 )
-from users.models import User
+from rosters.versions import aget_rosters_version, get_rosters_version
+from users.constants import OBJECT_NOT_FOUND
+from users.models import User, get_full_name
 from users.permissions import IsManager
 from users.serializers import UserSerializer
-from utils.response import CustomResponse
+from utils.pagination import (
+    KeysetPaginationSerializer,
+    apaginate_by_keyset,
+    paginate_by_keyset,
+)
+from utils.query_budget import QueryBudgetMixin
+from utils.response import CustomResponse, build_etag
+from utils.response_cache import ResponseCache
+from utils.serializers import CompiledSerializer, time_to_representation
+from utils.views import AsyncAPIView
 
 
-class CreateRosterAPI(APIView):
+class CreateRosterAPI(QueryBudgetMixin, APIView):
     """
     This API is used to create the roster
     Response codes: 201, 400
     """
 
     permission_classes = (IsManager,)
+    query_budget = 19
 
     class InputSerializer(serializers.Serializer):
         class RosterUserScheduleInputSerializer(serializers.Serializer):
@@ -42,14 +73,10 @@ class CreateRosterAPI(APIView):
             end_time = serializers.TimeField()
 
             def validate_working_day(self, value):
-                for choice, label in RosterUserSchedule.WorkingDay.choices:
-                    if label == value:
-                        return choice
+                return WORKING_DAY_VALUES[value]
 
             def validate_shift(self, value):
-                for choice, label in RosterUserSchedule.Shift.choices:
-                    if label == value:
-                        return choice
+                return SHIFT_VALUES[value]
 
             def validate(self, attrs):
                 if attrs["start_time"] >= attrs["end_time"]:
@@ -99,20 +126,21 @@ class CreateRosterAPI(APIView):
 
         validated_data = serializer.validated_data
 
+        roster_user_schedules = []
         try:
             with transaction.atomic():
                 success, roster = create_roster(
                     title=validated_data["title"],
                     is_active=True,
-                    created_by=request.user,
+                    created_by=request.user.instance,
                 )
                 if not success:
                     raise ValidationError(message=roster)
 
                 success, roster_manager = create_roster_manager(
                     roster=roster,
-                    manager=request.user,
-                    created_by=request.user,
+                    manager=request.user.id,
+                    created_by=request.user.instance,
                 )
                 if not success:
                     raise ValidationError(message=roster_manager)
@@ -121,13 +149,19 @@ class CreateRosterAPI(APIView):
                     success, roster_user_schedules = bulk_create_roster_user_schedules(
                         roster=roster,
                         data=validated_data["roster_user_schedules"],
-                        created_by=request.user,
+                        created_by=request.user.instance,
                     )
                     if not success:
-                        raise ValidationError(message=roster_user_schedules)
+                        transaction.set_rollback(True)
+                        return CustomResponse(
+                            errors={"roster_user_schedules": roster_user_schedules},
+                            status=HTTP_400_BAD_REQUEST,
+                        )
         except ValidationError as error:
             return CustomResponse(errors=str(error), status=HTTP_400_BAD_REQUEST)
 
+        # Loading users of all the schedules in one query for the output
+        prefetch_related_objects(roster_user_schedules, "user")
         roster.roster_user_schedules = roster_user_schedules
 
         return CustomResponse(
@@ -136,13 +170,33 @@ class CreateRosterAPI(APIView):
         )
 
 
-class ListRosterAPI(APIView):
+class ListRosterAPI(QueryBudgetMixin, APIView):
     """
-    This API is used to list all the rosters of a manager
-    Response codes: 200, 400
+    This API is used to list the rosters of a manager, newest first. Payloads are cached
+    under the ETag, which changes with the version of the rosters of the manager.
+    Query params: cursor, page_size, is_active, working_day, shift
+    Headers: If-None-Match
+    Response codes: 200, 304, 400
     """
 
     permission_classes = (IsManager,)
+    query_budget = 2
+    response_cache = ResponseCache(name="roster-list")
+
+    class FilterSerializer(KeysetPaginationSerializer):
+        is_active = serializers.BooleanField(required=False, allow_null=True)
+        working_day = serializers.ChoiceField(
+            choices=RosterUserSchedule.WorkingDay.labels, required=False
+        )
+        shift = serializers.ChoiceField(
+            choices=RosterUserSchedule.Shift.labels, required=False
+        )
+
+        def validate_working_day(self, value):
+            return WORKING_DAY_VALUES[value]
+
+        def validate_shift(self, value):
+            return SHIFT_VALUES[value]
 
     class OutputSerializer(RosterSerializer):
 
@@ -174,21 +228,297 @@ class ListRosterAPI(APIView):
             fields = ("id", "title", "is_active", "roster_user_schedules")
             model = Roster
 
+    compiled_roster_user_schedule_output_serializer = CompiledSerializer(
+        columns=(
+            "id",
+            "roster_id",
+            "user_id",
+            "user__first_name",
+            "user__last_name",
+            "shift",
+            "working_day",
+            "start_time",
+            "end_time",
+        ),
+        fields={
+            "id": itemgetter("id"),
+            "user": lambda row: {
+                "id": row["user_id"],
+                "full_name": get_full_name(
+                    first_name=row["user__first_name"],
+                    last_name=row["user__last_name"],
+                ),
+            },
+            "shift": lambda row: SHIFT_LABELS[row["shift"]],
+            "working_day": lambda row: WORKING_DAY_LABELS[row["working_day"]],
+            "start_time": lambda row: time_to_representation(row["start_time"]),
+            "end_time": lambda row: time_to_representation(row["end_time"]),
+        },
+    )
+    compiled_output_serializer = CompiledSerializer(
+        columns=("id", "title", "is_active", "date_created"),
+        fields={
+            "id": itemgetter("id"),
+            "title": itemgetter("title"),
+            "is_active": itemgetter("is_active"),
+            "roster_user_schedules": itemgetter("roster_user_schedules"),
+        },
+    )
+
     def get(self, request, *args, **kwargs):
-        rosters = Roster.objects.filter(
-            date_deleted__isnull=True,
-            id__in=RosterManager.objects.filter(manager=request.user).values_list(
+        serializer = self.FilterSerializer(data=request.query_params.dict())
+        if not serializer.is_valid():
+            return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
+        validated_data = serializer.validated_data
+
+        # The version is read before the data, a change committed meanwhile drops it
+        etag = build_etag(
+            request=request, version=get_rosters_version(user_id=request.user.id)
+        )
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            return not_modified
+
+        payload, is_hit = self.response_cache.get_or_build(
+            key=etag.strip('"'),
+            build=lambda: self.get_payload(
+                request=request, validated_data=validated_data
+            ),
+        )
+        response = CustomResponse(data=payload, status=HTTP_200_OK)
+        response["ETag"] = etag
+        response["X-Cache"] = "HIT" if is_hit else "MISS"
+        return response
+
+    def get_payload(self, request, validated_data):
+        """
+        Page of the rosters of the manager with their schedules, as cached
+        """
+        rosters, roster_user_schedules = self.get_querysets(
+            request=request, validated_data=validated_data
+        )
+
+        if settings.COMPILED_SERIALIZERS:
+            results, next_cursor = self.get_compiled_results(
+                rosters=rosters,
+                roster_user_schedules=roster_user_schedules,
+                validated_data=validated_data,
+            )
+        else:
+            rosters, next_cursor = paginate_by_keyset(
+                queryset=rosters.prefetch_related(
+                    Prefetch(
+                        "rosteruserschedule_set",
+                        queryset=roster_user_schedules.select_related("user"),
+                        to_attr="roster_user_schedules",
+                    )
+                ),
+                cursor=validated_data.get("cursor"),
+                page_size=validated_data["page_size"],
+            )
+            results = self.OutputSerializer(instance=rosters, many=True).data
+
+        return {"results": results, "next_cursor": next_cursor}
+
+    def get_querysets(self, request, validated_data):
+        """
+        Rosters of the manager and the schedules to list with them, filtered
+        """
+        rosters = Roster.alive.filter(
+            id__in=RosterManager.alive.filter(manager_id=request.user.id).values_list(
                 "roster_id", flat=True
             ),
-        ).prefetch_related(
-            Prefetch(
-                "rosteruserschedule_set",
-                queryset=RosterUserSchedule.objects.filter(date_deleted__isnull=True),
-                to_attr="roster_user_schedules",
+        )
+        if validated_data.get("is_active") is not None:
+            rosters = rosters.filter(is_active=validated_data["is_active"])
+
+        roster_user_schedules = RosterUserSchedule.alive.all()
+        for field in ("working_day", "shift"):
+            if validated_data.get(field):
+                roster_user_schedules = roster_user_schedules.filter(
+                    **{field: validated_data[field]}
+                )
+                rosters = rosters.filter(
+                    id__in=roster_user_schedules.values("roster_id")
+                )
+
+        return rosters, roster_user_schedules
+
+    def get_compiled_results(self, rosters, roster_user_schedules, validated_data):
+        """
+        Same output as OutputSerializer, built from `.values()` rows of one query for the
+        rosters and one query for their schedules
+        """
+        rosters, next_cursor = paginate_by_keyset(
+            queryset=rosters.values(*self.compiled_output_serializer.columns),
+            cursor=validated_data.get("cursor"),
+            page_size=validated_data["page_size"],
+        )
+        roster_user_schedule_rows = (
+            list(
+                roster_user_schedules.filter(
+                    roster_id__in=[roster["id"] for roster in rosters]
+                ).values(*self.compiled_roster_user_schedule_output_serializer.columns)
             )
+            if rosters
+            else []
+        )
+        return (
+            self.compile_results(
+                rosters=rosters, roster_user_schedule_rows=roster_user_schedule_rows
+            ),
+            next_cursor,
         )
 
-        return CustomResponse(
-            data=self.OutputSerializer(instance=rosters, many=True).data,
-            status=HTTP_200_OK,
+    def compile_results(self, rosters, roster_user_schedule_rows):
+        roster_user_schedules_by_roster = defaultdict(list)
+        serializer = self.compiled_roster_user_schedule_output_serializer
+        for row in roster_user_schedule_rows:
+            roster_user_schedules_by_roster[row["roster_id"]].append(
+                serializer.to_representation(row)
+            )
+
+        for roster in rosters:
+            roster["roster_user_schedules"] = roster_user_schedules_by_roster[
+                roster["id"]
+            ]
+
+        return self.compiled_output_serializer.many(rosters)
+
+
+class AsyncListRosterAPI(ListRosterAPI, AsyncAPIView):
+    """
+    Async variant of ListRosterAPI, served when ASYNC_VIEWS is set. Payloads are always built
+    with the compiled serializers, as the async ORM does not prefetch.
+    Query params: cursor, page_size, is_active, working_day, shift
+    Headers: If-None-Match
+    Response codes: 200, 304, 400
+    """
+
+    async def get(self, request, *args, **kwargs):
+        serializer = self.FilterSerializer(data=request.query_params.dict())
+        if not serializer.is_valid():
+            return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
+        validated_data = serializer.validated_data
+
+        # The version is read before the data, a change committed meanwhile drops it
+        etag = build_etag(
+            request=request,
+            version=await aget_rosters_version(user_id=request.user.id),
+        )
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            return not_modified
+
+        payload, is_hit = await self.response_cache.aget_or_build(
+            key=etag.strip('"'),
+            build=lambda: self.aget_payload(
+                request=request, validated_data=validated_data
+            ),
+        )
+        response = CustomResponse(data=payload, status=HTTP_200_OK)
+        response["ETag"] = etag
+        response["X-Cache"] = "HIT" if is_hit else "MISS"
+        return response
+
+    async def aget_payload(self, request, validated_data):
+        """
+        Async variant of get_payload
+        """
+        rosters, roster_user_schedules = self.get_querysets(
+            request=request, validated_data=validated_data
+        )
+        rosters, next_cursor = await apaginate_by_keyset(
+            queryset=rosters.values(*self.compiled_output_serializer.columns),
+            cursor=validated_data.get("cursor"),
+            page_size=validated_data["page_size"],
+        )
+        roster_user_schedule_rows = (
+            [
+                row
+                async for row in roster_user_schedules.filter(
+                    roster_id__in=[roster["id"] for roster in rosters]
+                ).values(*self.compiled_roster_user_schedule_output_serializer.columns)
+            ]
+            if rosters
+            else []
+        )
+        return {
+            "results": self.compile_results(
+                rosters=rosters, roster_user_schedule_rows=roster_user_schedule_rows
+            ),
+            "next_cursor": next_cursor,
+        }
+
+
+class DeleteRosterAPI(QueryBudgetMixin, APIView):
+    """
+    This API is used to soft delete a roster of a manager along with its managers and
+    schedules, with a fixed number of queries whatever the number of schedules
+    Response codes: 200, 404
+    """
+
+    permission_classes = (IsManager,)
+    query_budget = 8
+
+    def delete(self, request, *args, **kwargs):
+        try:
+            roster = Roster.alive.get(
+                id=kwargs["pk"],
+                id__in=RosterManager.alive.filter(manager_id=request.user.id).values(
+                    "roster_id"
+                ),
+            )
+        except Roster.DoesNotExist:
+            return CustomResponse(
+                errors=OBJECT_NOT_FOUND.format(object="Roster"),
+                status=HTTP_404_NOT_FOUND,
+            )
+
+        success, message = delete_roster(
+            roster=roster, updated_by=request.user.instance
         )
+        return CustomResponse(data=message, status=HTTP_200_OK)
+
+
+class RestoreRosterAPI(QueryBudgetMixin, APIView):
+    """
+    This API is used to restore a roster deleted by one of its managers along with the
+    managers and schedules deleted with it
+    Response codes: 200, 400, 404
+    """
+
+    permission_classes = (IsManager,)
+    query_budget = 15
+
+    def post(self, request, *args, **kwargs):
+        # The roster managers were deleted along with the roster, at the same time
+        try:
+            roster = Roster.all_objects.get(
+                id=kwargs["pk"],
+                date_deleted__isnull=False,
+                rostermanager__manager_id=request.user.id,
+                rostermanager__date_deleted=F("date_deleted"),
+            )
+        except Roster.DoesNotExist:
+            return CustomResponse(
+                errors=OBJECT_NOT_FOUND.format(object="Roster"),
+                status=HTTP_404_NOT_FOUND,
+            )
+
+        success, message = restore_roster(
+            roster=roster, updated_by=request.user.instance
+        )
+        if not success:
+            return CustomResponse(
+                errors=(
+                    {"roster_user_schedules": message}
+                    if isinstance(message, dict)
+                    else message
+                ),
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        return CustomResponse(data=message, status=HTTP_200_OK)
@@ -2,8 +2,14 @@
 This file contains all the APIs related to roster user schedule model
 """
 
+from operator import itemgetter
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Q
+from django.utils.cache import get_conditional_response
+from django.utils.timezone import localtime
 from rest_framework import serializers
 from rest_framework.status import (
     HTTP_200_OK,
@@ -13,27 +19,48 @@ from rest_framework.status import (
 )
 from rest_framework.views import APIView
 
+from rosters.conflicts import ScheduleIntervalIndex
 from rosters.models import Roster, RosterManager, RosterUserSchedule
-from rosters.serializers import RosterSerializer, RosterUserScheduleSerializer
+from rosters.on_shift import SCHEDULE_COLUMNS, on_shift_index
+from rosters.serializers import (
+    SHIFT_LABELS,
+    SHIFT_VALUES,
+    WORKING_DAY_LABELS,
+    WORKING_DAY_VALUES,
+    RosterSerializer,
+    RosterUserScheduleSerializer,
+)
 from rosters.services import (
     bulk_create_roster_user_schedules,
     delete_roster_user_schedule,
+    import_roster_user_schedules,
     update_roster_user_schedule,
 )
+from rosters.services.bulk_import import IMPORT_FILE_FORMATS
+from rosters.versions import aget_rosters_version, get_rosters_version
 from users.constants import OBJECT_NOT_FOUND
-from users.models import User
+from users.models import User, get_full_name
 from users.permissions import IsManager, IsStaffMember
 from users.serializers import UserSerializer
-from utils.response import CustomResponse
+from utils.pagination import (
+    KeysetPaginationSerializer,
+    apaginate_by_keyset,
+    paginate_by_keyset,
+)
+from utils.query_budget import QueryBudgetMixin
+from utils.response import CustomResponse, build_etag
+from utils.serializers import CompiledSerializer, time_to_representation
+from utils.views import AsyncAPIView
 
 
-class CreateRosterUserScheduleAPI(APIView):
+class CreateRosterUserScheduleAPI(QueryBudgetMixin, APIView):
     """
     This API is used to add a new roster schedule for a user
     Response codes: 201, 400, 404
     """
 
     permission_classes = (IsManager,)
+    query_budget = 11
 
     class InputSerializer(serializers.Serializer):
         roster = serializers.IntegerField()
@@ -46,14 +73,10 @@ class CreateRosterUserScheduleAPI(APIView):
         end_time = serializers.TimeField()
 
         def validate_working_day(self, value):
-            for choice, label in RosterUserSchedule.WorkingDay.choices:
-                if label == value:
-                    return choice
+            return WORKING_DAY_VALUES[value]
 
         def validate_shift(self, value):
-            for choice, label in RosterUserSchedule.Shift.choices:
-                if label == value:
-                    return choice
+            return SHIFT_VALUES[value]
 
     class OutputSerializer(RosterUserScheduleSerializer):
 
@@ -90,9 +113,7 @@ class CreateRosterUserScheduleAPI(APIView):
             return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
         validated_data = serializer.validated_data
 
-        if not RosterManager.objects.filter(
-            date_deleted__isnull=True, roster_id=validated_data["roster"]
-        ).exists():
+        if not RosterManager.alive.filter(roster_id=validated_data["roster"]).exists():
             return CustomResponse(
                 errors=OBJECT_NOT_FOUND.format(object="Roster manager"),
                 status=HTTP_404_NOT_FOUND,
@@ -102,7 +123,7 @@ class CreateRosterUserScheduleAPI(APIView):
         success, roster_user_schedules = bulk_create_roster_user_schedules(
             roster=validated_data.pop("roster"),
             data=[validated_data],
-            created_by=request.user,
+            created_by=request.user.instance,
         )
         if not success:
             return CustomResponse(
@@ -115,13 +136,63 @@ class CreateRosterUserScheduleAPI(APIView):
         )
 
 
-class UpdateRosterUserScheduleAPI(APIView):
+class ImportRosterUserScheduleAPI(QueryBudgetMixin, APIView):
+    """
+    This API is used to import roster user schedules of a roster from a CSV or JSONL file.
+    Invalid rows are reported back and do not stop the import.
+    It has no query_budget, its queries grow with the number of chunks of the file. Each
+    chunk is held to IMPORT_CHUNK_QUERY_BUDGET by the import service instead.
+    Response codes: 200, 400, 404
+    """
+
+    permission_classes = (IsManager,)
+
+    class InputSerializer(serializers.Serializer):
+        roster = serializers.IntegerField()
+        file = serializers.FileField()
+        file_format = serializers.ChoiceField(
+            choices=IMPORT_FILE_FORMATS, required=False
+        )
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.data)
+        if not serializer.is_valid():
+            return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
+        validated_data = serializer.validated_data
+
+        if not RosterManager.alive.filter(
+            roster_id=validated_data["roster"],
+            manager_id=request.user.id,
+            roster__date_deleted__isnull=True,
+        ).exists():
+            return CustomResponse(
+                errors=OBJECT_NOT_FOUND.format(object="Roster"),
+                status=HTTP_404_NOT_FOUND,
+            )
+
+        file = validated_data["file"]
+        success, report = import_roster_user_schedules(
+            roster=validated_data["roster"],
+            file=file,
+            file_format=validated_data.get(
+                "file_format", file.name.rsplit(".", 1)[-1].lower()
+            ),
+            created_by=request.user.instance,
+        )
+        if not success:
+            return CustomResponse(errors=report, status=HTTP_400_BAD_REQUEST)
+
+        return CustomResponse(data=report, status=HTTP_200_OK)
+
+
+class UpdateRosterUserScheduleAPI(QueryBudgetMixin, APIView):
     """
     This API is used to update the roster schedule for a user
     Response codes: 200, 400, 404
     """
 
     permission_classes = (IsManager,)
+    query_budget = 24
 
     class InputSerializer(serializers.Serializer):
         user = serializers.IntegerField()
@@ -133,14 +204,10 @@ class UpdateRosterUserScheduleAPI(APIView):
         end_time = serializers.TimeField()
 
         def validate_working_day(self, value):
-            for choice, label in RosterUserSchedule.WorkingDay.choices:
-                if label == value:
-                    return choice
+            return WORKING_DAY_VALUES[value]
 
         def validate_shift(self, value):
-            for choice, label in RosterUserSchedule.Shift.choices:
-                if label == value:
-                    return choice
+            return SHIFT_VALUES[value]
 
     class OutputSerializer(RosterUserScheduleSerializer):
         class RosterOutputSerializer(RosterSerializer):
@@ -177,11 +244,10 @@ class UpdateRosterUserScheduleAPI(APIView):
         validated_data = serializer.validated_data
 
         try:
-            roster_user_schedule = RosterUserSchedule.objects.get(
-                date_deleted__isnull=True,
+            roster_user_schedule = RosterUserSchedule.alive.get(
                 id=kwargs["pk"],
-                roster_id__in=RosterManager.objects.filter(
-                    date_deleted__isnull=True, manager=request.user
+                roster_id__in=RosterManager.alive.filter(
+                    manager_id=request.user.id
                 ).values_list("roster_id", flat=True),
             )
         except RosterUserSchedule.DoesNotExist:
@@ -200,7 +266,7 @@ class UpdateRosterUserScheduleAPI(APIView):
                     # Deleting old roster user schedule
                     success, message = delete_roster_user_schedule(
                         roster_user_schedule=roster_user_schedule,
-                        updated_by=request.user,
+                        updated_by=request.user.instance,
                     )
                     if not success:
                         raise ValidationError(message)
@@ -226,11 +292,15 @@ class UpdateRosterUserScheduleAPI(APIView):
                                     ),
                                 }
                             ],
-                            created_by=request.user,
+                            created_by=request.user.instance,
                         )
                     )
                     if not success:
-                        raise ValidationError(new_roster_user_schedules)
+                        transaction.set_rollback(True)
+                        return CustomResponse(
+                            errors=new_roster_user_schedules,
+                            status=HTTP_400_BAD_REQUEST,
+                        )
 
                     roster_user_schedule = new_roster_user_schedules[0]
 
@@ -242,7 +312,7 @@ class UpdateRosterUserScheduleAPI(APIView):
             success, roster_user_schedule = update_roster_user_schedule(
                 roster_user_schedule=roster_user_schedule,
                 **validated_data,
-                updated_by=request.user
+                updated_by=request.user.instance
             )
             if not success:
                 return CustomResponse(
@@ -255,13 +325,31 @@ class UpdateRosterUserScheduleAPI(APIView):
         )
 
 
-class ListRosterUserScheduleAPI(APIView):
+class ListRosterUserScheduleAPI(QueryBudgetMixin, APIView):
     """
     This API is used to list the roster user schedule for staff member to see their assigned shifts
-    Response codes: 200, 400, 404
+    Query params: cursor, page_size, is_active, working_day, shift
+    Headers: If-None-Match
+    Response codes: 200, 304, 400, 404
     """
 
     permission_classes = (IsStaffMember,)
+    query_budget = 1
+
+    class FilterSerializer(KeysetPaginationSerializer):
+        is_active = serializers.BooleanField(required=False, allow_null=True)
+        working_day = serializers.ChoiceField(
+            choices=RosterUserSchedule.WorkingDay.labels, required=False
+        )
+        shift = serializers.ChoiceField(
+            choices=RosterUserSchedule.Shift.labels, required=False
+        )
+
+        def validate_working_day(self, value):
+            return WORKING_DAY_VALUES[value]
+
+        def validate_shift(self, value):
+            return SHIFT_VALUES[value]
 
     class OutputSerializer(RosterUserScheduleSerializer):
         class RosterOutputSerializer(RosterSerializer):
@@ -275,12 +363,274 @@ class ListRosterUserScheduleAPI(APIView):
             fields = ("id", "roster", "shift", "working_day", "start_time", "end_time")
             model = RosterUserSchedule
 
+    compiled_output_serializer = CompiledSerializer(
+        columns=(
+            "id",
+            "date_created",
+            "roster_id",
+            "roster__title",
+            "shift",
+            "working_day",
+            "start_time",
+            "end_time",
+        ),
+        fields={
+            "id": itemgetter("id"),
+            "roster": lambda row: {
+                "id": row["roster_id"],
+                "title": row["roster__title"],
+            },
+            "shift": lambda row: SHIFT_LABELS[row["shift"]],
+            "working_day": lambda row: WORKING_DAY_LABELS[row["working_day"]],
+            "start_time": lambda row: time_to_representation(row["start_time"]),
+            "end_time": lambda row: time_to_representation(row["end_time"]),
+        },
+    )
+
     def get(self, request, *args, **kwargs):
-        roster_user_schedules = RosterUserSchedule.objects.filter(
-            date_deleted__isnull=True, user=request.user
+        serializer = self.FilterSerializer(data=request.query_params.dict())
+        if not serializer.is_valid():
+            return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
+        validated_data = serializer.validated_data
+
+        # The version is read before the data, a change committed meanwhile drops it
+        etag = build_etag(
+            request=request, version=get_rosters_version(user_id=request.user.id)
+        )
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            return not_modified
+
+        roster_user_schedules = self.get_queryset(
+            request=request, validated_data=validated_data
+        )
+        if settings.COMPILED_SERIALIZERS:
+            roster_user_schedules, next_cursor = paginate_by_keyset(
+                queryset=roster_user_schedules.values(
+                    *self.compiled_output_serializer.columns
+                ),
+                cursor=validated_data.get("cursor"),
+                page_size=validated_data["page_size"],
+            )
+            results = self.compiled_output_serializer.many(roster_user_schedules)
+        else:
+            roster_user_schedules, next_cursor = paginate_by_keyset(
+                queryset=roster_user_schedules,
+                cursor=validated_data.get("cursor"),
+                page_size=validated_data["page_size"],
+            )
+            results = self.OutputSerializer(
+                instance=roster_user_schedules, many=True
+            ).data
+
+        response = CustomResponse(
+            data={"results": results, "next_cursor": next_cursor},
+            status=HTTP_200_OK,
+        )
+        response["ETag"] = etag
+        return response
+
+    def get_queryset(self, request, validated_data):
+        """
+        Schedules of the staff member, filtered
+        """
+        roster_user_schedules = RosterUserSchedule.alive.filter(
+            user_id=request.user.id
         ).select_related("roster")
+        if validated_data.get("is_active") is not None:
+            roster_user_schedules = roster_user_schedules.filter(
+                roster__is_active=validated_data["is_active"]
+            )
+        for field in ("working_day", "shift"):
+            if validated_data.get(field):
+                roster_user_schedules = roster_user_schedules.filter(
+                    **{field: validated_data[field]}
+                )
+        return roster_user_schedules
 
-        return CustomResponse(
-            data=self.OutputSerializer(instance=roster_user_schedules, many=True).data,
+
+class AsyncListRosterUserScheduleAPI(ListRosterUserScheduleAPI, AsyncAPIView):
+    """
+    Async variant of ListRosterUserScheduleAPI, served when ASYNC_VIEWS is set. Results are
+    always built with the compiled serializer.
+    Query params: cursor, page_size, is_active, working_day, shift
+    Headers: If-None-Match
+    Response codes: 200, 304, 400
+    """
+
+    async def get(self, request, *args, **kwargs):
+        serializer = self.FilterSerializer(data=request.query_params.dict())
+        if not serializer.is_valid():
+            return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
+        validated_data = serializer.validated_data
+
+        # The version is read before the data, a change committed meanwhile drops it
+        etag = build_etag(
+            request=request,
+            version=await aget_rosters_version(user_id=request.user.id),
+        )
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            return not_modified
+
+        roster_user_schedules, next_cursor = await apaginate_by_keyset(
+            queryset=self.get_queryset(
+                request=request, validated_data=validated_data
+            ).values(*self.compiled_output_serializer.columns),
+            cursor=validated_data.get("cursor"),
+            page_size=validated_data["page_size"],
+        )
+
+        response = CustomResponse(
+            data={
+                "results": self.compiled_output_serializer.many(roster_user_schedules),
+                "next_cursor": next_cursor,
+            },
             status=HTTP_200_OK,
         )
+        response["ETag"] = etag
+        return response
+
+
+class ListRosterUserScheduleConflictAPI(QueryBudgetMixin, APIView):
+    """
+    This API is used to list the double booked schedules of the staff members in the rosters
+    of a manager, including the overlapping schedules from other rosters
+    Response codes: 200
+    """
+
+    permission_classes = (IsManager,)
+    query_budget = 1
+
+    schedule_output_serializer = CompiledSerializer(
+        columns=(
+            "id",
+            "roster_id",
+            "roster__title",
+            "user_id",
+            "user__first_name",
+            "user__last_name",
+            "working_day",
+            "start_time",
+            "end_time",
+            "is_managed",
+        ),
+        fields={
+            "id": itemgetter("id"),
+            "roster": lambda row: {
+                "id": row["roster_id"],
+                "title": row["roster__title"],
+            },
+            "start_time": lambda row: time_to_representation(row["start_time"]),
+            "end_time": lambda row: time_to_representation(row["end_time"]),
+        },
+    )
+
+    def get(self, request, *args, **kwargs):
+        managed_roster_ids = RosterManager.alive.filter(
+            manager_id=request.user.id
+        ).values("roster_id")
+        roster_user_schedules = (
+            RosterUserSchedule.alive.filter(
+                roster__date_deleted__isnull=True,
+                user_id__in=RosterUserSchedule.alive.filter(
+                    roster_id__in=managed_roster_ids
+                ).values("user_id"),
+            )
+            .annotate(is_managed=Q(roster_id__in=managed_roster_ids))
+            .values(*self.schedule_output_serializer.columns)
+        )
+
+        index = ScheduleIntervalIndex()
+        rows = {}
+        for row in roster_user_schedules:
+            rows[row["id"]] = row
+            index.add(
+                user_id=row["user_id"],
+                working_day=row["working_day"],
+                start_time=row["start_time"],
+                end_time=row["end_time"],
+                key=row["id"],
+            )
+
+        conflicts = []
+        for first_id, second_id in index.overlapping_pairs():
+            first, second = rows[first_id], rows[second_id]
+            if not (first["is_managed"] or second["is_managed"]):
+                continue
+
+            conflicts.append(
+                {
+                    "user": {
+                        "id": first["user_id"],
+                        "full_name": get_full_name(
+                            first_name=first["user__first_name"],
+                            last_name=first["user__last_name"],
+                        ),
+                    },
+                    "working_day": WORKING_DAY_LABELS[first["working_day"]],
+                    "roster_user_schedules": self.schedule_output_serializer.many(
+                        (first, second)
+                    ),
+                }
+            )
+
+        return CustomResponse(data=conflicts, status=HTTP_200_OK)
+
+
+class ListOnShiftRosterUserScheduleAPI(QueryBudgetMixin, APIView):
+    """
+    This API is used to list the staff members on shift in the rosters of a manager right now
+    or at the given time
+    Query params: at, roster
+    Response codes: 200, 400
+    """
+
+    permission_classes = (IsManager,)
+    # The second query only runs when the on shift index is stale and gets rebuilt
+    query_budget = 2
+
+    class FilterSerializer(serializers.Serializer):
+        at = serializers.DateTimeField(required=False)
+        roster = serializers.IntegerField(required=False)
+
+    output_serializer = CompiledSerializer(
+        columns=SCHEDULE_COLUMNS,
+        fields={
+            "id": itemgetter("id"),
+            "roster": lambda row: {
+                "id": row["roster_id"],
+                "title": row["roster__title"],
+            },
+            "user": lambda row: {
+                "id": row["user_id"],
+                "full_name": row["user_full_name"],
+            },
+            "shift": lambda row: SHIFT_LABELS[row["shift"]],
+            "start_time": lambda row: time_to_representation(row["start_time"]),
+            "end_time": lambda row: time_to_representation(row["end_time"]),
+        },
+    )
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.FilterSerializer(data=request.query_params.dict())
+        if not serializer.is_valid():
+            return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
+        validated_data = serializer.validated_data
+
+        roster_ids = set(
+            RosterManager.alive.filter(manager_id=request.user.id).values_list(
+                "roster_id", flat=True
+            )
+        )
+        if validated_data.get("roster"):
+            roster_ids &= {validated_data["roster"]}
+
+        roster_user_schedules = on_shift_index.at(
+            moment=localtime(validated_data.get("at")), roster_ids=roster_ids
+        )
+        return CustomResponse(
+            data=self.output_serializer.many(roster_user_schedules), status=HTTP_200_OK
+        )
@@ -0,0 +1,123 @@
+"""
+This file contains all the APIs related to shift occurrence model
+"""
+
+from datetime import timedelta
+from operator import itemgetter
+
+from rest_framework import serializers
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from rest_framework.views import APIView
+
+from rosters.constants import (
+    MAX_SHIFT_OCCURRENCE_RANGE_DAYS,
+    SHIFT_OCCURRENCE_RANGE_TOO_LONG,
+    START_DATE_MUST_NOT_BE_AFTER_END_DATE,
+)
+from rosters.models import RosterManager, ShiftOccurrence
+from rosters.serializers import SHIFT_LABELS
+from users.models import get_full_name
+from users.permissions import IsManager
+from utils.query_budget import QueryBudgetMixin
+from utils.response import (
+    STREAMING_RESPONSE_CHUNK_SIZE,
+    CustomResponse,
+    StreamingCustomResponse,
+)
+from utils.serializers import CompiledSerializer, time_to_representation
+
+
+class ListShiftOccurrenceAPI(QueryBudgetMixin, APIView):
+    """
+    This API is used to list the dated shifts in the rosters of a manager between two dates
+    Query params: start_date, end_date, roster, user
+    Response codes: 200, 400
+    """
+
+    permission_classes = (IsManager,)
+    query_budget = 1
+
+    class FilterSerializer(serializers.Serializer):
+        start_date = serializers.DateField()
+        end_date = serializers.DateField()
+        roster = serializers.IntegerField(required=False)
+        user = serializers.IntegerField(required=False)
+
+        def validate(self, attrs):
+            if attrs["start_date"] > attrs["end_date"]:
+                raise serializers.ValidationError(START_DATE_MUST_NOT_BE_AFTER_END_DATE)
+            if attrs["end_date"] - attrs["start_date"] >= timedelta(
+                days=MAX_SHIFT_OCCURRENCE_RANGE_DAYS
+            ):
+                raise serializers.ValidationError(
+                    SHIFT_OCCURRENCE_RANGE_TOO_LONG.format(
+                        days=MAX_SHIFT_OCCURRENCE_RANGE_DAYS
+                    )
+                )
+            return attrs
+
+    output_serializer = CompiledSerializer(
+        columns=(
+            "id",
+            "roster_user_schedule_id",
+            "date",
+            "roster_id",
+            "roster__title",
+            "user_id",
+            "user__first_name",
+            "user__last_name",
+            "shift",
+            "start_time",
+            "end_time",
+        ),
+        fields={
+            "id": itemgetter("id"),
+            "roster_user_schedule": itemgetter("roster_user_schedule_id"),
+            "date": lambda row: row["date"].isoformat(),
+            "roster": lambda row: {
+                "id": row["roster_id"],
+                "title": row["roster__title"],
+            },
+            "user": lambda row: {
+                "id": row["user_id"],
+                "full_name": get_full_name(
+                    first_name=row["user__first_name"],
+                    last_name=row["user__last_name"],
+                ),
+            },
+            "shift": lambda row: SHIFT_LABELS[row["shift"]],
+            "start_time": lambda row: time_to_representation(row["start_time"]),
+            "end_time": lambda row: time_to_representation(row["end_time"]),
+        },
+    )
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.FilterSerializer(data=request.query_params.dict())
+        if not serializer.is_valid():
+            return CustomResponse(errors=serializer.errors, status=HTTP_400_BAD_REQUEST)
+        validated_data = serializer.validated_data
+
+        shift_occurrences = ShiftOccurrence.objects.filter(
+            date__range=(validated_data["start_date"], validated_data["end_date"]),
+            roster__date_deleted__isnull=True,
+            roster_id__in=RosterManager.alive.filter(manager_id=request.user.id).values(
+                "roster_id"
+            ),
+        )
+        for field in ("roster", "user"):
+            if validated_data.get(field):
+                shift_occurrences = shift_occurrences.filter(
+                    **{f"{field}_id": validated_data[field]}
+                )
+
+        shift_occurrences = shift_occurrences.order_by(
+            "date", "start_time", "id"
+        ).values(*self.output_serializer.columns)
+        # A month of the rosters of a manager can run to tens of thousands of occurrences,
+        # they are streamed in chunks instead of being rendered at once
+        return StreamingCustomResponse(
+            data=self.output_serializer.iterate(
+                shift_occurrences.iterator(chunk_size=STREAMING_RESPONSE_CHUNK_SIZE)
+            ),
+            status=HTTP_200_OK,
+        )
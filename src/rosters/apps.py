@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RosterUserSchedulesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "rosters"
+
+    def ready(self):
+        from rosters import signals  # noqa: F401
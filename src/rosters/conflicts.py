@@ -0,0 +1,172 @@
+"""
+This file contains all the utils related to double booking conflicts of roster user schedules
+"""
+
+import heapq
+import logging
+from collections import defaultdict
+from datetime import time
+from typing import Dict, Hashable, Iterable, Iterator, List, NamedTuple, Tuple
+
+from django.conf import settings
+
+from rosters.constants import SCHEDULE_OVERLAPS_WITH
+from rosters.models import RosterUserSchedule
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleInterval(NamedTuple):
+    start_time: time
+    end_time: time
+    key: Hashable
+
+
+class ScheduleIntervalIndex:
+    """
+    Index of schedule intervals per (user, working day), sorted by start time. Finding all
+    the overlapping intervals of n schedules costs O(n log n + number of overlaps).
+    """
+
+    def __init__(self) -> None:
+        self._intervals: Dict[Tuple[int, int], List[ScheduleInterval]] = defaultdict(
+            list
+        )
+
+    def add(
+        self,
+        user_id: int,
+        working_day: int,
+        start_time: time,
+        end_time: time,
+        key: Hashable,
+    ) -> None:
+        self._intervals[(user_id, working_day)].append(
+            ScheduleInterval(start_time=start_time, end_time=end_time, key=key)
+        )
+
+    def overlapping_pairs(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        """
+        Yields the keys of every pair of overlapping intervals of the same user and day.
+        Intervals only touching each other (one ends when the other starts) do not overlap.
+        """
+        for intervals in self._intervals.values():
+            intervals.sort()
+            # Heap of (end time, position) of the intervals still open at the current start
+            open_intervals = []
+            for position, interval in enumerate(intervals):
+                while open_intervals and open_intervals[0][0] <= interval.start_time:
+                    heapq.heappop(open_intervals)
+                for _, open_position in open_intervals:
+                    yield intervals[open_position].key, interval.key
+                heapq.heappush(open_intervals, (interval.end_time, position))
+
+
+def find_roster_user_schedule_conflicts(
+    roster_user_schedules: Iterable[RosterUserSchedule],
+) -> Dict[int, List[dict]]:
+    """
+    This function is used to find the live schedules (in any roster) and the other schedules
+    of the batch overlapping the given schedules, with one query.
+    Returns the conflicts keyed by the index of the schedule in the batch, each conflict
+    being the id (None for schedules of the batch), roster id and times of the other schedule.
+    Two overlapping schedules of the batch are a conflict of the later one only.
+    """
+    roster_user_schedules = list(roster_user_schedules)
+    if not roster_user_schedules:
+        return {}
+
+    index = ScheduleIntervalIndex()
+    details = {}
+    for position, roster_user_schedule in enumerate(roster_user_schedules):
+        key = ("batch", position)
+        index.add(
+            user_id=roster_user_schedule.user_id,
+            working_day=roster_user_schedule.working_day,
+            start_time=roster_user_schedule.start_time,
+            end_time=roster_user_schedule.end_time,
+            key=key,
+        )
+        details[key] = {
+            "id": roster_user_schedule.id,
+            "roster": roster_user_schedule.roster_id,
+            "start_time": roster_user_schedule.start_time,
+            "end_time": roster_user_schedule.end_time,
+        }
+
+    existing_roster_user_schedules = (
+        RosterUserSchedule.alive.filter(
+            roster__date_deleted__isnull=True,
+            user_id__in={obj.user_id for obj in roster_user_schedules},
+            working_day__in={obj.working_day for obj in roster_user_schedules},
+        )
+        .exclude(id__in=[obj.id for obj in roster_user_schedules if obj.id])
+        .values("id", "roster_id", "user_id", "working_day", "start_time", "end_time")
+    )
+    for row in existing_roster_user_schedules:
+        key = ("existing", row["id"])
+        index.add(
+            user_id=row["user_id"],
+            working_day=row["working_day"],
+            start_time=row["start_time"],
+            end_time=row["end_time"],
+            key=key,
+        )
+        details[key] = {
+            "id": row["id"],
+            "roster": row["roster_id"],
+            "start_time": row["start_time"],
+            "end_time": row["end_time"],
+        }
+
+    conflicts = defaultdict(list)
+    for first, second in index.overlapping_pairs():
+        if first[0] == second[0] == "batch":
+            # Only the later row of the batch conflicts, the earlier one is kept valid
+            earlier, later = sorted((first, second))
+            conflicts[later[1]].append(details[earlier])
+            continue
+        for this, other in ((first, second), (second, first)):
+            if this[0] == "batch":
+                conflicts[this[1]].append(details[other])
+
+    return dict(conflicts)
+
+
+def check_roster_user_schedule_conflicts(
+    roster_user_schedules: List[RosterUserSchedule],
+) -> Dict[int, List[str]]:
+    """
+    This function is used to apply ROSTER_SCHEDULE_CONFLICT_MODE to the double booking
+    conflicts of a batch of schedules. Returns the error messages keyed by the index of the
+    schedule in the batch when the mode is "reject", logs them when it is "warn".
+    """
+    mode = settings.ROSTER_SCHEDULE_CONFLICT_MODE
+    if mode == "off":
+        return {}
+
+    errors = {}
+    conflicts = find_roster_user_schedule_conflicts(
+        roster_user_schedules=roster_user_schedules
+    )
+    for position, others in conflicts.items():
+        errors[position] = [
+            SCHEDULE_OVERLAPS_WITH.format(
+                roster=other["roster"],
+                start_time=other["start_time"],
+                end_time=other["end_time"],
+            )
+            for other in others
+        ]
+
+    if mode == "warn":
+        for position, messages in errors.items():
+            logger.warning(
+                "Roster user schedule %s of user %s: %s",
+                roster_user_schedules[position].id,
+                roster_user_schedules[position].user_id,
+                " ".join(messages),
+            )
+        return {}
+
+    return errors
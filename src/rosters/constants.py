@@ -9,3 +9,21 @@ USER_SHOULD_HAVE_MANAGER_ROLE_TO_CREATE_ROSTER_MANAGER = (
     "User should have manager role to create roster manager."
 )
 START_TIME_MUST_BE_BEFORE_THAN_END_TIME = "Start time must be before than end time."
+UNSUPPORTED_IMPORT_FILE_FORMAT = (
+    "Unsupported file format, allowed formats are {formats}."
+)
+INVALID_JSON_LINE = "Invalid JSON line."
+DUPLICATE_ROSTER_USER_SCHEDULE = (
+    "Roster user schedule already exists for this user, working day and shift."
+)
+SCHEDULE_OVERLAPS_WITH = (
+    "User is already scheduled in roster {roster} from {start_time} to {end_time}."
+)
+MAX_SHIFT_OCCURRENCE_RANGE_DAYS = 31
+START_DATE_MUST_NOT_BE_AFTER_END_DATE = "Start date must not be after end date."
+SHIFT_OCCURRENCE_RANGE_TOO_LONG = "Date range must not be longer than {days} days."
+NO_SHIFT_OPEN_FOR_ATTENDANCE = (
+    "No shift of yours is open for attendance on {moment}. Attendance can be marked from "
+    "{early} minutes before the start of a shift until {late} minutes after its end."
+)
+ROSTER_IS_NOT_DELETED = "Roster is not deleted."
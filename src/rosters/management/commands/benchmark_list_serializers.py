@@ -0,0 +1,140 @@
+"""
+This command is used to compare the compiled serializers of the roster and schedule list
+APIs with the DRF serializers they replace behind COMPILED_SERIALIZERS: the time per
+request of both APIs, whether both modes answer the same bytes, and the time to serialize
+a given number of schedule rows only
+"""
+
+import json
+import time
+from operator import attrgetter
+from typing import List
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from rosters.apis.roster_user_schedule import ListRosterUserScheduleAPI
+from rosters.models import RosterUserSchedule
+from users.models import User
+from users.tokens import get_token_for_user
+from utils.pagination import MAX_PAGE_SIZE
+from utils.response_cache import RESPONSE_CACHE_ALIAS
+
+
+def cycle_to(items: List, count: int) -> List:
+    """
+    This function is used to repeat items up to count items
+    """
+    return [items[index % len(items)] for index in range(count)]
+
+
+class Command(BaseCommand):
+    help = "Compare the compiled and DRF serializers of the roster and schedule lists"
+
+    def add_arguments(self, parser):
+        parser.add_argument("manager_email", help="Email of a manager with rosters")
+        parser.add_argument(
+            "staff_member_email", help="Email of a staff member with schedules"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=100, help="Number of requests per API"
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=10000,
+            help="Number of schedule rows to serialize only, e.g. 100000",
+        )
+
+    def handle(self, *args, **options):
+        users = {
+            user.email: user
+            for user in User.objects.filter(
+                email__in=(options["manager_email"], options["staff_member_email"])
+            )
+        }
+        for email in (options["manager_email"], options["staff_member_email"]):
+            if email not in users:
+                raise CommandError(f"User {email} does not exist")
+
+        # (name, user, path) of the requests to time, the largest pages
+        apis = [
+            (
+                "roster list",
+                users[options["manager_email"]],
+                f"/rosters/list/?page_size={MAX_PAGE_SIZE}",
+            ),
+            (
+                "schedule list",
+                users[options["staff_member_email"]],
+                f"/rosters/users/schedules/list/?page_size={MAX_PAGE_SIZE}",
+            ),
+        ]
+        self.stdout.write("API: ms per request DRF -> compiled (same bytes)")
+        for name, user, path in apis:
+            access_token = get_token_for_user(user=user).access_token
+            client = Client(headers={"Authorization": f"Bearer {access_token}"})
+            durations, contents = {}, {}
+            for compiled in (False, True):
+                with override_settings(COMPILED_SERIALIZERS=compiled):
+                    durations[compiled], contents[compiled] = self.time_requests(
+                        client=client, path=path, requests=options["requests"]
+                    )
+            self.stdout.write(
+                f"{name}: {durations[False]:.2f} -> {durations[True]:.2f} "
+                f"({'yes' if contents[False] == contents[True] else 'NO'})"
+            )
+
+        self.time_serialization(
+            staff_member=users[options["staff_member_email"]], rows=options["rows"]
+        )
+
+    @staticmethod
+    def time_requests(client, path, requests):
+        started_at = time.perf_counter()
+        for _ in range(requests):
+            # The roster list payload would be served from the cache
+            caches[RESPONSE_CACHE_ALIAS].clear()
+            response = client.get(path)
+            if response.status_code != 200:
+                raise CommandError(f"{path} answered {response.status_code}")
+        duration = (time.perf_counter() - started_at) / requests * 1000
+        return duration, response.content
+
+    def time_serialization(self, staff_member, rows):
+        """
+        Serializes the schedules of the staff member, repeated up to rows, in both modes
+        """
+        compiled_serializer = ListRosterUserScheduleAPI.compiled_output_serializer
+        queryset = RosterUserSchedule.alive.filter(user_id=staff_member.id).order_by(
+            "id"
+        )
+        instances = list(queryset.select_related("roster")[:rows])
+        if not instances:
+            raise CommandError(f"User {staff_member.email} has no schedules")
+        instances = cycle_to(items=instances, count=rows)
+        # The same rows as .values() would return them, without querying them again
+        getters = {
+            column: attrgetter(column.replace("__", "."))
+            for column in compiled_serializer.columns
+        }
+        values_rows = [
+            {column: getter(instance) for column, getter in getters.items()}
+            for instance in instances
+        ]
+
+        started_at = time.perf_counter()
+        drf_results = ListRosterUserScheduleAPI.OutputSerializer(
+            instance=instances, many=True
+        ).data
+        drf_duration = time.perf_counter() - started_at
+        started_at = time.perf_counter()
+        compiled_results = compiled_serializer.many(values_rows)
+        compiled_duration = time.perf_counter() - started_at
+
+        is_same = json.dumps(drf_results) == json.dumps(compiled_results)
+        self.stdout.write(
+            f"Serializing {rows} schedule rows: {drf_duration * 1000:.0f} ms DRF -> "
+            f"{compiled_duration * 1000:.0f} ms compiled ({'yes' if is_same else 'NO'})"
+        )
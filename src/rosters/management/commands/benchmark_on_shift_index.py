@@ -0,0 +1,138 @@
+"""
+This command is used to compare the lookups of the in-process on shift index with the
+equivalent query of the schedules on shift, and to time a full rebuild of the index. The
+schedules of the database are used, along with generated rosters of staff members when
+--rosters is given, which are rolled back once measured.
+"""
+
+import random
+import time
+from datetime import datetime
+from datetime import time as datetime_time
+from itertools import product
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import localtime
+
+from rosters.models import Roster, RosterUserSchedule
+from rosters.on_shift import SCHEDULE_COLUMNS, on_shift_index
+from users.models import UserRole
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare the on shift index lookups with the equivalent query"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--at",
+            type=datetime.fromisoformat,
+            default=None,
+            help="Local moment to look up, ISO 8601, defaults to now",
+        )
+        parser.add_argument(
+            "--rosters",
+            type=int,
+            default=0,
+            help="Number of rosters of up to 100 schedules to generate, e.g. 200",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=200, help="Number of lookups to time"
+        )
+
+    def handle(self, *args, **options):
+        moment = options["at"] or localtime()
+        try:
+            with transaction.atomic():
+                if options["rosters"]:
+                    self.generate_rosters(rosters=options["rosters"])
+                self.run(moment=moment, repeat=options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            # The index may hold the generated schedules
+            on_shift_index.invalidate()
+
+    @staticmethod
+    def generate_rosters(rosters: int) -> None:
+        staff_member_ids = list(
+            UserRole.alive.filter(role=UserRole.Role.STAFF_MEMBER).values_list(
+                "user_id", flat=True
+            )
+        )
+        if not staff_member_ids:
+            raise CommandError("At least one staff member is needed")
+
+        # Seeded, so that runs compare the same schedules
+        generator = random.Random(0)
+        generated_rosters = Roster.objects.bulk_create(
+            [
+                Roster(title=f"Roster {index}", is_active=True)
+                for index in range(rosters)
+            ]
+        )
+        # A staff member has one schedule per working day and shift of a roster
+        keys = list(
+            product(
+                staff_member_ids,
+                RosterUserSchedule.WorkingDay.values,
+                RosterUserSchedule.Shift.values,
+            )
+        )
+        roster_user_schedules = []
+        for roster in generated_rosters:
+            for user_id, working_day, shift in generator.sample(
+                keys, min(100, len(keys))
+            ):
+                start_hour = generator.randrange(0, 20)
+                roster_user_schedules.append(
+                    RosterUserSchedule(
+                        roster=roster,
+                        user_id=user_id,
+                        working_day=working_day,
+                        shift=shift,
+                        start_time=datetime_time(hour=start_hour),
+                        end_time=datetime_time(hour=start_hour + 4),
+                    )
+                )
+        RosterUserSchedule.objects.bulk_create(roster_user_schedules, batch_size=1000)
+
+    def run(self, moment: datetime, repeat: int) -> None:
+        minute = datetime_time(hour=moment.hour, minute=moment.minute)
+        queryset = RosterUserSchedule.alive.filter(
+            roster__date_deleted__isnull=True,
+            roster__is_active=True,
+            working_day=moment.isoweekday(),
+            start_time__lte=minute,
+            end_time__gt=minute,
+        ).values(*SCHEDULE_COLUMNS)
+
+        started_at = time.perf_counter()
+        on_shift_index.rebuild()
+        rebuild_duration = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        for _ in range(repeat):
+            index_rows = on_shift_index.at(moment=moment)
+        index_duration = (time.perf_counter() - started_at) / repeat
+
+        started_at = time.perf_counter()
+        for _ in range(repeat):
+            query_rows = list(queryset.all())
+        query_duration = (time.perf_counter() - started_at) / repeat
+
+        index_ids = sorted(row["id"] for row in index_rows)
+        query_ids = sorted(row["id"] for row in query_rows)
+        self.stdout.write(
+            f"Schedules: {RosterUserSchedule.alive.count()}, on shift at {moment}: "
+            f"{len(index_ids)} (same as the query: "
+            f"{'yes' if index_ids == query_ids else 'NO'})"
+        )
+        self.stdout.write(f"Index lookup: {index_duration * 1000:.3f} ms")
+        self.stdout.write(f"Equivalent query: {query_duration * 1000:.3f} ms")
+        self.stdout.write(f"Full rebuild: {rebuild_duration * 1000:.1f} ms")
@@ -0,0 +1,108 @@
+"""
+This command is used to compare the streamed shift occurrence list with the same list
+rendered at once, as it was before it was streamed: the peak memory allocated while the
+response is built and read, the time per request, and whether both bodies are the same.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import date, timedelta
+from hashlib import md5
+from typing import Iterator, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.utils.timezone import localdate
+
+from rosters.apis import shift_occurrence
+from rosters.constants import MAX_SHIFT_OCCURRENCE_RANGE_DAYS
+from users.models import User
+from users.tokens import get_token_for_user
+from utils.response import CustomResponse
+
+RESPONSE_MODES = ("buffered", "streamed")
+
+
+@contextmanager
+def buffered_responses() -> Iterator[None]:
+    """
+    This context manager is used to render the shift occurrence list at once
+    """
+    streaming_response = shift_occurrence.StreamingCustomResponse
+    shift_occurrence.StreamingCustomResponse = lambda data, **kwargs: CustomResponse(
+        data=list(data), **kwargs
+    )
+    try:
+        yield
+    finally:
+        shift_occurrence.StreamingCustomResponse = streaming_response
+
+
+class Command(BaseCommand):
+    help = "Compare the memory of the streamed and buffered shift occurrence list"
+
+    def add_arguments(self, parser):
+        parser.add_argument("manager_email", help="Email of a manager with rosters")
+        parser.add_argument(
+            "--start-date",
+            type=date.fromisoformat,
+            default=None,
+            help="First day of the list, ISO 8601, defaults to today",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=MAX_SHIFT_OCCURRENCE_RANGE_DAYS,
+            help="Number of days of the list",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=10, help="Number of requests to time"
+        )
+
+    def handle(self, *args, **options):
+        manager = User.objects.filter(email=options["manager_email"]).first()
+        if manager is None:
+            raise CommandError(f"User {options['manager_email']} does not exist")
+        start_date = options["start_date"] or localdate()
+        end_date = start_date + timedelta(days=options["days"] - 1)
+        path = (
+            f"/rosters/shifts/?start_date={start_date.isoformat()}"
+            f"&end_date={end_date.isoformat()}"
+        )
+        access_token = get_token_for_user(user=manager).access_token
+        client = Client(headers={"Authorization": f"Bearer {access_token}"})
+
+        self.stdout.write("Mode: peak memory, ms per request, body size and md5")
+        for mode in RESPONSE_MODES:
+            with buffered_responses() if mode == "buffered" else nullcontext():
+                tracemalloc.start()
+                self.read(client=client, path=path)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                started_at = time.perf_counter()
+                for _ in range(options["requests"]):
+                    size, digest = self.read(client=client, path=path)
+                duration = (time.perf_counter() - started_at) / options["requests"]
+            self.stdout.write(
+                f"{mode}: {peak / 1024 / 1024:.1f} MB, {duration * 1000:.0f} ms, "
+                f"{size / 1024:.0f} KB {digest}"
+            )
+
+    @staticmethod
+    def read(client: Client, path: str) -> Tuple[int, str]:
+        """
+        Requests the list and reads the body as a client would, chunk by chunk
+        """
+        response = client.get(path)
+        if response.status_code != 200:
+            raise CommandError(f"{path} answered {response.status_code}")
+        chunks = (
+            response.streaming_content if response.streaming else [response.content]
+        )
+        size, digest = 0, md5()
+        for chunk in chunks:
+            size += len(chunk)
+            digest.update(chunk)
+        return size, digest.hexdigest()
@@ -0,0 +1,58 @@
+"""
+This command is used to import roster user schedules of a roster from a CSV or JSONL file
+"""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rosters.models import Roster
+from rosters.services import import_roster_user_schedules
+from rosters.services.bulk_import import IMPORT_CHUNK_SIZE, IMPORT_FILE_FORMATS
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Import roster user schedules of a roster from a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("roster", type=int, help="Id of the roster")
+        parser.add_argument("path", type=Path, help="Path of the CSV or JSONL file")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FILE_FORMATS,
+            help="Format of the file, defaults to the file extension",
+        )
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument(
+            "--created-by", help="Email of the user the schedules are created by"
+        )
+
+    def handle(self, *args, **options):
+        if not Roster.alive.filter(id=options["roster"]).exists():
+            raise CommandError(f"Roster {options['roster']} not found")
+
+        created_by = None
+        if options["created_by"]:
+            created_by = User.objects.filter(email=options["created_by"]).first()
+            if not created_by:
+                raise CommandError(f"User {options['created_by']} not found")
+
+        path = options["path"]
+        with path.open("rb") as file:
+            success, report = import_roster_user_schedules(
+                roster=options["roster"],
+                file=file,
+                file_format=options["format"] or path.suffix.lstrip(".").lower(),
+                created_by=created_by,
+                chunk_size=options["chunk_size"],
+            )
+        if not success:
+            raise CommandError(report)
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            f"Rows: {report['total_rows']}, created: {report['created']}, "
+            f"failed: {report['failed']}"
+        )
@@ -0,0 +1,169 @@
+"""
+This command is used to load test the roster list, roster user schedule list and token
+refresh APIs in process, through the WSGI or the ASGI request handler, and to report the
+throughput and latency percentiles of each of them
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import AsyncClient, Client
+
+from users.models import User
+from users.tokens import get_token_for_user
+
+LOAD_TEST_HANDLERS = ("wsgi", "asgi")
+
+
+def get_percentile(latencies: List[float], percentile: float) -> float:
+    """
+    This function is used to get the nearest rank percentile of sorted latencies
+    """
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percentile))]
+
+
+class Command(BaseCommand):
+    help = "Load test the roster list, schedule list and token refresh APIs in process"
+
+    def add_arguments(self, parser):
+        parser.add_argument("manager_email", help="Email of a manager with rosters")
+        parser.add_argument(
+            "staff_member_email", help="Email of a staff member with schedules"
+        )
+        parser.add_argument(
+            "--handler",
+            choices=LOAD_TEST_HANDLERS,
+            default="asgi" if settings.ASYNC_VIEWS else "wsgi",
+            help="Request handler to go through, defaults to the one ASYNC_VIEWS is for",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=500, help="Number of requests per API"
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=20,
+            help="Number of requests in flight, threads under WSGI, tasks under ASGI",
+        )
+
+    def handle(self, *args, **options):
+        users = {
+            user.email: user
+            for user in User.objects.filter(
+                email__in=(options["manager_email"], options["staff_member_email"])
+            )
+        }
+        for email in (options["manager_email"], options["staff_member_email"]):
+            if email not in users:
+                raise CommandError(f"User {email} does not exist")
+
+        manager_token = get_token_for_user(user=users[options["manager_email"]])
+        staff_member_token = get_token_for_user(
+            user=users[options["staff_member_email"]]
+        )
+        # (path, headers, cookies) of the requests of each API
+        apis = {
+            "roster list": (
+                "/rosters/list/",
+                {"Authorization": f"Bearer {manager_token.access_token}"},
+                {},
+            ),
+            "schedule list": (
+                "/rosters/users/schedules/list/",
+                {"Authorization": f"Bearer {staff_member_token.access_token}"},
+                {},
+            ),
+            "token refresh": (
+                "/users/login/refresh/",
+                {},
+                {"refresh_token": str(staff_member_token)},
+            ),
+        }
+
+        self.stdout.write(
+            f"Handler: {options['handler']}, views: "
+            f"{'async' if settings.ASYNC_VIEWS else 'sync'}, requests: "
+            f"{options['requests']}, concurrency: {options['concurrency']}"
+        )
+        load_test = (
+            self.load_test_asgi if options["handler"] == "asgi" else self.load_test_wsgi
+        )
+        for name, (path, headers, cookies) in apis.items():
+            latencies, duration = load_test(
+                path=path,
+                headers=headers,
+                cookies=cookies,
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+            )
+            latencies.sort()
+            self.stdout.write(
+                f"{name}: {len(latencies) / duration:.1f} req/s, "
+                f"p50 {get_percentile(latencies, 0.5) * 1000:.2f} ms, "
+                f"p99 {get_percentile(latencies, 0.99) * 1000:.2f} ms"
+            )
+
+    @staticmethod
+    def check_response(response) -> None:
+        if response.status_code != 200:
+            raise CommandError(
+                f"{response.request['PATH_INFO']} answered {response.status_code}"
+            )
+
+    def load_test_wsgi(
+        self,
+        path: str,
+        headers: Dict[str, str],
+        cookies: Dict[str, str],
+        requests: int,
+        concurrency: int,
+    ):
+        def send(_) -> float:
+            client = Client()
+            client.cookies.load(cookies)
+            started_at = time.perf_counter()
+            response = client.get(path, headers=headers)
+            latency = time.perf_counter() - started_at
+            # As the request handlers do, the test clients leave it out
+            close_old_connections()
+            self.check_response(response)
+            return latency
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(send, range(requests)))
+        return latencies, time.perf_counter() - started_at
+
+    def load_test_asgi(
+        self,
+        path: str,
+        headers: Dict[str, str],
+        cookies: Dict[str, str],
+        requests: int,
+        concurrency: int,
+    ):
+        async def run():
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def send() -> float:
+                async with semaphore:
+                    client = AsyncClient()
+                    client.cookies.load(cookies)
+                    started_at = time.perf_counter()
+                    response = await client.get(path, headers=headers)
+                    latency = time.perf_counter() - started_at
+                    await sync_to_async(close_old_connections)()
+                    self.check_response(response)
+                    return latency
+
+            started_at = time.perf_counter()
+            latencies = await asyncio.gather(*(send() for _ in range(requests)))
+            return list(latencies), time.perf_counter() - started_at
+
+        return asyncio.run(run())
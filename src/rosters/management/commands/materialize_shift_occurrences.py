@@ -0,0 +1,57 @@
+"""
+This command is used to extend the materialized shift occurrences of the roster user
+schedules up to the rolling horizon, it is meant to be run daily
+"""
+
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.timezone import localdate
+
+from rosters.models import RosterUserSchedule
+from rosters.services.occurrence import (
+    MATERIALIZE_BATCH_SIZE,
+    materialize_shift_occurrences,
+)
+
+
+class Command(BaseCommand):
+    help = "Materialize shift occurrences of roster user schedules up to the horizon"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.SHIFT_OCCURRENCE_HORIZON_DAYS,
+            help="Number of days ahead to materialize, defaults to the horizon setting",
+        )
+
+    def handle(self, *args, **options):
+        start_date = localdate()
+        end_date = start_date + timedelta(days=options["days"])
+
+        roster_user_schedules = (
+            RosterUserSchedule.alive.filter(roster__date_deleted__isnull=True)
+            .only(
+                "id",
+                "roster_id",
+                "user_id",
+                "working_day",
+                "shift",
+                "start_time",
+                "end_time",
+            )
+            .iterator(chunk_size=MATERIALIZE_BATCH_SIZE)
+        )
+
+        total = 0
+        while chunk := list(islice(roster_user_schedules, MATERIALIZE_BATCH_SIZE)):
+            total += materialize_shift_occurrences(
+                roster_user_schedules=chunk, start_date=start_date, end_date=end_date
+            )
+
+        self.stdout.write(
+            f"Materialized {total} shift occurrences from {start_date} to {end_date}"
+        )
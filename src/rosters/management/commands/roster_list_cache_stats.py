@@ -0,0 +1,27 @@
+"""
+This command is used to show the hit and miss counts of the cache of the roster list API
+"""
+
+from django.core.management.base import BaseCommand
+
+from rosters.apis.roster import ListRosterAPI
+
+
+class Command(BaseCommand):
+    help = "Show the hit and miss counts of the cache of the roster list API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Reset the counts once shown"
+        )
+
+    def handle(self, *args, **options):
+        response_cache = ListRosterAPI.response_cache
+        stats = response_cache.get_stats()
+        total = stats["hits"] + stats["misses"]
+        self.stdout.write(
+            f"Hits: {stats['hits']}, misses: {stats['misses']}, hit ratio: "
+            f"{stats['hits'] / total if total else 0:.2%}"
+        )
+        if options["reset"]:
+            response_cache.reset_stats()
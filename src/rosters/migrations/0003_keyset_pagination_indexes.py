@@ -0,0 +1,26 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rosters", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="roster",
+            index=models.Index(
+                fields=["-date_created", "-id"], name="roster_date_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rosteruserschedule",
+            index=models.Index(
+                fields=["user", "-date_created", "-id"],
+                name="rus_user_date_created_id_idx",
+            ),
+        ),
+    ]
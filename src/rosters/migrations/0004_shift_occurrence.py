@@ -0,0 +1,105 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("rosters", "0003_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShiftOccurrence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "date_created",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("date_updated", models.DateTimeField(auto_now=True)),
+                ("date_deleted", models.DateTimeField(blank=True, null=True)),
+                ("date", models.DateField()),
+                (
+                    "shift",
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, "Morning Shift"), (2, "Evening Shift")]
+                    ),
+                ),
+                ("start_time", models.TimeField()),
+                ("end_time", models.TimeField()),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="%(class)s_created_by",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "roster",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="rosters.roster"
+                    ),
+                ),
+                (
+                    "roster_user_schedule",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="rosters.rosteruserschedule",
+                    ),
+                ),
+                (
+                    "updated_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="%(class)s_updated_by",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Shift Occurrence",
+                "verbose_name_plural": "Shift Occurrences",
+                "indexes": [
+                    models.Index(
+                        fields=["roster", "date"], name="occurrence_roster_date_idx"
+                    ),
+                    models.Index(
+                        fields=["user", "date"], name="occurrence_user_date_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="shiftoccurrence",
+            constraint=models.UniqueConstraint(
+                fields=("roster_user_schedule", "date"),
+                name="roster_user_schedule_date_unique_constraint",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.11 on 2026-10-17 12:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rosters", "0004_shift_occurrence"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="rosteruserschedule",
+            index=models.Index(
+                fields=["user", "working_day", "start_time"],
+                name="rus_user_day_start_time_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.11 on 2026-10-17 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rosters", "0005_shift_resolution_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="rosteruserschedule",
+            name="rus_user_day_start_time_idx",
+        ),
+        migrations.AddIndex(
+            model_name="rostermanager",
+            index=models.Index(
+                condition=models.Q(("date_deleted__isnull", True)),
+                fields=["manager", "roster"],
+                name="rm_alive_manager_roster_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rostermanager",
+            index=models.Index(
+                condition=models.Q(("date_deleted__isnull", True)),
+                fields=["roster"],
+                name="rm_alive_roster_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rosteruserschedule",
+            index=models.Index(
+                condition=models.Q(("date_deleted__isnull", True)),
+                fields=["user", "working_day", "start_time"],
+                name="rus_user_day_start_time_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rosteruserschedule",
+            index=models.Index(
+                condition=models.Q(("date_deleted__isnull", True)),
+                fields=["roster"],
+                name="rus_alive_roster_idx",
+            ),
+        ),
+    ]
@@ -12,6 +12,7 @@ from rosters.constants import (
     USER_SHOULD_HAVE_STAFF_MEMBER_ROLE_TO_CREATE_ROSTER_USER_SCHEDULE,
 )
 from users.models import User, UserRole
+from users.roles import validate_role
 from utils.constants import DATE_CANNOT_BE_IN_PAST
 from utils.models import BaseModel
 
@@ -30,6 +31,12 @@ class Roster(BaseModel):
     class Meta:
         verbose_name = "Roster"
         verbose_name_plural = "Rosters"
+        # Index for keyset pagination
+        indexes = [
+            models.Index(
+                fields=["-date_created", "-id"], name="roster_date_created_id_idx"
+            )
+        ]
 
 
 class RosterUserSchedule(BaseModel):
@@ -71,19 +78,35 @@ class RosterUserSchedule(BaseModel):
                 condition=models.Q(date_deleted__isnull=True),
             )
         ]
+        indexes = [
+            # Index for keyset pagination of a user's schedules
+            models.Index(
+                fields=["user", "-date_created", "-id"],
+                name="rus_user_date_created_id_idx",
+            ),
+            # Index for resolving the current shift of a user
+            models.Index(
+                fields=["user", "working_day", "start_time"],
+                name="rus_user_day_start_time_idx",
+                condition=models.Q(date_deleted__isnull=True),
+            ),
+            models.Index(
+                fields=["roster"],
+                name="rus_alive_roster_idx",
+                condition=models.Q(date_deleted__isnull=True),
+            ),
+        ]
 
     def validate_user(self):
         """
         This function is used to validate that user should be staff member.
         """
-        if not UserRole.objects.filter(
+        validate_role(
             user_id=self.user_id,
             role=UserRole.Role.STAFF_MEMBER,
-            date_deleted__isnull=True,
-        ).exists():
-            raise ValidationError(
-                USER_SHOULD_HAVE_STAFF_MEMBER_ROLE_TO_CREATE_ROSTER_USER_SCHEDULE
-            )
+            message=USER_SHOULD_HAVE_STAFF_MEMBER_ROLE_TO_CREATE_ROSTER_USER_SCHEDULE,
+            key=self,
+        )
 
     def validate_date_fields(self):
         if self.end_time <= self.start_time:
@@ -118,17 +141,61 @@ class RosterManager(BaseModel):
                 name="roster_manager_unique_constraint",
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["manager", "roster"],
+                name="rm_alive_manager_roster_idx",
+                condition=models.Q(date_deleted__isnull=True),
+            ),
+            models.Index(
+                fields=["roster"],
+                name="rm_alive_roster_idx",
+                condition=models.Q(date_deleted__isnull=True),
+            ),
+        ]
 
     def validate_manager(self):
-        if not UserRole.objects.filter(
+        validate_role(
             user_id=self.manager_id,
             role=UserRole.Role.MANAGER,
-            date_deleted__isnull=True,
-        ).exists():
-            raise ValidationError(
-                USER_SHOULD_HAVE_MANAGER_ROLE_TO_CREATE_ROSTER_MANAGER
-            )
+            message=USER_SHOULD_HAVE_MANAGER_ROLE_TO_CREATE_ROSTER_MANAGER,
+            key=self,
+        )
 
     def full_clean(self, *args, **kwargs) -> None:
         self.validate_manager()
         return super().full_clean(*args, **kwargs)
+
+
+class ShiftOccurrence(BaseModel):
+    """
+    This model is used to store the concrete dated occurrences of the weekly roster user
+    schedules over a rolling horizon, so that date range queries do not expand recurrences
+    """
+
+    roster_user_schedule = models.ForeignKey(
+        RosterUserSchedule, on_delete=models.CASCADE
+    )
+    roster = models.ForeignKey(Roster, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.PROTECT)
+    date = models.DateField()
+    shift = models.PositiveSmallIntegerField(choices=RosterUserSchedule.Shift.choices)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    def __str__(self):
+        return f"{self.roster_user_schedule_id}-{self.date}"
+
+    class Meta:
+        verbose_name = "Shift Occurrence"
+        verbose_name_plural = "Shift Occurrences"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["roster_user_schedule", "date"],
+                name="roster_user_schedule_date_unique_constraint",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["roster", "date"], name="occurrence_roster_date_idx"),
+            models.Index(fields=["user", "date"], name="occurrence_user_date_idx"),
+        ]
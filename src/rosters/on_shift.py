@@ -0,0 +1,150 @@
+"""
+This file contains the in-process index used to find the roster user schedules on shift
+at a given moment
+"""
+
+import threading
+import time as monotonic_time
+from collections import defaultdict
+from datetime import datetime, time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+from rosters.models import RosterUserSchedule
+from users.models import get_full_name
+
+BUCKET_MINUTES = 15
+SCHEDULE_COLUMNS = (
+    "id",
+    "roster_id",
+    "roster__title",
+    "user_id",
+    "user__first_name",
+    "user__last_name",
+    "working_day",
+    "shift",
+    "start_time",
+    "end_time",
+)
+
+
+def _to_minute(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+class OnShiftIndex:
+    """
+    Index of the schedules of active rosters keyed by (working day, bucket of BUCKET_MINUTES
+    minutes). A lookup only checks the few schedules of one bucket instead of querying
+    every schedule of the day. It is rebuilt from the database when older than
+    ON_SHIFT_INDEX_TTL seconds. Schedules reported changed by the change signal are
+    reloaded with a single query on the next lookup, so writes do not pay for the index.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self._schedules: Dict[int, dict] = {}
+        self._built_at: Optional[float] = None
+        self._changed_ids: Set[int] = set()
+
+    def _add(self, row: dict) -> None:
+        start, end = _to_minute(row["start_time"]), _to_minute(row["end_time"])
+        row["user_full_name"] = get_full_name(
+            first_name=row.pop("user__first_name"), last_name=row.pop("user__last_name")
+        )
+        row["start_minute"], row["end_minute"] = start, end
+        self._schedules[row["id"]] = row
+        for bucket in range(start // BUCKET_MINUTES, (end - 1) // BUCKET_MINUTES + 1):
+            self._buckets[(row["working_day"], bucket)].add(row["id"])
+
+    def _remove(self, roster_user_schedule_id: int) -> None:
+        row = self._schedules.pop(roster_user_schedule_id, None)
+        if row is None:
+            return
+        for bucket in range(
+            row["start_minute"] // BUCKET_MINUTES,
+            (row["end_minute"] - 1) // BUCKET_MINUTES + 1,
+        ):
+            self._buckets[(row["working_day"], bucket)].discard(row["id"])
+
+    @staticmethod
+    def _get_rows(roster_user_schedule_ids: Optional[Iterable[int]] = None):
+        roster_user_schedules = RosterUserSchedule.alive.filter(
+            roster__date_deleted__isnull=True,
+            roster__is_active=True,
+        )
+        if roster_user_schedule_ids is not None:
+            roster_user_schedules = roster_user_schedules.filter(
+                id__in=roster_user_schedule_ids
+            )
+        return roster_user_schedules.values(*SCHEDULE_COLUMNS)
+
+    def rebuild(self) -> None:
+        rows = list(self._get_rows())
+        with self._lock:
+            self._buckets = defaultdict(set)
+            self._schedules = {}
+            self._changed_ids = set()
+            for row in rows:
+                self._add(row)
+            self._built_at = monotonic_time.monotonic()
+
+    def mark_changed(self, roster_user_schedule_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._changed_ids.update(roster_user_schedule_ids)
+
+    def refresh(self) -> None:
+        """
+        Reloads the changed schedules, dropping the ones deleted or no longer in an active roster
+        """
+        with self._lock:
+            roster_user_schedule_ids, self._changed_ids = self._changed_ids, set()
+        if not roster_user_schedule_ids:
+            return
+        rows = list(self._get_rows(roster_user_schedule_ids=roster_user_schedule_ids))
+        with self._lock:
+            for roster_user_schedule_id in roster_user_schedule_ids:
+                self._remove(roster_user_schedule_id)
+            for row in rows:
+                self._add(row)
+
+    def invalidate(self) -> None:
+        self._built_at = None
+
+    def is_stale(self) -> bool:
+        return (
+            self._built_at is None
+            or monotonic_time.monotonic() - self._built_at > settings.ON_SHIFT_INDEX_TTL
+        )
+
+    def at(self, moment: datetime, roster_ids: Optional[Set[int]] = None) -> List[dict]:
+        """
+        Returns the schedules on shift at the given local moment, optionally only of some rosters
+        """
+        if self.is_stale():
+            self.rebuild()
+        elif self._changed_ids:
+            self.refresh()
+
+        minute = moment.hour * 60 + moment.minute
+        with self._lock:
+            rows = [
+                self._schedules[roster_user_schedule_id]
+                for roster_user_schedule_id in self._buckets.get(
+                    (moment.isoweekday(), minute // BUCKET_MINUTES), ()
+                )
+            ]
+        return sorted(
+            (
+                row
+                for row in rows
+                if row["start_minute"] <= minute < row["end_minute"]
+                and (roster_ids is None or row["roster_id"] in roster_ids)
+            ),
+            key=lambda row: (row["start_minute"], row["id"]),
+        )
+
+
+on_shift_index = OnShiftIndex()
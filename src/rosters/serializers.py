@@ -4,8 +4,15 @@ This file contains all the model serializers for rosters module.
 
 from rest_framework import serializers
 
+from rosters.constants import START_TIME_MUST_BE_BEFORE_THAN_END_TIME
 from rosters.models import Roster, RosterUserSchedule
 
+# Lookup tables between the stored values and the labels of the choices
+WORKING_DAY_LABELS = dict(RosterUserSchedule.WorkingDay.choices)
+WORKING_DAY_VALUES = {label: value for value, label in WORKING_DAY_LABELS.items()}
+SHIFT_LABELS = dict(RosterUserSchedule.Shift.choices)
+SHIFT_VALUES = {label: value for value, label in SHIFT_LABELS.items()}
+
 
 class RosterSerializer(serializers.ModelSerializer):
     class Meta:
@@ -18,11 +25,37 @@ class RosterUserScheduleSerializer(serializers.ModelSerializer):
     shift = serializers.SerializerMethodField()
 
     def get_working_day(self, instance):
-        return RosterUserSchedule.WorkingDay(instance.working_day).label
+        return WORKING_DAY_LABELS[instance.working_day]
 
     def get_shift(self, instance):
-        return RosterUserSchedule.Shift(instance.shift).label
+        return SHIFT_LABELS[instance.shift]
 
     class Meta:
         model = RosterUserSchedule
         exclude = RosterUserSchedule.LOG_FIELDS
+
+
+class RosterUserScheduleRowSerializer(serializers.Serializer):
+    """
+    Validates one roster user schedule row of an import file
+    """
+
+    user = serializers.IntegerField()
+    working_day = serializers.ChoiceField(choices=RosterUserSchedule.WorkingDay.labels)
+    shift = serializers.ChoiceField(choices=RosterUserSchedule.Shift.labels)
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+
+    def validate_working_day(self, value):
+        return WORKING_DAY_VALUES[value]
+
+    def validate_shift(self, value):
+        return SHIFT_VALUES[value]
+
+    def validate(self, attrs):
+        if attrs["start_time"] >= attrs["end_time"]:
+            raise serializers.ValidationError(
+                {"start_time": START_TIME_MUST_BE_BEFORE_THAN_END_TIME}
+            )
+
+        return super().validate(attrs)
@@ -1,7 +1,9 @@
+from .bulk_import import import_roster_user_schedules
 from .create import (
     bulk_create_roster_user_schedules,
     create_roster,
     create_roster_manager,
 )
-from .delete import delete_roster_user_schedule
+from .delete import delete_roster, delete_roster_user_schedule, restore_roster
+from .resolve import resolve_roster_user_schedule, resolve_roster_user_schedules
 from .update import update_roster_user_schedule
@@ -0,0 +1,221 @@
+"""
+This file contains all the bulk import services for rosters module.
+"""
+
+import csv
+import json
+from contextlib import nullcontext
+from io import TextIOWrapper
+from itertools import islice
+from typing import IO, Any, Iterator, List, Optional, Tuple, TypedDict, Union
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from rosters.constants import (
+    DUPLICATE_ROSTER_USER_SCHEDULE,
+    INVALID_JSON_LINE,
+    UNSUPPORTED_IMPORT_FILE_FORMAT,
+)
+from rosters.models import Roster, RosterUserSchedule
+from rosters.serializers import RosterUserScheduleRowSerializer
+from rosters.services.occurrence import materialize_shift_occurrences
+from rosters.signals import roster_user_schedules_changed
+from rosters.validators import validate_roster_user_schedules
+from users.models import User
+from utils.query_budget import QueryCounter, query_budget
+
+IMPORT_FILE_FORMATS = ("csv", "jsonl")
+IMPORT_CHUNK_SIZE = 1000
+# Queries validating and inserting a chunk, whatever its size, along with the on commit
+# receivers of the change signal. SQLite splits bulk inserts into batches of its parameter
+# limit, so big chunks exceed it there. The row by row fallback is left out of it.
+IMPORT_CHUNK_QUERY_BUDGET = 7
+# Only the first errors are reported so that the report stays small for broken files
+MAX_IMPORT_ERRORS_REPORTED = 1000
+
+
+class RowError(TypedDict):
+    row: int
+    errors: Union[str, dict]
+
+
+class ImportReport(TypedDict):
+    total_rows: int
+    created: int
+    failed: int
+    errors: List[RowError]
+
+
+def read_import_rows(file: IO[bytes], file_format: str) -> Iterator[Tuple[int, dict]]:
+    """
+    This function is used to lazily read (row number, row) pairs from a binary CSV or
+    JSONL file, so that only one row is held in memory at a time
+    """
+    text = TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        if file_format == "csv":
+            # Header is the first line, so data rows start from line 2
+            yield from enumerate(csv.DictReader(text), start=2)
+        else:
+            for row_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield row_number, row
+    finally:
+        # Closing the wrapper must not close the uploaded file
+        text.detach()
+
+
+def _add_row_error(report: ImportReport, row: int, errors: Union[str, dict]) -> None:
+    report["failed"] += 1
+    if len(report["errors"]) < MAX_IMPORT_ERRORS_REPORTED:
+        report["errors"].append({"row": row, "errors": errors})
+
+
+def _chunk_query_budget():
+    """
+    This function is used to check the queries of a chunk against IMPORT_CHUNK_QUERY_BUDGET,
+    as QUERY_BUDGET_MODE setting decides for the budgets of the APIs
+    """
+    mode = settings.QUERY_BUDGET_MODE
+    if mode == "off":
+        return nullcontext()
+
+    return query_budget(
+        budget=IMPORT_CHUNK_QUERY_BUDGET,
+        name="Roster user schedule import chunk",
+        raise_exception=mode == "raise",
+    )
+
+
+def _insert_chunk(
+    objs: List[Tuple[int, RosterUserSchedule]],
+    report: ImportReport,
+    query_counter: Optional[QueryCounter] = None,
+) -> None:
+    """
+    This function is used to insert a chunk with one query, falling back to row by row
+    inserts to find the offending rows when the chunk violates a constraint
+    """
+    try:
+        with transaction.atomic():
+            materialize_shift_occurrences(
+                roster_user_schedules=RosterUserSchedule.objects.bulk_create(
+                    objs=[obj for _, obj in objs]
+                )
+            )
+        created = [obj for _, obj in objs]
+    except IntegrityError:
+        created = []
+        with query_counter.uncounted() if query_counter else nullcontext():
+            for row_number, obj in objs:
+                try:
+                    with transaction.atomic():
+                        obj.save(skip_clean=True)
+                        materialize_shift_occurrences(roster_user_schedules=[obj])
+                    created.append(obj)
+                except IntegrityError:
+                    _add_row_error(
+                        report=report,
+                        row=row_number,
+                        errors=DUPLICATE_ROSTER_USER_SCHEDULE,
+                    )
+
+    report["created"] += len(created)
+    if created:
+        roster_user_schedules_changed.send(
+            sender=RosterUserSchedule,
+            roster_user_schedule_ids=[obj.id for obj in created],
+        )
+
+
+def _import_chunk(
+    roster: int,
+    chunk: List[Tuple[int, Any]],
+    report: ImportReport,
+    created_by: Optional[User],
+    query_counter: Optional[QueryCounter],
+) -> None:
+    """
+    This function is used to validate the rows of a chunk and insert the valid ones
+    """
+    report["total_rows"] += len(chunk)
+
+    valid_rows = []
+    for row_number, row in chunk:
+        if not isinstance(row, dict):
+            _add_row_error(report=report, row=row_number, errors=INVALID_JSON_LINE)
+            continue
+
+        serializer = RosterUserScheduleRowSerializer(data=row)
+        if not serializer.is_valid():
+            _add_row_error(report=report, row=row_number, errors=serializer.errors)
+            continue
+
+        valid_rows.append((row_number, serializer.validated_data))
+
+    objs = [
+        (
+            row_number,
+            RosterUserSchedule(
+                roster_id=roster,
+                user_id=datum["user"],
+                working_day=datum["working_day"],
+                shift=datum["shift"],
+                start_time=datum["start_time"],
+                end_time=datum["end_time"],
+                created_by=created_by,
+            ),
+        )
+        for row_number, datum in valid_rows
+    ]
+    errors = validate_roster_user_schedules(
+        roster_user_schedules=[obj for _, obj in objs]
+    )
+    for index, row_errors in errors.items():
+        _add_row_error(report=report, row=objs[index][0], errors=row_errors)
+    objs = [obj for index, obj in enumerate(objs) if index not in errors]
+
+    if objs:
+        _insert_chunk(objs=objs, report=report, query_counter=query_counter)
+
+
+def import_roster_user_schedules(
+    roster: Union[int, Roster],
+    file: IO[bytes],
+    file_format: str,
+    created_by: Optional[User] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> Tuple[bool, Union[str, ImportReport]]:
+    """
+    This service is used to import roster user schedules for a roster from a CSV or JSONL file.
+    Rows are streamed from the file and validated (with a fixed number of queries per chunk,
+    see IMPORT_CHUNK_QUERY_BUDGET) and inserted chunk by chunk, each chunk in its own
+    transaction. Invalid rows are reported with their row number and do not stop the import.
+    """
+    if file_format not in IMPORT_FILE_FORMATS:
+        return False, UNSUPPORTED_IMPORT_FILE_FORMAT.format(
+            formats=", ".join(IMPORT_FILE_FORMATS)
+        )
+
+    if isinstance(roster, Roster):
+        roster = roster.id
+
+    report: ImportReport = {"total_rows": 0, "created": 0, "failed": 0, "errors": []}
+    rows = read_import_rows(file=file, file_format=file_format)
+    while chunk := list(islice(rows, chunk_size)):
+        with _chunk_query_budget() as query_counter:
+            _import_chunk(
+                roster=roster,
+                chunk=chunk,
+                report=report,
+                created_by=created_by,
+                query_counter=query_counter,
+            )
+
+    return True, report
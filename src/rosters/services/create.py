@@ -6,11 +6,13 @@ from datetime import time
 from typing import List, Optional, Tuple, TypedDict, Union
 
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 from rosters.models import Roster, RosterManager, RosterUserSchedule
-from users.constants import ALL_USERS_MUST_BE_STAFF_MEMBERS
-from users.models import User, UserRole
+from rosters.services.occurrence import materialize_shift_occurrences
+from rosters.signals import roster_user_schedules_changed
+from rosters.validators import BatchErrors, validate_roster_user_schedules
+from users.models import User
 
 
 class RosterUserScheduleData(TypedDict):
@@ -64,52 +66,48 @@ def bulk_create_roster_user_schedules(
     roster: Union[int, Roster],
     data: List[RosterUserScheduleData],
     created_by: Optional[User] = None,
-) -> Tuple[bool, Union[str, List[RosterUserSchedule]]]:
+) -> Tuple[bool, Union[str, BatchErrors, List[RosterUserSchedule]]]:
     """
-    This service is used to create multiple roster user schedules for a roster
+    This service is used to create multiple roster user schedules for a roster.
+    The whole batch is validated with a fixed number of queries and nothing is created if
+    any row is invalid, in which case the errors are returned keyed by the index of the row.
+    Shift occurrences of the created schedules are materialized in the same transaction.
     """
     if isinstance(roster, Roster):
         roster = roster.id
 
-    all_user_ids = [
-        (datum["user"].id if isinstance(datum["user"], User) else datum["user"])
+    roster_user_schedules = [
+        RosterUserSchedule(
+            roster_id=roster,
+            user_id=(
+                datum["user"].id if isinstance(datum["user"], User) else datum["user"]
+            ),
+            shift=datum["shift"],
+            working_day=datum["working_day"],
+            start_time=datum["start_time"],
+            end_time=datum["end_time"],
+            created_by=created_by,
+        )
         for datum in data
     ]
-    if (
-        len(all_user_ids)
-        != UserRole.objects.filter(
-            user_id__in=all_user_ids,
-            role=UserRole.Role.STAFF_MEMBER,
-            date_deleted__isnull=True,
-        ).count()
-    ):
-        return False, ALL_USERS_MUST_BE_STAFF_MEMBERS
-
-    roster_user_schedules = []
-    try:
-        for datum in data:
-            if isinstance(datum["user"], User):
-                datum["user"] = datum["user"].id
-
-            roster_user_schedule = RosterUserSchedule(
-                roster_id=roster,
-                user_id=datum["user"],
-                shift=datum["shift"],
-                working_day=datum["working_day"],
-                start_time=datum["start_time"],
-                end_time=datum["end_time"],
-                created_by=created_by,
-            )
 
-            roster_user_schedule.clean_fields(exclude=["roster", "user", "created_by"])
-            roster_user_schedule.clean()
-            roster_user_schedules.append(roster_user_schedule)
+    errors = validate_roster_user_schedules(roster_user_schedules=roster_user_schedules)
+    if errors:
+        return False, errors
 
-        roster_user_schedules = RosterUserSchedule.objects.bulk_create(
-            objs=roster_user_schedules
-        )
-    except ValidationError as error:
-        return False, str(error)
+    try:
+        with transaction.atomic():
+            roster_user_schedules = RosterUserSchedule.objects.bulk_create(
+                objs=roster_user_schedules
+            )
+            materialize_shift_occurrences(roster_user_schedules=roster_user_schedules)
+            roster_user_schedules_changed.send(
+                sender=RosterUserSchedule,
+                roster_user_schedule_ids=[
+                    roster_user_schedule.id
+                    for roster_user_schedule in roster_user_schedules
+                ],
+            )
     except IntegrityError as error:
         return False, str(error)
 
@@ -2,13 +2,25 @@
 This file contains all the delete services for rosters module.
 """
 
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
-from django.utils.timezone import now
+from django.db import transaction
+from django.utils.timezone import localdate, now
 
-from rosters.models import RosterUserSchedule
+from rosters.constants import ROSTER_IS_NOT_DELETED
+from rosters.models import Roster, RosterManager, RosterUserSchedule, ShiftOccurrence
+from rosters.services.occurrence import (
+    delete_shift_occurrences,
+    materialize_shift_occurrences,
+)
+from rosters.signals import roster_user_schedules_changed, rosters_changed
+from rosters.validators import BatchErrors, validate_roster_user_schedules
 from users.models import User
-from utils.constants import OBJECT_DELETED_SUCCESSFULLY, VARIABLE_MUST_BE_INSTANCE
+from utils.constants import (
+    OBJECT_DELETED_SUCCESSFULLY,
+    OBJECT_RESTORED_SUCCESSFULLY,
+    VARIABLE_MUST_BE_INSTANCE,
+)
 
 
 def delete_roster_user_schedule(
@@ -16,6 +28,7 @@ def delete_roster_user_schedule(
 ) -> Tuple[bool, str]:
     """
     This service is used to soft delete roster user schedule by populating date deleted field value
+    and to delete its upcoming shift occurrences
     """
     assert isinstance(
         roster_user_schedule, RosterUserSchedule
@@ -26,5 +39,86 @@ def delete_roster_user_schedule(
     roster_user_schedule.date_deleted = now()
     roster_user_schedule.updated_by = updated_by
 
-    roster_user_schedule.save(update_fields=["date_deleted", "updated_by"])
+    with transaction.atomic():
+        roster_user_schedule.save(update_fields=["date_deleted", "updated_by"])
+        delete_shift_occurrences(roster_user_schedule_ids=[roster_user_schedule.id])
+        roster_user_schedules_changed.send(
+            sender=RosterUserSchedule,
+            roster_user_schedule_ids=[roster_user_schedule.id],
+        )
     return True, OBJECT_DELETED_SUCCESSFULLY
+
+
+def delete_roster(
+    roster: Roster, updated_by: Optional[User] = None
+) -> Tuple[bool, str]:
+    """
+    This service is used to soft delete a roster along with its roster managers and roster
+    user schedules, and to delete its upcoming shift occurrences. It runs a fixed number of
+    set based queries in one transaction, whatever the number of schedules. All the rows
+    share the date deleted of the roster, which is how restore_roster finds them.
+    """
+    assert isinstance(roster, Roster), VARIABLE_MUST_BE_INSTANCE.format(
+        variable="roster", model="Roster"
+    )
+
+    roster.date_deleted = now()
+    roster.updated_by = updated_by
+    with transaction.atomic():
+        for queryset in (
+            Roster.objects.filter(id=roster.id),
+            RosterManager.objects.filter(roster_id=roster.id),
+            RosterUserSchedule.objects.filter(roster_id=roster.id),
+        ):
+            queryset.soft_delete(
+                deleted_by=updated_by, date_deleted=roster.date_deleted
+            )
+        ShiftOccurrence.objects.filter(
+            roster_id=roster.id, date__gte=localdate()
+        ).delete()
+        rosters_changed.send(sender=Roster, roster_ids=[roster.id])
+    return True, OBJECT_DELETED_SUCCESSFULLY.format(object="Roster")
+
+
+def restore_roster(
+    roster: Roster, updated_by: Optional[User] = None
+) -> Tuple[bool, Union[str, BatchErrors]]:
+    """
+    This service is used to restore a roster soft deleted by delete_roster along with the
+    roster managers and roster user schedules deleted with it, and to materialize the
+    upcoming shift occurrences again. The schedules are validated in a batch first, as their
+    users may have lost the staff member role or been scheduled elsewhere meanwhile, the
+    errors are returned keyed by schedule id. Runs a fixed number of queries.
+    """
+    assert isinstance(roster, Roster), VARIABLE_MUST_BE_INSTANCE.format(
+        variable="roster", model="Roster"
+    )
+    if roster.date_deleted is None:
+        return False, ROSTER_IS_NOT_DELETED
+
+    roster_user_schedules = list(
+        RosterUserSchedule.objects.filter(
+            roster_id=roster.id, date_deleted=roster.date_deleted
+        )
+    )
+    errors = validate_roster_user_schedules(roster_user_schedules=roster_user_schedules)
+    if errors:
+        return False, {
+            roster_user_schedules[index].id: row_errors
+            for index, row_errors in errors.items()
+        }
+
+    with transaction.atomic():
+        RosterManager.objects.filter(
+            roster_id=roster.id, date_deleted=roster.date_deleted
+        ).restore(restored_by=updated_by)
+        RosterUserSchedule.objects.filter(
+            roster_id=roster.id, date_deleted=roster.date_deleted
+        ).restore(restored_by=updated_by)
+        Roster.objects.filter(id=roster.id).restore(restored_by=updated_by)
+        materialize_shift_occurrences(roster_user_schedules=roster_user_schedules)
+        rosters_changed.send(sender=Roster, roster_ids=[roster.id])
+
+    roster.date_deleted = None
+    roster.updated_by = updated_by
+    return True, OBJECT_RESTORED_SUCCESSFULLY.format(object="Roster")
@@ -0,0 +1,87 @@
+"""
+This file contains all the shift occurrence services for rosters module.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.utils.timezone import localdate
+
+from rosters.models import RosterUserSchedule, ShiftOccurrence
+
+MATERIALIZE_BATCH_SIZE = 1000
+
+
+def get_occurrence_horizon(start_date: Optional[date] = None) -> date:
+    """
+    This function is used to get the last date up to which shift occurrences are materialized
+    """
+    return (start_date or localdate()) + timedelta(
+        days=settings.SHIFT_OCCURRENCE_HORIZON_DAYS
+    )
+
+
+def materialize_shift_occurrences(
+    roster_user_schedules: Iterable[RosterUserSchedule],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> int:
+    """
+    This service is used to create the shift occurrences of saved roster user schedules
+    between start date (today by default) and end date (the horizon by default), both
+    inclusive. Already existing occurrences are left untouched, so it is safe to rerun.
+    """
+    start_date = start_date or localdate()
+    end_date = end_date or get_occurrence_horizon(start_date=start_date)
+
+    dates_by_working_day = defaultdict(list)
+    for offset in range((end_date - start_date).days + 1):
+        day = start_date + timedelta(days=offset)
+        dates_by_working_day[day.isoweekday()].append(day)
+
+    shift_occurrences = [
+        ShiftOccurrence(
+            roster_user_schedule_id=roster_user_schedule.id,
+            roster_id=roster_user_schedule.roster_id,
+            user_id=roster_user_schedule.user_id,
+            date=day,
+            shift=roster_user_schedule.shift,
+            start_time=roster_user_schedule.start_time,
+            end_time=roster_user_schedule.end_time,
+        )
+        for roster_user_schedule in roster_user_schedules
+        for day in dates_by_working_day[roster_user_schedule.working_day]
+    ]
+    ShiftOccurrence.objects.bulk_create(
+        objs=shift_occurrences,
+        batch_size=MATERIALIZE_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return len(shift_occurrences)
+
+
+def delete_shift_occurrences(
+    roster_user_schedule_ids: List[int], from_date: Optional[date] = None
+) -> int:
+    """
+    This service is used to delete the shift occurrences of roster user schedules from the
+    given date (today by default). Past occurrences are kept as history.
+    """
+    deleted, _ = ShiftOccurrence.objects.filter(
+        roster_user_schedule_id__in=roster_user_schedule_ids,
+        date__gte=from_date or localdate(),
+    ).delete()
+    return deleted
+
+
+def rematerialize_shift_occurrences(
+    roster_user_schedule: RosterUserSchedule,
+) -> None:
+    """
+    This service is used to replace the upcoming shift occurrences of an updated roster
+    user schedule
+    """
+    delete_shift_occurrences(roster_user_schedule_ids=[roster_user_schedule.id])
+    materialize_shift_occurrences(roster_user_schedules=[roster_user_schedule])
@@ -0,0 +1,111 @@
+"""
+This file contains all the resolve services for rosters module.
+"""
+
+from datetime import datetime, time, timedelta
+from typing import List, Optional, Tuple, Union
+
+from django.conf import settings
+from django.utils.timezone import localtime
+
+from rosters.constants import NO_SHIFT_OPEN_FOR_ATTENDANCE
+from rosters.models import RosterUserSchedule
+from users.models import User
+
+
+def get_attendance_window(moment: datetime) -> Tuple[time, time]:
+    """
+    Returns the bounds the start and the end time of a shift must be within for attendance
+    marked at the given local moment, clamped to the day of the moment
+    """
+    day_start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    latest_start = moment + timedelta(minutes=settings.ATTENDANCE_EARLY_MINUTES)
+    earliest_end = moment - timedelta(minutes=settings.ATTENDANCE_LATE_MINUTES)
+    return (
+        latest_start.time() if latest_start.date() == moment.date() else time.max,
+        earliest_end.time() if earliest_end >= day_start else time.min,
+    )
+
+
+def resolve_roster_user_schedule(
+    user: Union[int, User],
+    moment: Optional[datetime] = None,
+    roster_user_schedule_id: Optional[int] = None,
+) -> Tuple[bool, Union[str, RosterUserSchedule]]:
+    """
+    This service is used to find the schedule of a user that attendance can be marked for at
+    the given moment (now by default), with one query using the user and working day index.
+    A shift can be marked from ATTENDANCE_EARLY_MINUTES before its start until
+    ATTENDANCE_LATE_MINUTES after its end, only in an active roster. When a schedule id is
+    given, that schedule is validated instead.
+    """
+    moment = localtime(moment)
+    latest_start, earliest_end = get_attendance_window(moment=moment)
+
+    roster_user_schedules = RosterUserSchedule.alive.filter(
+        roster__date_deleted__isnull=True,
+        roster__is_active=True,
+        user_id=user.id if isinstance(user, User) else user,
+        working_day=moment.isoweekday(),
+        start_time__lte=latest_start,
+        end_time__gte=earliest_end,
+    )
+    if roster_user_schedule_id:
+        roster_user_schedules = roster_user_schedules.filter(id=roster_user_schedule_id)
+
+    # The shift starting last is the current one when the windows of two shifts overlap
+    roster_user_schedule = roster_user_schedules.order_by("-start_time").first()
+    if roster_user_schedule is None:
+        return False, NO_SHIFT_OPEN_FOR_ATTENDANCE.format(
+            moment=moment.strftime("%A %H:%M"),
+            early=settings.ATTENDANCE_EARLY_MINUTES,
+            late=settings.ATTENDANCE_LATE_MINUTES,
+        )
+
+    return True, roster_user_schedule
+
+
+def resolve_roster_user_schedules(
+    user: Union[int, User],
+    moments: List[datetime],
+    roster_user_schedule_ids: List[Optional[int]],
+) -> List[Union[str, RosterUserSchedule]]:
+    """
+    This service is used to resolve the schedules of many attendance records of a user at once,
+    with one query for all of them. For every moment (and optional schedule id) either the
+    schedule or the error message is returned, see `resolve_roster_user_schedule`.
+    """
+    moments = [localtime(moment) for moment in moments]
+    roster_user_schedules = list(
+        RosterUserSchedule.alive.filter(
+            roster__date_deleted__isnull=True,
+            roster__is_active=True,
+            user_id=user.id if isinstance(user, User) else user,
+            working_day__in={moment.isoweekday() for moment in moments},
+        ).order_by("-start_time")
+    )
+
+    results = []
+    for moment, roster_user_schedule_id in zip(moments, roster_user_schedule_ids):
+        latest_start, earliest_end = get_attendance_window(moment=moment)
+        results.append(
+            next(
+                (
+                    roster_user_schedule
+                    for roster_user_schedule in roster_user_schedules
+                    if roster_user_schedule.working_day == moment.isoweekday()
+                    and roster_user_schedule.start_time <= latest_start
+                    and roster_user_schedule.end_time >= earliest_end
+                    and (
+                        not roster_user_schedule_id
+                        or roster_user_schedule.id == roster_user_schedule_id
+                    )
+                ),
+                NO_SHIFT_OPEN_FOR_ATTENDANCE.format(
+                    moment=moment.strftime("%A %H:%M"),
+                    early=settings.ATTENDANCE_EARLY_MINUTES,
+                    late=settings.ATTENDANCE_LATE_MINUTES,
+                ),
+            )
+        )
+    return results
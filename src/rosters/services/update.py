@@ -6,9 +6,13 @@ from datetime import time
 from typing import Optional, Tuple, Union
 
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils.functional import empty
 
+from rosters.conflicts import check_roster_user_schedule_conflicts
 from rosters.models import Roster, RosterUserSchedule
+from rosters.services.occurrence import rematerialize_shift_occurrences
+from rosters.signals import roster_user_schedules_changed
 from users.models import User
 from utils.constants import (
     AT_LEAST_ONE_FIELD_MUST_BE_UPDATED,
@@ -43,6 +47,7 @@ def update_roster_user_schedule(
         "end_time": end_time,
     }
 
+    previous_roster_id = roster_user_schedule.roster_id
     update_fields = []
     for field, value in fields.items():
         if value != empty:
@@ -52,12 +57,26 @@ def update_roster_user_schedule(
     if not update_fields:
         return False, AT_LEAST_ONE_FIELD_MUST_BE_UPDATED
 
+    if {"working_day", "start_time", "end_time"} & set(update_fields):
+        errors = check_roster_user_schedule_conflicts(
+            roster_user_schedules=[roster_user_schedule]
+        )
+        if errors:
+            return False, " ".join(errors[0])
+
     roster_user_schedule.updated_by = updated_by
     update_fields.extend(["date_updated", "updated_by"])
 
     try:
-        roster_user_schedule.save(update_fields=update_fields)
+        with transaction.atomic():
+            roster_user_schedule.save(update_fields=update_fields)
+            rematerialize_shift_occurrences(roster_user_schedule=roster_user_schedule)
+            roster_user_schedules_changed.send(
+                sender=RosterUserSchedule,
+                roster_user_schedule_ids=[roster_user_schedule.id],
+                roster_ids=[previous_roster_id],
+            )
     except ValidationError as error:
-        return False, str(error=error)
+        return False, str(error)
 
     return True, roster_user_schedule
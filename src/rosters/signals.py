@@ -0,0 +1,114 @@
+"""
+This file contains all the signals and signal receivers for rosters module
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from rosters.models import Roster, RosterManager
+from rosters.on_shift import on_shift_index
+from rosters.versions import (
+    invalidate_roster_user_schedule_versions,
+    invalidate_roster_versions,
+    invalidate_rosters_versions,
+    invalidate_staff_member_versions,
+)
+from users.models import UserRole
+
+# Sent by the roster services with the ids of the created, updated or deleted schedules, and
+# optionally the ids of other rosters affected, e.g. the one a schedule was moved out of
+roster_user_schedules_changed = Signal()
+# Sent by the roster services with the ids of the rosters deleted or restored with set based
+# updates, which do not send post_save
+rosters_changed = Signal()
+
+
+@receiver(roster_user_schedules_changed)
+def refresh_on_shift_index(sender, roster_user_schedule_ids, **kwargs):
+    """
+    The changed schedules are reloaded by the on shift index once the transaction commits
+    """
+    transaction.on_commit(
+        lambda: on_shift_index.mark_changed(
+            roster_user_schedule_ids=roster_user_schedule_ids
+        )
+    )
+
+
+@receiver(post_save, sender=Roster)
+@receiver(post_delete, sender=Roster)
+def invalidate_on_shift_index(sender, instance, created=False, **kwargs):
+    """
+    The on shift index is rebuilt when a roster is activated, deactivated or deleted.
+    New rosters have no schedules yet, their schedules are added on the change signal.
+    """
+    if not created:
+        transaction.on_commit(on_shift_index.invalidate)
+
+
+@receiver(rosters_changed)
+def rebuild_on_shift_index(sender, roster_ids, **kwargs):
+    """
+    The on shift index is rebuilt once the transaction deleting or restoring rosters commits
+    """
+    transaction.on_commit(on_shift_index.invalidate)
+
+
+@receiver(roster_user_schedules_changed)
+def invalidate_schedule_versions(
+    sender, roster_user_schedule_ids, roster_ids=(), **kwargs
+):
+    """
+    The versions of the staff members and managers seeing the changed schedules are dropped
+    once the transaction commits, after the new rows are visible to the next request
+    """
+    transaction.on_commit(
+        lambda: invalidate_roster_user_schedule_versions(
+            roster_user_schedule_ids=roster_user_schedule_ids, roster_ids=roster_ids
+        )
+    )
+
+
+@receiver(rosters_changed)
+def invalidate_versions_on_rosters_changed(sender, roster_ids, **kwargs):
+    """
+    The versions of the managers and staff members of deleted or restored rosters are dropped
+    once the transaction commits
+    """
+    transaction.on_commit(lambda: invalidate_roster_versions(roster_ids=roster_ids))
+
+
+@receiver(post_save, sender=Roster)
+def invalidate_versions_on_roster_save(sender, instance, created=False, **kwargs):
+    """
+    The title and activity of a roster are listed with its schedules, new rosters have no
+    managers nor schedules yet
+    """
+    if not created:
+        transaction.on_commit(
+            lambda: invalidate_roster_versions(roster_ids=[instance.id])
+        )
+
+
+@receiver(post_save, sender=RosterManager)
+@receiver(post_delete, sender=RosterManager)
+def invalidate_manager_versions(sender, instance, **kwargs):
+    """
+    The rosters listed to a manager change when the manager is added to or removed from one
+    """
+    transaction.on_commit(
+        lambda: invalidate_rosters_versions(user_ids=[instance.manager_id])
+    )
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def invalidate_versions_on_user_role_change(sender, instance, **kwargs):
+    """
+    A user gaining or losing a role changes what the user and the managers of the rosters
+    the user is scheduled in are listed
+    """
+    transaction.on_commit(
+        lambda: invalidate_staff_member_versions(user_ids=[instance.user_id])
+    )
@@ -0,0 +1,213 @@
+"""
+This file contains all the tests of the async variants of the rosters list APIs
+"""
+
+import asyncio
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, TestCase
+
+from rosters.apis.roster import AsyncListRosterAPI, ListRosterAPI
+from rosters.apis.roster_user_schedule import (
+    AsyncListRosterUserScheduleAPI,
+    ListRosterUserScheduleAPI,
+)
+from rosters.models import RosterUserSchedule
+from users.models import UserRole
+from users.tokens import get_token_for_user
+from utils.testing import (
+    AsyncViewsTestMixin,
+    QueryBudgetTestCase,
+    create_roster_with_schedules,
+    create_user,
+    get_json,
+)
+
+ROSTER_LIST_PATH = "/rosters/list/"
+ROSTER_USER_SCHEDULE_LIST_PATH = "/rosters/users/schedules/list/"
+
+
+def get_authorization(user) -> dict:
+    return {"Authorization": f"Bearer {get_token_for_user(user=user).access_token}"}
+
+
+class AsyncListViewsTestMixin(AsyncViewsTestMixin):
+    def setUp(self):
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_members = [
+            create_user(email=f"staff{index}@test.com", role=UserRole.Role.STAFF_MEMBER)
+            for index in range(2)
+        ]
+        for shift in RosterUserSchedule.Shift.values:
+            create_roster_with_schedules(
+                manager=self.manager, staff_members=self.staff_members, shift=shift
+            )
+
+
+class AsyncListViewsTest(AsyncListViewsTestMixin, TestCase):
+    def assertSameResponse(self, sync_view_class, path, headers=None, status_code=200):
+        """
+        Asserts that the async view served at path answers as its sync variant does
+        """
+        sync_response = self.send_sync_request(
+            view_class=sync_view_class, path=path, headers=headers
+        )
+        async_response = self.send_async_request(path=path, headers=headers)
+
+        self.assertEqual(sync_response.status_code, status_code)
+        self.assertEqual(async_response.status_code, status_code)
+        self.assertEqual(async_response.get("ETag"), sync_response.get("ETag"))
+        if status_code != 304:
+            self.assertEqual(get_json(async_response), get_json(sync_response))
+        return async_response
+
+    def test_urls_serve_the_async_views(self):
+        for path, view_class in (
+            (ROSTER_LIST_PATH, AsyncListRosterAPI),
+            (ROSTER_USER_SCHEDULE_LIST_PATH, AsyncListRosterUserScheduleAPI),
+        ):
+            response = self.send_async_request(path=path)
+
+            self.assertIs(response.resolver_match.func.view_class, view_class)
+
+    def test_roster_list_authentication_and_permission(self):
+        self.assertSameResponse(
+            sync_view_class=ListRosterAPI, path=ROSTER_LIST_PATH, status_code=401
+        )
+        self.assertSameResponse(
+            sync_view_class=ListRosterAPI,
+            path=ROSTER_LIST_PATH,
+            headers={"Authorization": "Bearer invalid"},
+            status_code=401,
+        )
+        self.assertSameResponse(
+            sync_view_class=ListRosterAPI,
+            path=ROSTER_LIST_PATH,
+            headers=get_authorization(user=self.staff_members[0]),
+            status_code=403,
+        )
+
+    def test_roster_user_schedule_list_authentication_and_permission(self):
+        self.assertSameResponse(
+            sync_view_class=ListRosterUserScheduleAPI,
+            path=ROSTER_USER_SCHEDULE_LIST_PATH,
+            status_code=401,
+        )
+        self.assertSameResponse(
+            sync_view_class=ListRosterUserScheduleAPI,
+            path=ROSTER_USER_SCHEDULE_LIST_PATH,
+            headers=get_authorization(user=self.manager),
+            status_code=403,
+        )
+
+    def test_roster_list_matches_the_sync_view(self):
+        headers = get_authorization(user=self.manager)
+        for query in (
+            "",
+            "?working_day=Monday&shift=Evening%20Shift",
+            "?is_active=false",
+            "?page_size=0",
+        ):
+            self.assertSameResponse(
+                sync_view_class=ListRosterAPI,
+                path=f"{ROSTER_LIST_PATH}{query}",
+                headers=headers,
+                status_code=400 if "page_size" in query else 200,
+            )
+
+        first_page = self.assertSameResponse(
+            sync_view_class=ListRosterAPI,
+            path=f"{ROSTER_LIST_PATH}?page_size=1",
+            headers=headers,
+        )
+        next_cursor = get_json(first_page)["data"]["next_cursor"]
+        self.assertIsNotNone(next_cursor)
+        self.assertSameResponse(
+            sync_view_class=ListRosterAPI,
+            path=f"{ROSTER_LIST_PATH}?page_size=1&cursor={next_cursor}",
+            headers=headers,
+        )
+        self.assertSameResponse(
+            sync_view_class=ListRosterAPI,
+            path=ROSTER_LIST_PATH,
+            headers={**headers, "If-None-Match": first_page["ETag"]},
+        )
+        self.assertSameResponse(
+            sync_view_class=ListRosterAPI,
+            path=f"{ROSTER_LIST_PATH}?page_size=1",
+            headers={**headers, "If-None-Match": first_page["ETag"]},
+            status_code=304,
+        )
+
+    def test_roster_user_schedule_list_matches_the_sync_view(self):
+        headers = get_authorization(user=self.staff_members[0])
+        for query in (
+            "",
+            "?working_day=Sunday",
+            "?shift=Morning%20Shift&is_active=true",
+        ):
+            self.assertSameResponse(
+                sync_view_class=ListRosterUserScheduleAPI,
+                path=f"{ROSTER_USER_SCHEDULE_LIST_PATH}{query}",
+                headers=headers,
+            )
+
+        first_page = self.assertSameResponse(
+            sync_view_class=ListRosterUserScheduleAPI,
+            path=f"{ROSTER_USER_SCHEDULE_LIST_PATH}?page_size=5",
+            headers=headers,
+        )
+        self.assertEqual(len(get_json(first_page)["data"]["results"]), 5)
+        self.assertSameResponse(
+            sync_view_class=ListRosterUserScheduleAPI,
+            path=(
+                f"{ROSTER_USER_SCHEDULE_LIST_PATH}?page_size=5"
+                f"&cursor={get_json(first_page)['data']['next_cursor']}"
+            ),
+            headers=headers,
+        )
+        self.assertSameResponse(
+            sync_view_class=ListRosterUserScheduleAPI,
+            path=f"{ROSTER_USER_SCHEDULE_LIST_PATH}?page_size=5",
+            headers={**headers, "If-None-Match": first_page["ETag"]},
+            status_code=304,
+        )
+
+
+class AsyncListViewsQueryBudgetTest(AsyncListViewsTestMixin, QueryBudgetTestCase):
+    def test_list_rosters(self):
+        headers = get_authorization(user=self.manager)
+        self.assertWithinQueryBudget(
+            lambda: self.send_async_request(path=ROSTER_LIST_PATH, headers=headers),
+            status_code=200,
+        )
+
+    def test_list_roster_user_schedules(self):
+        headers = get_authorization(user=self.staff_members[0])
+        self.assertWithinQueryBudget(
+            lambda: self.send_async_request(
+                path=ROSTER_USER_SCHEDULE_LIST_PATH, headers=headers
+            ),
+            status_code=200,
+        )
+
+    def test_concurrent_requests_only_count_their_own_queries(self):
+        requests = [
+            (ROSTER_LIST_PATH, get_authorization(user=self.manager)),
+            *(
+                (ROSTER_USER_SCHEDULE_LIST_PATH, get_authorization(user=staff_member))
+                for staff_member in self.staff_members
+            ),
+        ]
+
+        async def send_requests():
+            return await asyncio.gather(
+                *(
+                    AsyncClient().get(path, headers=headers)
+                    for path, headers in requests * 3
+                )
+            )
+
+        self.clear_caches()
+        for response in async_to_sync(send_requests)():
+            self.assertEqual(response.status_code, 200)
@@ -0,0 +1,218 @@
+"""
+This file contains all the tests of the import of roster user schedules from files
+"""
+
+import json
+from datetime import time
+from io import BytesIO
+
+from django.test import TestCase
+
+from rosters.constants import (
+    DUPLICATE_ROSTER_USER_SCHEDULE,
+    INVALID_JSON_LINE,
+    UNSUPPORTED_IMPORT_FILE_FORMAT,
+)
+from rosters.models import RosterUserSchedule, ShiftOccurrence
+from rosters.services import create_roster, create_roster_manager
+from rosters.services.bulk_import import (
+    IMPORT_FILE_FORMATS,
+    ImportReport,
+    _insert_chunk,
+    import_roster_user_schedules,
+)
+from users.models import UserRole
+from utils.testing import create_user
+
+CSV_HEADER = "user,working_day,shift,start_time,end_time"
+
+
+class ImportRosterUserSchedulesTest(TestCase):
+    def setUp(self):
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        _, self.roster = create_roster(
+            title="Roster", is_active=True, created_by=self.manager
+        )
+        create_roster_manager(roster=self.roster, manager=self.manager)
+
+    def get_csv_line(self, working_day: str, user=None) -> str:
+        user_id = user.id if user else self.staff_member.id
+        return f"{user_id},{working_day},Morning Shift,09:00,13:00"
+
+    def import_file(self, content: str, file_format: str = "csv", **kwargs):
+        success, report = import_roster_user_schedules(
+            roster=self.roster,
+            file=BytesIO(content.encode()),
+            file_format=file_format,
+            created_by=self.manager,
+            **kwargs,
+        )
+        self.assertTrue(success)
+        return report
+
+    def get_imported_days(self):
+        return sorted(
+            RosterUserSchedule.alive.filter(roster=self.roster).values_list(
+                "working_day", flat=True
+            )
+        )
+
+    def test_csv_rows_are_reported_by_line_number(self):
+        report = self.import_file(
+            content="\n".join(
+                [
+                    CSV_HEADER,
+                    self.get_csv_line(working_day="Monday"),
+                    self.get_csv_line(working_day="Someday"),
+                    self.get_csv_line(working_day="Tuesday", user=self.manager),
+                    self.get_csv_line(working_day="Wednesday"),
+                ]
+            )
+        )
+
+        self.assertEqual(
+            [(error["row"], list(error["errors"])) for error in report["errors"]],
+            [(3, ["working_day"]), (4, ["user"])],
+        )
+        self.assertEqual(
+            {key: report[key] for key in ("total_rows", "created", "failed")},
+            {"total_rows": 4, "created": 2, "failed": 2},
+        )
+        self.assertEqual(
+            self.get_imported_days(),
+            [
+                RosterUserSchedule.WorkingDay.MONDAY,
+                RosterUserSchedule.WorkingDay.WEDNESDAY,
+            ],
+        )
+
+    def test_jsonl_lines_are_reported_by_line_number(self):
+        row = {
+            "user": self.staff_member.id,
+            "working_day": "Monday",
+            "shift": "Morning Shift",
+            "start_time": "09:00",
+            "end_time": "13:00",
+        }
+        report = self.import_file(
+            content="\n".join(
+                [
+                    json.dumps(row),
+                    "",
+                    "not json",
+                    json.dumps(["Tuesday"]),
+                    json.dumps({**row, "working_day": "Friday", "end_time": "08:00"}),
+                ]
+            ),
+            file_format="jsonl",
+        )
+
+        self.assertEqual(
+            [(error["row"], error["errors"]) for error in report["errors"][:2]],
+            [(3, INVALID_JSON_LINE), (4, INVALID_JSON_LINE)],
+        )
+        self.assertEqual(report["errors"][2]["row"], 5)
+        self.assertIn("start_time", report["errors"][2]["errors"])
+        self.assertEqual(
+            {key: report[key] for key in ("total_rows", "created", "failed")},
+            {"total_rows": 4, "created": 1, "failed": 3},
+        )
+
+    def test_unsupported_file_format_is_rejected(self):
+        success, message = import_roster_user_schedules(
+            roster=self.roster, file=BytesIO(b""), file_format="xlsx"
+        )
+
+        self.assertFalse(success)
+        self.assertEqual(
+            message,
+            UNSUPPORTED_IMPORT_FILE_FORMAT.format(
+                formats=", ".join(IMPORT_FILE_FORMATS)
+            ),
+        )
+
+    def test_rows_are_checked_against_the_previous_chunks(self):
+        report = self.import_file(
+            content="\n".join(
+                [
+                    CSV_HEADER,
+                    self.get_csv_line(working_day="Monday"),
+                    self.get_csv_line(working_day="Tuesday"),
+                    # First row of the second chunk, duplicating the first one
+                    self.get_csv_line(working_day="Monday"),
+                    self.get_csv_line(working_day="Wednesday"),
+                    self.get_csv_line(working_day="Thursday"),
+                ]
+            ),
+            chunk_size=2,
+        )
+
+        self.assertEqual([error["row"] for error in report["errors"]], [4])
+        self.assertIn(
+            DUPLICATE_ROSTER_USER_SCHEDULE, report["errors"][0]["errors"]["__all__"]
+        )
+        self.assertEqual(
+            {key: report[key] for key in ("total_rows", "created", "failed")},
+            {"total_rows": 5, "created": 4, "failed": 1},
+        )
+        self.assertEqual(
+            self.get_imported_days(),
+            [
+                RosterUserSchedule.WorkingDay.MONDAY,
+                RosterUserSchedule.WorkingDay.TUESDAY,
+                RosterUserSchedule.WorkingDay.WEDNESDAY,
+                RosterUserSchedule.WorkingDay.THURSDAY,
+            ],
+        )
+
+    def test_chunk_violating_a_constraint_is_inserted_row_by_row(self):
+        def get_schedule(working_day: int) -> RosterUserSchedule:
+            return RosterUserSchedule(
+                roster=self.roster,
+                user=self.staff_member,
+                working_day=working_day,
+                shift=RosterUserSchedule.Shift.MORNING_SHIFT,
+                start_time=time(hour=9),
+                end_time=time(hour=13),
+            )
+
+        # As if another import inserted it after the chunk was validated
+        get_schedule(working_day=RosterUserSchedule.WorkingDay.MONDAY).save()
+        report: ImportReport = {
+            "total_rows": 2,
+            "created": 0,
+            "failed": 0,
+            "errors": [],
+        }
+        new_schedule = get_schedule(working_day=RosterUserSchedule.WorkingDay.TUESDAY)
+
+        _insert_chunk(
+            objs=[
+                (2, get_schedule(working_day=RosterUserSchedule.WorkingDay.MONDAY)),
+                (3, new_schedule),
+            ],
+            report=report,
+        )
+
+        self.assertEqual(
+            report,
+            {
+                "total_rows": 2,
+                "created": 1,
+                "failed": 1,
+                "errors": [{"row": 2, "errors": DUPLICATE_ROSTER_USER_SCHEDULE}],
+            },
+        )
+        self.assertEqual(
+            self.get_imported_days(),
+            [
+                RosterUserSchedule.WorkingDay.MONDAY,
+                RosterUserSchedule.WorkingDay.TUESDAY,
+            ],
+        )
+        self.assertTrue(
+            ShiftOccurrence.objects.filter(roster_user_schedule=new_schedule).exists()
+        )
@@ -0,0 +1,107 @@
+"""
+This file contains all the tests of the compiled serializers of the roster and schedule
+list APIs against the DRF serializers they replace behind COMPILED_SERIALIZERS
+"""
+
+import json
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from rosters.models import RosterUserSchedule
+from rosters.serializers import SHIFT_LABELS, WORKING_DAY_LABELS
+from users.models import User, UserRole
+from utils.response_cache import RESPONSE_CACHE_ALIAS
+from utils.testing import create_roster_with_schedules, create_user, get_client_for
+
+
+class CompiledSerializersTest(TestCase):
+    def setUp(self):
+        # Versions and payloads of the users of the previous tests, with the same ids
+        for cache in caches.all():
+            cache.clear()
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        # The full name of a user without a last name has no trailing space
+        other_staff_member = create_user(
+            email="other@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        User.objects.filter(id=self.staff_member.id).update(last_name="Member")
+        create_roster_with_schedules(
+            manager=self.manager, staff_members=[self.staff_member, other_staff_member]
+        )
+        create_roster_with_schedules(
+            manager=self.manager,
+            staff_members=[self.staff_member],
+            shift=RosterUserSchedule.Shift.EVENING_SHIFT,
+        )
+
+    def get_contents(self, user, path: str) -> dict:
+        contents = {}
+        for compiled in (False, True):
+            with override_settings(COMPILED_SERIALIZERS=compiled):
+                # The roster list payload of the other mode would be served from the cache
+                caches[RESPONSE_CACHE_ALIAS].clear()
+                response = get_client_for(user=user).get(path)
+            self.assertEqual(response.status_code, 200)
+            contents[compiled] = response.content
+        return contents
+
+    def assertSameContents(self, user, paths):
+        for path in paths:
+            with self.subTest(path=path):
+                contents = self.get_contents(user=user, path=path)
+
+                self.assertEqual(contents[True], contents[False])
+
+    def test_roster_list_is_the_same_in_both_modes(self):
+        self.assertSameContents(
+            user=self.manager,
+            paths=(
+                "/rosters/list/",
+                "/rosters/list/?page_size=1",
+                "/rosters/list/?working_day=Monday&shift=Evening Shift",
+            ),
+        )
+
+    def test_schedule_list_is_the_same_in_both_modes(self):
+        self.assertSameContents(
+            user=self.staff_member,
+            paths=(
+                "/rosters/users/schedules/list/",
+                "/rosters/users/schedules/list/?page_size=3",
+                "/rosters/users/schedules/list/?working_day=Sunday&is_active=true",
+            ),
+        )
+
+    def test_choices_are_listed_by_their_labels(self):
+        for user, path, get_schedules in (
+            (
+                self.manager,
+                "/rosters/list/",
+                lambda results: [
+                    schedule
+                    for roster in results
+                    for schedule in roster["roster_user_schedules"]
+                ],
+            ),
+            (
+                self.staff_member,
+                "/rosters/users/schedules/list/?page_size=100",
+                lambda results: results,
+            ),
+        ):
+            for compiled, content in self.get_contents(user=user, path=path).items():
+                with self.subTest(path=path, compiled=compiled):
+                    schedules = get_schedules(json.loads(content)["data"]["results"])
+
+                    self.assertEqual(
+                        {schedule["working_day"] for schedule in schedules},
+                        set(WORKING_DAY_LABELS.values()),
+                    )
+                    self.assertEqual(
+                        {schedule["shift"] for schedule in schedules},
+                        set(SHIFT_LABELS.values()),
+                    )
@@ -0,0 +1,152 @@
+"""
+This file contains all the tests of the soft delete and restore of the rosters along with
+their managers and schedules
+"""
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils.timezone import localdate
+
+from rosters.constants import ROSTER_IS_NOT_DELETED
+from rosters.models import Roster, RosterManager, RosterUserSchedule, ShiftOccurrence
+from rosters.services import delete_roster, delete_roster_user_schedule, restore_roster
+from rosters.services.occurrence import materialize_shift_occurrences
+from users.constants import OBJECT_NOT_FOUND
+from users.models import UserRole
+from utils.testing import create_roster_with_schedules, create_user, get_client_for
+
+
+class DeleteRosterTest(TestCase):
+    def setUp(self):
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        self.roster = create_roster_with_schedules(
+            manager=self.manager, staff_members=[self.staff_member]
+        )
+        self.past_date = localdate() - timedelta(days=7)
+        materialize_shift_occurrences(
+            roster_user_schedules=self.roster.rosteruserschedule_set.all(),
+            start_date=self.past_date,
+            end_date=self.past_date,
+        )
+
+    def get_date_deleted(self, model) -> set:
+        return set(
+            model.objects.filter(roster_id=self.roster.id).values_list(
+                "date_deleted", flat=True
+            )
+        )
+
+    def get_occurrence_dates(self) -> set:
+        return set(
+            ShiftOccurrence.objects.filter(roster_id=self.roster.id).values_list(
+                "date", flat=True
+            )
+        )
+
+    def test_children_are_deleted_with_the_roster(self):
+        success, _ = delete_roster(roster=self.roster, updated_by=self.manager)
+
+        self.assertTrue(success)
+        self.roster.refresh_from_db()
+        self.assertIsNotNone(self.roster.date_deleted)
+        self.assertEqual(
+            self.get_date_deleted(model=RosterManager), {self.roster.date_deleted}
+        )
+        self.assertEqual(
+            self.get_date_deleted(model=RosterUserSchedule),
+            {self.roster.date_deleted},
+        )
+        # Past occurrences are kept as history
+        self.assertEqual(self.get_occurrence_dates(), {self.past_date})
+
+    def test_restore_brings_back_the_children_deleted_with_the_roster(self):
+        occurrence_dates = self.get_occurrence_dates()
+        earlier_deleted_schedule = self.roster.rosteruserschedule_set.first()
+        delete_roster_user_schedule(
+            roster_user_schedule=earlier_deleted_schedule, updated_by=self.manager
+        )
+        delete_roster(roster=self.roster, updated_by=self.manager)
+
+        success, _ = restore_roster(roster=self.roster, updated_by=self.manager)
+
+        self.assertTrue(success)
+        self.assertIsNone(self.roster.date_deleted)
+        self.assertEqual(self.get_date_deleted(model=RosterManager), {None})
+        self.assertEqual(
+            set(
+                RosterUserSchedule.objects.filter(roster_id=self.roster.id)
+                .exclude(id=earlier_deleted_schedule.id)
+                .values_list("date_deleted", flat=True)
+            ),
+            {None},
+        )
+        earlier_deleted_schedule.refresh_from_db()
+        self.assertIsNotNone(earlier_deleted_schedule.date_deleted)
+        self.assertFalse(
+            ShiftOccurrence.objects.filter(
+                roster_user_schedule=earlier_deleted_schedule, date__gte=localdate()
+            ).exists()
+        )
+        self.assertEqual(
+            self.get_occurrence_dates(),
+            {
+                day
+                for day in occurrence_dates
+                if day < localdate()
+                or day.isoweekday() != earlier_deleted_schedule.working_day
+            },
+        )
+
+    def test_restore_is_refused_when_the_schedules_became_invalid(self):
+        delete_roster(roster=self.roster, updated_by=self.manager)
+        # The staff member is booked for the same shifts meanwhile
+        create_roster_with_schedules(
+            manager=self.manager, staff_members=[self.staff_member]
+        )
+
+        success, errors = restore_roster(roster=self.roster, updated_by=self.manager)
+
+        self.assertFalse(success)
+        self.assertEqual(
+            set(errors),
+            set(self.roster.rosteruserschedule_set.values_list("id", flat=True)),
+        )
+        self.roster.refresh_from_db()
+        self.assertIsNotNone(self.roster.date_deleted)
+        self.assertEqual(
+            self.get_date_deleted(model=RosterUserSchedule),
+            {self.roster.date_deleted},
+        )
+
+    def test_alive_roster_cannot_be_restored(self):
+        self.assertEqual(
+            restore_roster(roster=self.roster, updated_by=self.manager),
+            (False, ROSTER_IS_NOT_DELETED),
+        )
+
+    def test_only_the_managers_of_the_roster_can_restore_it(self):
+        other_manager = create_user(email="other@test.com", role=UserRole.Role.MANAGER)
+        response = get_client_for(user=self.manager).delete(
+            f"/rosters/{self.roster.id}/"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Roster.alive.filter(id=self.roster.id).exists())
+
+        response = get_client_for(user=other_manager).post(
+            f"/rosters/{self.roster.id}/restore/"
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            response.json()["errors"],
+            {"message": OBJECT_NOT_FOUND.format(object="Roster")},
+        )
+
+        response = get_client_for(user=self.manager).post(
+            f"/rosters/{self.roster.id}/restore/"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Roster.alive.filter(id=self.roster.id).exists())
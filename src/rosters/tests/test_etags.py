@@ -0,0 +1,105 @@
+"""
+This file contains all the tests of the ETags of the roster and schedule list APIs, which
+change with the version of the rosters a user sees
+"""
+
+from datetime import time
+
+from django.core.cache import caches
+from django.test import TestCase
+
+from rosters.services import delete_roster, update_roster_user_schedule
+from users.models import UserRole
+from utils.testing import create_roster_with_schedules, create_user, get_client_for
+
+ROSTER_LIST_PATH = "/rosters/list/"
+SCHEDULE_LIST_PATH = "/rosters/users/schedules/list/"
+
+
+class ETagTest(TestCase):
+    def setUp(self):
+        # Versions of the users of the previous tests, with the same ids
+        for cache in caches.all():
+            cache.clear()
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        self.other_manager = create_user(
+            email="other@test.com", role=UserRole.Role.MANAGER
+        )
+        self.roster = create_roster_with_schedules(
+            manager=self.manager, staff_members=[self.staff_member]
+        )
+        create_roster_with_schedules(manager=self.other_manager, staff_members=[])
+
+    def get_etag(self, user, path: str) -> str:
+        response = get_client_for(user=user).get(path)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def get_etags(self) -> dict:
+        return {
+            "manager": self.get_etag(user=self.manager, path=ROSTER_LIST_PATH),
+            "staff member": self.get_etag(
+                user=self.staff_member, path=SCHEDULE_LIST_PATH
+            ),
+            "other manager": self.get_etag(
+                user=self.other_manager, path=ROSTER_LIST_PATH
+            ),
+        }
+
+    def test_matching_etags_are_answered_not_modified(self):
+        for user, path in (
+            (self.manager, ROSTER_LIST_PATH),
+            (self.staff_member, SCHEDULE_LIST_PATH),
+        ):
+            with self.subTest(path=path):
+                etag = self.get_etag(user=user, path=path)
+
+                response = get_client_for(user=user).get(path, HTTP_IF_NONE_MATCH=etag)
+
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response["ETag"], etag)
+                self.assertEqual(response.content, b"")
+
+    def test_etags_differ_per_user_and_query_string(self):
+        etag = self.get_etag(user=self.manager, path=ROSTER_LIST_PATH)
+
+        self.assertNotEqual(
+            self.get_etag(user=self.manager, path=f"{ROSTER_LIST_PATH}?page_size=1"),
+            etag,
+        )
+        self.assertNotEqual(
+            self.get_etag(user=self.other_manager, path=ROSTER_LIST_PATH), etag
+        )
+
+    def test_schedule_updates_change_the_etags_of_the_users_seeing_them(self):
+        etags = self.get_etags()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_roster_user_schedule(
+                roster_user_schedule=self.roster.rosteruserschedule_set.first(),
+                start_time=time(hour=8),
+                updated_by=self.manager,
+            )
+
+        new_etags = self.get_etags()
+        self.assertNotEqual(new_etags["manager"], etags["manager"])
+        self.assertNotEqual(new_etags["staff member"], etags["staff member"])
+        self.assertEqual(new_etags["other manager"], etags["other manager"])
+        response = get_client_for(user=self.manager).get(
+            ROSTER_LIST_PATH, HTTP_IF_NONE_MATCH=etags["manager"]
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_roster_deletes_change_the_etags_of_the_users_seeing_them(self):
+        etags = self.get_etags()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_roster(roster=self.roster, updated_by=self.manager)
+
+        new_etags = self.get_etags()
+        self.assertNotEqual(new_etags["manager"], etags["manager"])
+        self.assertNotEqual(new_etags["staff member"], etags["staff member"])
+        self.assertEqual(new_etags["other manager"], etags["other manager"])
@@ -0,0 +1,47 @@
+"""
+This file contains all the tests of the partial indexes of the alive rows of rosters models
+"""
+
+from datetime import time
+
+from django.test import TestCase
+
+from rosters.models import Roster, RosterManager, RosterUserSchedule
+from utils.testing import explain
+
+
+class AliveIndexesTest(TestCase):
+    def test_schedules_of_a_user_on_a_day_use_the_alive_index(self):
+        plan = explain(
+            RosterUserSchedule.alive.filter(
+                roster__date_deleted__isnull=True,
+                roster__is_active=True,
+                user_id=1,
+                working_day=RosterUserSchedule.WorkingDay.MONDAY,
+                start_time__lte=time(hour=9),
+                end_time__gte=time(hour=10),
+            )
+        )
+
+        self.assertIn("rus_user_day_start_time_idx", plan)
+
+    def test_rosters_of_a_manager_use_the_alive_index(self):
+        plan = explain(
+            Roster.alive.filter(
+                id__in=RosterManager.alive.filter(manager_id=1).values_list(
+                    "roster_id", flat=True
+                )
+            )
+        )
+
+        self.assertIn("rm_alive_manager_roster_idx", plan)
+
+    def test_managers_of_a_roster_use_the_alive_index(self):
+        plan = explain(RosterManager.alive.filter(roster_id=1))
+
+        self.assertIn("rm_alive_roster_idx", plan)
+
+    def test_schedules_of_a_roster_use_the_alive_index(self):
+        plan = explain(RosterUserSchedule.alive.filter(roster_id=1))
+
+        self.assertIn("rus_alive_roster_idx", plan)
@@ -0,0 +1,115 @@
+"""
+This file contains all the tests of the keyset pagination of the roster list API
+"""
+
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from rosters.models import Roster
+from rosters.services import create_roster, create_roster_manager
+from users.models import UserRole
+from utils.constants import INVALID_FIELD_VALUE
+from utils.pagination import encode_cursor
+from utils.response_cache import RESPONSE_CACHE_ALIAS
+from utils.testing import create_user, get_client_for
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        # Versions and payloads of the users of the previous tests, with the same ids
+        for cache in caches.all():
+            cache.clear()
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.client = get_client_for(user=self.manager)
+        rosters = [self.create_roster(title=f"Roster {index}") for index in range(5)]
+        # The three newest rosters are created at the same moment
+        created_at = now() - timedelta(hours=1)
+        Roster.objects.filter(id__in=[roster.id for roster in rosters[2:]]).update(
+            date_created=created_at
+        )
+        Roster.objects.filter(id__in=[roster.id for roster in rosters[:2]]).update(
+            date_created=created_at - timedelta(hours=1)
+        )
+        # Newest first, the ties by id
+        self.roster_ids = [roster.id for roster in reversed(rosters)]
+
+    def create_roster(self, title: str) -> Roster:
+        _, roster = create_roster(title=title, is_active=True, created_by=self.manager)
+        create_roster_manager(roster=roster, manager=self.manager)
+        return roster
+
+    def list_rosters(self, page_size: int, cursor=None):
+        params = {"page_size": page_size}
+        if cursor:
+            params["cursor"] = cursor
+        return self.client.get("/rosters/list/", params)
+
+    def get_pages(self, page_size: int):
+        pages, cursor = [], None
+        while True:
+            response = self.list_rosters(page_size=page_size, cursor=cursor)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()["data"]
+            pages.append([roster["id"] for roster in data["results"]])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return pages
+
+    def test_pages_are_stable_when_date_created_ties(self):
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled), override_settings(
+                COMPILED_SERIALIZERS=compiled
+            ):
+                # The payloads of the other mode would be served from the cache
+                caches[RESPONSE_CACHE_ALIAS].clear()
+                pages = self.get_pages(page_size=2)
+
+                self.assertEqual(
+                    pages,
+                    [self.roster_ids[0:2], self.roster_ids[2:4], self.roster_ids[4:]],
+                )
+
+    def test_rosters_created_meanwhile_do_not_shift_the_next_pages(self):
+        response = self.list_rosters(page_size=2)
+        cursor = response.json()["data"]["next_cursor"]
+        self.create_roster(title="Newest roster")
+
+        response = self.list_rosters(page_size=2, cursor=cursor)
+
+        self.assertEqual(
+            [roster["id"] for roster in response.json()["data"]["results"]],
+            self.roster_ids[2:4],
+        )
+
+    def test_full_last_page_has_no_next_cursor(self):
+        pages = self.get_pages(page_size=len(self.roster_ids))
+
+        self.assertEqual(pages, [self.roster_ids])
+
+    def test_cursor_past_the_last_row_returns_an_empty_page(self):
+        last_roster = Roster.objects.get(id=self.roster_ids[-1])
+        cursor = encode_cursor(date_created=last_roster.date_created, id=last_roster.id)
+
+        response = self.list_rosters(page_size=2, cursor=cursor)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"], {"results": [], "next_cursor": None})
+
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in (
+            "not a cursor",
+            urlsafe_b64encode(b'{"id": 1}').decode(),
+            urlsafe_b64encode(b'["yesterday", 1]').decode(),
+        ):
+            with self.subTest(cursor=cursor):
+                response = self.list_rosters(page_size=2, cursor=cursor)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(
+                    response.json()["errors"],
+                    {"cursor": [INVALID_FIELD_VALUE.format(field="cursor")]},
+                )
@@ -0,0 +1,220 @@
+"""
+This file contains all the tests of the query budgets of the rosters APIs
+"""
+
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.utils.timezone import localdate
+
+from rosters.models import RosterUserSchedule
+from rosters.on_shift import on_shift_index
+from rosters.services import delete_roster, import_roster_user_schedules
+from rosters.services.bulk_import import (
+    IMPORT_CHUNK_QUERY_BUDGET,
+    ImportReport,
+    _insert_chunk,
+)
+from users.models import UserRole
+from utils.query_budget import query_budget
+from utils.testing import (
+    QueryBudgetTestCase,
+    create_roster_with_schedules,
+    create_user,
+    get_client_for,
+)
+
+CSV_HEADER = "user,working_day,shift,start_time,end_time"
+
+
+class RosterQueryBudgetTest(QueryBudgetTestCase):
+    def setUp(self):
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_members = [
+            create_user(email=f"staff{index}@test.com", role=UserRole.Role.STAFF_MEMBER)
+            for index in range(3)
+        ]
+        self.manager_client = get_client_for(user=self.manager)
+        self.staff_member_client = get_client_for(user=self.staff_members[0])
+        self.roster = self.create_roster()
+
+    def create_roster(self, shift=RosterUserSchedule.Shift.MORNING_SHIFT):
+        return create_roster_with_schedules(
+            manager=self.manager, staff_members=self.staff_members, shift=shift
+        )
+
+    def test_create_roster(self):
+        working_days = iter(("Monday", "Tuesday"))
+
+        def send_request():
+            working_day = next(working_days)
+            return self.manager_client.post(
+                "/rosters/",
+                {
+                    "title": f"Roster {working_day}",
+                    "roster_user_schedules": [
+                        {
+                            "user": staff_member.id,
+                            "working_day": working_day,
+                            "shift": "Evening Shift",
+                            "start_time": "14:00",
+                            "end_time": "18:00",
+                        }
+                        for staff_member in self.staff_members
+                    ],
+                },
+                format="json",
+            )
+
+        self.assertWithinQueryBudget(send_request, status_code=201)
+
+    def test_list_rosters(self):
+        self.assertWithinQueryBudget(
+            lambda: self.manager_client.get("/rosters/list/"), status_code=200
+        )
+
+    def test_delete_roster(self):
+        rosters = [self.roster, self.create_roster(shift=2)]
+        self.assertWithinQueryBudget(
+            lambda: self.manager_client.delete(f"/rosters/{rosters.pop().id}/"),
+            status_code=200,
+        )
+
+    def test_restore_roster(self):
+        rosters = [self.roster, self.create_roster(shift=2)]
+        for roster in rosters:
+            delete_roster(roster=roster)
+        self.assertWithinQueryBudget(
+            lambda: self.manager_client.post(f"/rosters/{rosters.pop().id}/restore/"),
+            status_code=200,
+        )
+
+    def test_create_roster_user_schedule(self):
+        staff_members = list(self.staff_members)
+        self.assertWithinQueryBudget(
+            lambda: self.manager_client.post(
+                "/rosters/users/schedules/",
+                {
+                    "roster": self.roster.id,
+                    "user": staff_members.pop().id,
+                    "working_day": "Monday",
+                    "shift": "Evening Shift",
+                    "start_time": "14:00",
+                    "end_time": "18:00",
+                },
+                format="json",
+            ),
+            status_code=201,
+        )
+
+    def get_import_file(self, working_days) -> bytes:
+        rows = "".join(
+            f"{staff_member.id},{working_day},Evening Shift,14:00,18:00\n"
+            for staff_member in self.staff_members
+            for working_day in working_days
+        )
+        return f"{CSV_HEADER}\n{rows}".encode()
+
+    def test_import_roster_user_schedules(self):
+        # The import API has no budget of its own, each chunk of the file is held to
+        # IMPORT_CHUNK_QUERY_BUDGET. The second request reports the rows as overlapping.
+        self.assertWithinQueryBudget(
+            lambda: self.manager_client.post(
+                "/rosters/users/schedules/import/",
+                {
+                    "roster": self.roster.id,
+                    "file": SimpleUploadedFile(
+                        "schedules.csv", self.get_import_file(working_days=["Monday"])
+                    ),
+                },
+            ),
+            status_code=200,
+        )
+
+    def test_import_roster_user_schedules_per_chunk(self):
+        success, report = import_roster_user_schedules(
+            roster=self.roster,
+            file=BytesIO(self.get_import_file(working_days=["Monday", "Tuesday"])),
+            file_format="csv",
+            created_by=self.manager,
+            chunk_size=2,
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(report["created"], 2 * len(self.staff_members))
+
+    def test_import_fallback_is_left_out_of_the_chunk_budget(self):
+        # As if another import inserted the schedules after the chunk was validated
+        objs = [
+            (
+                row_number,
+                RosterUserSchedule(
+                    roster=self.roster,
+                    user_id=schedule.user_id,
+                    working_day=schedule.working_day,
+                    shift=schedule.shift,
+                    start_time=schedule.start_time,
+                    end_time=schedule.end_time,
+                ),
+            )
+            for row_number, schedule in enumerate(
+                RosterUserSchedule.alive.filter(roster=self.roster), start=2
+            )
+        ]
+        report: ImportReport = {
+            "total_rows": len(objs),
+            "created": 0,
+            "failed": 0,
+            "errors": [],
+        }
+        self.assertGreater(len(objs), IMPORT_CHUNK_QUERY_BUDGET)
+
+        with query_budget(budget=IMPORT_CHUNK_QUERY_BUDGET) as query_counter:
+            _insert_chunk(objs=objs, report=report, query_counter=query_counter)
+
+        self.assertEqual(report["failed"], len(objs))
+
+    def test_update_roster_user_schedule(self):
+        roster_user_schedule = RosterUserSchedule.alive.filter(
+            roster=self.roster
+        ).first()
+        start_hours = iter((8, 10))
+        self.assertWithinQueryBudget(
+            lambda: self.manager_client.put(
+                f"/rosters/users/schedules/{roster_user_schedule.id}/",
+                {"start_time": f"{next(start_hours):02}:00"},
+                format="json",
+            ),
+            status_code=200,
+        )
+
+    def test_list_roster_user_schedules(self):
+        self.assertWithinQueryBudget(
+            lambda: self.staff_member_client.get("/rosters/users/schedules/list/"),
+            status_code=200,
+        )
+
+    def test_list_roster_user_schedule_conflicts(self):
+        with override_settings(ROSTER_SCHEDULE_CONFLICT_MODE="off"):
+            self.create_roster()
+        self.assertWithinQueryBudget(
+            lambda: self.manager_client.get("/rosters/users/schedules/conflicts/"),
+            status_code=200,
+        )
+
+    def test_list_on_shift_roster_user_schedules(self):
+        on_shift_index.invalidate()
+        self.assertWithinQueryBudget(
+            lambda: self.manager_client.get("/rosters/users/schedules/on-shift/"),
+            status_code=200,
+        )
+
+    def test_list_shift_occurrences(self):
+        today = localdate()
+        self.assertWithinQueryBudget(
+            lambda: self.manager_client.get(
+                f"/rosters/shifts/?start_date={today}&end_date={today}"
+            ),
+            status_code=200,
+        )
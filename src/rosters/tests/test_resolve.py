@@ -0,0 +1,144 @@
+"""
+This file contains all the tests of the resolution of the schedule attendance is marked for
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.timezone import make_aware
+
+from rosters.constants import NO_SHIFT_OPEN_FOR_ATTENDANCE
+from rosters.models import Roster, RosterUserSchedule
+from rosters.services import (
+    delete_roster,
+    resolve_roster_user_schedule,
+    resolve_roster_user_schedules,
+)
+from rosters.services.resolve import get_attendance_window
+from users.models import UserRole
+from utils.testing import create_roster_with_schedules, create_user
+
+# A Monday
+DAY = datetime(2026, 10, 19)
+
+
+def get_moment(hour: int, minute: int = 0) -> datetime:
+    return make_aware(DAY.replace(hour=hour, minute=minute))
+
+
+@override_settings(ATTENDANCE_EARLY_MINUTES=15, ATTENDANCE_LATE_MINUTES=30)
+class AttendanceWindowTest(SimpleTestCase):
+    def test_window_is_clamped_to_the_day_of_the_moment(self):
+        self.assertEqual(
+            get_attendance_window(moment=get_moment(hour=12)),
+            (time(hour=12, minute=15), time(hour=11, minute=30)),
+        )
+        self.assertEqual(
+            get_attendance_window(moment=get_moment(hour=23, minute=50)),
+            (time.max, time(hour=23, minute=20)),
+        )
+        self.assertEqual(
+            get_attendance_window(moment=get_moment(hour=0, minute=10)),
+            (time(hour=0, minute=25), time.min),
+        )
+
+
+@override_settings(ATTENDANCE_EARLY_MINUTES=15, ATTENDANCE_LATE_MINUTES=30)
+class ResolveRosterUserScheduleTest(TestCase):
+    def setUp(self):
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        self.morning_roster = create_roster_with_schedules(
+            manager=self.manager, staff_members=[self.staff_member]
+        )
+        self.evening_roster = create_roster_with_schedules(
+            manager=self.manager,
+            staff_members=[self.staff_member],
+            shift=RosterUserSchedule.Shift.EVENING_SHIFT,
+        )
+        self.morning_schedule = self.get_schedule(roster=self.morning_roster)
+        self.evening_schedule = self.get_schedule(roster=self.evening_roster)
+
+    def get_schedule(self, roster: Roster) -> RosterUserSchedule:
+        return roster.rosteruserschedule_set.get(
+            working_day=RosterUserSchedule.WorkingDay.MONDAY
+        )
+
+    def resolve(self, moment: datetime, **kwargs):
+        success, result = resolve_roster_user_schedule(
+            user=self.staff_member, moment=moment, **kwargs
+        )
+        return result if success else None
+
+    def test_shifts_are_open_from_before_their_start_until_after_their_end(self):
+        for moment, roster_user_schedule in (
+            (get_moment(hour=8, minute=44), None),
+            (get_moment(hour=8, minute=45), self.morning_schedule),
+            (get_moment(hour=13, minute=30), self.morning_schedule),
+            (get_moment(hour=13, minute=31), None),
+            (get_moment(hour=13, minute=45), self.evening_schedule),
+            (get_moment(hour=18, minute=30), self.evening_schedule),
+            (get_moment(hour=18, minute=31), None),
+        ):
+            with self.subTest(moment=moment):
+                self.assertEqual(self.resolve(moment=moment), roster_user_schedule)
+
+    @override_settings(ATTENDANCE_EARLY_MINUTES=60, ATTENDANCE_LATE_MINUTES=60)
+    def test_shift_starting_last_is_picked_when_windows_overlap(self):
+        moment = get_moment(hour=13, minute=30)
+
+        self.assertEqual(self.resolve(moment=moment), self.evening_schedule)
+        self.assertEqual(
+            self.resolve(
+                moment=moment, roster_user_schedule_id=self.morning_schedule.id
+            ),
+            self.morning_schedule,
+        )
+
+    def test_schedules_of_inactive_and_deleted_rosters_are_not_open(self):
+        Roster.objects.filter(id=self.morning_roster.id).update(is_active=False)
+        delete_roster(roster=self.evening_roster)
+
+        success, message = resolve_roster_user_schedule(
+            user=self.staff_member, moment=get_moment(hour=10)
+        )
+
+        self.assertFalse(success)
+        self.assertEqual(
+            message,
+            NO_SHIFT_OPEN_FOR_ATTENDANCE.format(
+                moment="Monday 10:00", early=15, late=30
+            ),
+        )
+
+    def test_batch_resolution_matches_the_single_one_with_one_query(self):
+        moments = [
+            get_moment(hour=8),
+            get_moment(hour=10),
+            get_moment(hour=13, minute=45),
+            # The Tuesday after
+            get_moment(hour=10) + timedelta(days=1),
+            get_moment(hour=10),
+        ]
+        roster_user_schedule_ids = [None, None, None, None, self.evening_schedule.id]
+        expected = []
+        for moment, roster_user_schedule_id in zip(moments, roster_user_schedule_ids):
+            _, result = resolve_roster_user_schedule(
+                user=self.staff_member,
+                moment=moment,
+                roster_user_schedule_id=roster_user_schedule_id,
+            )
+            expected.append(result)
+
+        with self.assertNumQueries(1):
+            results = resolve_roster_user_schedules(
+                user=self.staff_member,
+                moments=moments,
+                roster_user_schedule_ids=roster_user_schedule_ids,
+            )
+
+        self.assertEqual(results, expected)
+        self.assertEqual(results[3].working_day, RosterUserSchedule.WorkingDay.TUESDAY)
+        self.assertIsInstance(results[4], str)
@@ -0,0 +1,133 @@
+"""
+This file contains all the tests of the response cache of the rosters APIs
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import time as datetime_time
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from rosters.services import update_roster_user_schedule
+from users.models import UserRole
+from utils.response_cache import (
+    RESPONSE_CACHE_ALIAS,
+    RESPONSE_CACHE_LOCK_KEY,
+    ResponseCache,
+)
+from utils.testing import create_roster_with_schedules, create_user, get_client_for
+
+CONCURRENT_MISSES = 8
+
+
+class ResponseCacheTest(SimpleTestCase):
+    def setUp(self):
+        caches[RESPONSE_CACHE_ALIAS].clear()
+        self.response_cache = ResponseCache(name="test")
+        self.builds = 0
+
+    def build(self, payload="payload", duration: float = 0):
+        self.builds += 1
+        time.sleep(duration)
+        return payload
+
+    def test_clearing_responses_keeps_the_default_cache(self):
+        caches[DEFAULT_CACHE_ALIAS].set("version", 1)
+        caches[RESPONSE_CACHE_ALIAS].set("payload", [])
+
+        caches[RESPONSE_CACHE_ALIAS].clear()
+
+        self.assertEqual(caches[DEFAULT_CACHE_ALIAS].get("version"), 1)
+        self.assertIsNone(caches[RESPONSE_CACHE_ALIAS].get("payload"))
+        caches[DEFAULT_CACHE_ALIAS].delete("version")
+
+    def test_payload_is_built_on_a_miss_and_served_on_the_next_hits(self):
+        results = [
+            self.response_cache.get_or_build(key="v1", build=self.build)
+            for _ in range(3)
+        ]
+
+        self.assertEqual(
+            results, [("payload", False), ("payload", True), ("payload", True)]
+        )
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(self.response_cache.get_stats(), {"hits": 2, "misses": 1})
+
+        self.response_cache.reset_stats()
+        self.assertEqual(self.response_cache.get_stats(), {"hits": 0, "misses": 0})
+
+    def test_new_version_of_the_key_is_built_again(self):
+        self.response_cache.get_or_build(key="v1", build=lambda: self.build("old"))
+
+        payload, is_hit = self.response_cache.get_or_build(
+            key="v2", build=lambda: self.build("new")
+        )
+
+        self.assertEqual((payload, is_hit), ("new", False))
+        self.assertEqual(self.response_cache.get_stats(), {"hits": 0, "misses": 2})
+
+    def test_concurrent_misses_build_the_payload_once(self):
+        barrier = threading.Barrier(CONCURRENT_MISSES)
+
+        def get_or_build(_):
+            barrier.wait()
+            return self.response_cache.get_or_build(
+                key="v1", build=lambda: self.build(duration=0.2)
+            )
+
+        with ThreadPoolExecutor(max_workers=CONCURRENT_MISSES) as executor:
+            results = list(executor.map(get_or_build, range(CONCURRENT_MISSES)))
+
+        self.assertEqual(self.builds, 1)
+        self.assertEqual({payload for payload, _ in results}, {"payload"})
+        self.assertEqual(
+            self.response_cache.get_stats(),
+            {"hits": CONCURRENT_MISSES - 1, "misses": 1},
+        )
+
+    @override_settings(RESPONSE_CACHE_LOCK_TIMEOUT=1)
+    def test_payload_is_built_once_the_lock_times_out(self):
+        # As if the worker building the payload died
+        caches[RESPONSE_CACHE_ALIAS].add(
+            RESPONSE_CACHE_LOCK_KEY.format(name="test", key="v1"), 1, timeout=None
+        )
+
+        started_at = time.monotonic()
+        payload, is_hit = self.response_cache.get_or_build(key="v1", build=self.build)
+
+        self.assertGreaterEqual(time.monotonic() - started_at, 1)
+        self.assertEqual((payload, is_hit), ("payload", False))
+        self.assertEqual(self.builds, 1)
+
+
+class RosterListCacheTest(TestCase):
+    def setUp(self):
+        # Versions and payloads of the users of the previous tests, with the same ids
+        for cache in caches.all():
+            cache.clear()
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        self.roster = create_roster_with_schedules(
+            manager=self.manager, staff_members=[staff_member]
+        )
+
+    def get_cache_status(self) -> str:
+        response = get_client_for(user=self.manager).get("/rosters/list/")
+        self.assertEqual(response.status_code, 200)
+        return response["X-Cache"]
+
+    def test_payload_is_built_again_after_a_version_bump(self):
+        self.assertEqual([self.get_cache_status() for _ in range(2)], ["MISS", "HIT"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_roster_user_schedule(
+                roster_user_schedule=self.roster.rosteruserschedule_set.first(),
+                start_time=datetime_time(hour=8),
+                updated_by=self.manager,
+            )
+
+        self.assertEqual([self.get_cache_status() for _ in range(2)], ["MISS", "HIT"])
@@ -0,0 +1,222 @@
+"""
+This file contains all the tests of the number of role queries run to validate roster saves
+"""
+
+from datetime import time
+from io import BytesIO
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import localtime
+
+from rosters.constants import (
+    USER_SHOULD_HAVE_MANAGER_ROLE_TO_CREATE_ROSTER_MANAGER,
+    USER_SHOULD_HAVE_STAFF_MEMBER_ROLE_TO_CREATE_ROSTER_USER_SCHEDULE,
+)
+from rosters.models import RosterManager, RosterUserSchedule, ShiftOccurrence
+from rosters.services import create_roster, import_roster_user_schedules
+from rosters.validators import validate_roster_user_schedules
+from users.models import User, UserRole
+from users.roles import deferred_role_validation
+from utils.testing import TEST_USER_PASSWORD, create_user
+
+ROLE_TABLE = '"users_userrole"'
+
+
+class RoleValidationQueriesTest(TestCase):
+    def setUp(self):
+        self.managers = [
+            create_user(email=f"manager{index}@test.com", role=UserRole.Role.MANAGER)
+            for index in range(5)
+        ]
+        self.staff_members = [
+            create_user(email=f"staff{index}@test.com", role=UserRole.Role.STAFF_MEMBER)
+            for index in range(5)
+        ]
+        _, self.roster = create_roster(title="Roster", is_active=True)
+
+    def count_role_queries(self, run) -> int:
+        with CaptureQueriesContext(connection) as context:
+            run()
+        return sum(ROLE_TABLE in query["sql"] for query in context.captured_queries)
+
+    def get_roster_user_schedules(self, users, working_day=1):
+        return [
+            RosterUserSchedule(
+                roster=self.roster,
+                user=user,
+                working_day=working_day,
+                shift=RosterUserSchedule.Shift.MORNING_SHIFT,
+                start_time=time(hour=9),
+                end_time=time(hour=13),
+            )
+            for user in users
+        ]
+
+    def test_single_save_raises_missing_role(self):
+        roster_manager = RosterManager(
+            roster=self.roster, manager=self.staff_members[0]
+        )
+
+        with self.assertRaisesMessage(
+            ValidationError, USER_SHOULD_HAVE_MANAGER_ROLE_TO_CREATE_ROSTER_MANAGER
+        ):
+            roster_manager.save()
+
+    def test_deferred_saves_check_roles_with_one_query(self):
+        def save():
+            with deferred_role_validation():
+                for manager in self.managers:
+                    RosterManager(roster=self.roster, manager=manager).save()
+
+        self.assertEqual(self.count_role_queries(save), 1)
+        self.assertEqual(RosterManager.objects.count(), len(self.managers))
+
+    def test_deferred_saves_raise_missing_role_and_keep_nothing(self):
+        with self.assertRaisesMessage(
+            ValidationError, USER_SHOULD_HAVE_MANAGER_ROLE_TO_CREATE_ROSTER_MANAGER
+        ):
+            with deferred_role_validation():
+                for manager in [*self.managers, self.staff_members[0]]:
+                    RosterManager(roster=self.roster, manager=manager).save()
+
+        self.assertFalse(RosterManager.objects.exists())
+
+    def test_batch_validation_checks_roles_with_one_query(self):
+        for users in (self.staff_members[:1], self.staff_members):
+            role_queries = self.count_role_queries(
+                lambda: self.assertEqual(
+                    validate_roster_user_schedules(
+                        roster_user_schedules=self.get_roster_user_schedules(
+                            users=users
+                        )
+                    ),
+                    {},
+                )
+            )
+
+            self.assertEqual(role_queries, 1)
+
+    def test_batch_validation_reports_missing_role_on_its_row(self):
+        errors = validate_roster_user_schedules(
+            roster_user_schedules=self.get_roster_user_schedules(
+                users=[*self.staff_members[:2], self.managers[0]]
+            )
+        )
+
+        self.assertEqual(
+            errors,
+            {
+                2: {
+                    "user": [
+                        USER_SHOULD_HAVE_STAFF_MEMBER_ROLE_TO_CREATE_ROSTER_USER_SCHEDULE
+                    ]
+                }
+            },
+        )
+
+    def test_import_checks_roles_with_one_query_per_chunk(self):
+        rows = "".join(
+            f"{staff_member.id},{working_day},Morning Shift,09:00,13:00\n"
+            for staff_member in self.staff_members[:3]
+            for working_day in RosterUserSchedule.WorkingDay.labels
+        )
+        file = BytesIO(f"user,working_day,shift,start_time,end_time\n{rows}".encode())
+
+        def run():
+            success, report = import_roster_user_schedules(
+                roster=self.roster, file=file, file_format="csv", chunk_size=7
+            )
+            self.assertTrue(success)
+            self.assertEqual(report["created"], 21)
+
+        self.assertEqual(self.count_role_queries(run), 3)
+
+
+class RosterAdminRoleValidationTest(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser(
+            email="admin@test.com", first_name="admin", password=TEST_USER_PASSWORD
+        )
+        self.client.force_login(admin)
+        self.managers = [
+            create_user(email=f"manager{index}@test.com", role=UserRole.Role.MANAGER)
+            for index in range(3)
+        ]
+        self.staff_members = [
+            create_user(email=f"staff{index}@test.com", role=UserRole.Role.STAFF_MEMBER)
+            for index in range(5)
+        ]
+        _, self.roster = create_roster(title="Roster", is_active=True)
+
+    def post_roster(self, managers, staff_members):
+        data = {
+            "title": self.roster.title,
+            "is_active": "on",
+            "date_created_0": localtime(self.roster.date_created).date(),
+            "date_created_1": localtime(self.roster.date_created).time(),
+            "rostermanager_set-TOTAL_FORMS": len(managers),
+            "rostermanager_set-INITIAL_FORMS": 0,
+            "rosteruserschedule_set-TOTAL_FORMS": len(staff_members),
+            "rosteruserschedule_set-INITIAL_FORMS": 0,
+        }
+        for index, manager in enumerate(managers):
+            data[f"rostermanager_set-{index}-manager"] = manager.id
+        for index, staff_member in enumerate(staff_members):
+            data.update(
+                {
+                    f"rosteruserschedule_set-{index}-user": staff_member.id,
+                    f"rosteruserschedule_set-{index}-working_day": 1,
+                    f"rosteruserschedule_set-{index}-shift": 1,
+                    f"rosteruserschedule_set-{index}-start_time": "09:00",
+                    f"rosteruserschedule_set-{index}-end_time": "13:00",
+                }
+            )
+
+        return self.client.post(
+            reverse("admin:rosters_roster_change", args=[self.roster.id]), data
+        )
+
+    def test_inline_rows_check_roles_with_one_query_per_step(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.post_roster(
+                managers=self.managers, staff_members=self.staff_members
+            )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            RosterUserSchedule.objects.filter(roster=self.roster).count(),
+            len(self.staff_members),
+        )
+        self.assertTrue(ShiftOccurrence.objects.filter(roster=self.roster).exists())
+        # One query per inline formset validated and one for the saves of all the rows
+        self.assertEqual(
+            sum(ROLE_TABLE in query["sql"] for query in context.captured_queries), 3
+        )
+
+    def test_inline_rows_report_missing_role_on_their_row(self):
+        response = self.post_roster(
+            managers=[self.staff_members[0]], staff_members=[self.managers[0]]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                inline.formset.errors
+                for inline in response.context["inline_admin_formsets"]
+            ],
+            [
+                [{"__all__": [USER_SHOULD_HAVE_MANAGER_ROLE_TO_CREATE_ROSTER_MANAGER]}],
+                [
+                    {
+                        "__all__": [
+                            USER_SHOULD_HAVE_STAFF_MEMBER_ROLE_TO_CREATE_ROSTER_USER_SCHEDULE
+                        ]
+                    }
+                ],
+            ],
+        )
+        self.assertFalse(RosterManager.objects.exists())
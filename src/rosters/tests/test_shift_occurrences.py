@@ -0,0 +1,126 @@
+"""
+This file contains all the tests of the materialization of the shift occurrences of the
+roster user schedules
+"""
+
+from datetime import time, timedelta
+
+from django.test import TestCase, override_settings
+from django.utils.timezone import localdate
+
+from rosters.models import RosterUserSchedule, ShiftOccurrence
+from rosters.services import (
+    bulk_create_roster_user_schedules,
+    create_roster,
+    create_roster_manager,
+    delete_roster_user_schedule,
+    update_roster_user_schedule,
+)
+from rosters.services.occurrence import materialize_shift_occurrences
+from users.models import UserRole
+from utils.testing import create_user
+
+HORIZON_DAYS = 13
+
+
+@override_settings(SHIFT_OCCURRENCE_HORIZON_DAYS=HORIZON_DAYS)
+class ShiftOccurrencesTest(TestCase):
+    def setUp(self):
+        self.manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        _, roster = create_roster(
+            title="Roster", is_active=True, created_by=self.manager
+        )
+        create_roster_manager(roster=roster, manager=self.manager)
+        _, (self.roster_user_schedule,) = bulk_create_roster_user_schedules(
+            roster=roster,
+            data=[
+                {
+                    "user": staff_member,
+                    "working_day": RosterUserSchedule.WorkingDay.MONDAY,
+                    "shift": RosterUserSchedule.Shift.MORNING_SHIFT,
+                    "start_time": time(hour=9),
+                    "end_time": time(hour=13),
+                }
+            ],
+        )
+
+    def get_occurrences(self):
+        return list(
+            ShiftOccurrence.objects.filter(
+                roster_user_schedule=self.roster_user_schedule
+            )
+            .order_by("date")
+            .values_list("date", "start_time", "end_time")
+        )
+
+    def get_upcoming_dates(self, working_day: int):
+        return [
+            localdate() + timedelta(days=offset)
+            for offset in range(HORIZON_DAYS + 1)
+            if (localdate() + timedelta(days=offset)).isoweekday() == working_day
+        ]
+
+    def create_past_occurrence(self) -> ShiftOccurrence:
+        return ShiftOccurrence.objects.create(
+            roster_user_schedule=self.roster_user_schedule,
+            roster_id=self.roster_user_schedule.roster_id,
+            user_id=self.roster_user_schedule.user_id,
+            date=localdate() - timedelta(days=7),
+            shift=self.roster_user_schedule.shift,
+            start_time=time(hour=9),
+            end_time=time(hour=13),
+        )
+
+    def test_created_schedules_are_materialized_up_to_the_horizon(self):
+        self.assertEqual(
+            self.get_occurrences(),
+            [
+                (day, time(hour=9), time(hour=13))
+                for day in self.get_upcoming_dates(
+                    working_day=RosterUserSchedule.WorkingDay.MONDAY
+                )
+            ],
+        )
+
+    def test_materializing_again_keeps_one_occurrence_per_date(self):
+        occurrences = self.get_occurrences()
+
+        materialize_shift_occurrences(roster_user_schedules=[self.roster_user_schedule])
+
+        self.assertEqual(self.get_occurrences(), occurrences)
+
+    def test_updated_schedules_replace_their_upcoming_occurrences(self):
+        past_occurrence = self.create_past_occurrence()
+
+        success, _ = update_roster_user_schedule(
+            roster_user_schedule=self.roster_user_schedule,
+            working_day=RosterUserSchedule.WorkingDay.TUESDAY,
+            start_time=time(hour=10),
+            updated_by=self.manager,
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(
+            self.get_occurrences(),
+            [(past_occurrence.date, time(hour=9), time(hour=13))]
+            + [
+                (day, time(hour=10), time(hour=13))
+                for day in self.get_upcoming_dates(
+                    working_day=RosterUserSchedule.WorkingDay.TUESDAY
+                )
+            ],
+        )
+
+    def test_deleted_schedules_lose_their_upcoming_occurrences(self):
+        past_occurrence = self.create_past_occurrence()
+
+        delete_roster_user_schedule(
+            roster_user_schedule=self.roster_user_schedule, updated_by=self.manager
+        )
+
+        self.assertEqual(
+            [day for day, _, _ in self.get_occurrences()], [past_occurrence.date]
+        )
@@ -0,0 +1,95 @@
+"""
+This file contains all the tests of the batch validators of the rosters module
+"""
+
+from datetime import time
+
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.test import TestCase
+
+from rosters.constants import DUPLICATE_ROSTER_USER_SCHEDULE, SCHEDULE_OVERLAPS_WITH
+from rosters.models import RosterUserSchedule
+from rosters.services import create_roster
+from rosters.validators import validate_roster_user_schedules
+from users.models import UserRole
+from utils.testing import create_user
+
+
+class ValidateRosterUserSchedulesTest(TestCase):
+    def setUp(self):
+        manager = create_user(email="manager@test.com", role=UserRole.Role.MANAGER)
+        self.staff_member = create_user(
+            email="staff@test.com", role=UserRole.Role.STAFF_MEMBER
+        )
+        _, self.roster = create_roster(
+            title="Roster", is_active=True, created_by=manager
+        )
+
+    def get_roster_user_schedule(self, shift, start_time, end_time):
+        return RosterUserSchedule(
+            roster=self.roster,
+            user=self.staff_member,
+            working_day=RosterUserSchedule.WorkingDay.MONDAY,
+            shift=shift,
+            start_time=start_time,
+            end_time=end_time,
+        )
+
+    def test_duplicate_rows_only_reject_the_later_row(self):
+        roster_user_schedules = [
+            self.get_roster_user_schedule(
+                shift=RosterUserSchedule.Shift.MORNING_SHIFT,
+                start_time=time(hour=9),
+                end_time=time(hour=13),
+            )
+            for _ in range(2)
+        ]
+
+        errors = validate_roster_user_schedules(roster_user_schedules)
+
+        self.assertEqual(
+            errors,
+            {
+                1: {
+                    NON_FIELD_ERRORS: [
+                        DUPLICATE_ROSTER_USER_SCHEDULE,
+                        SCHEDULE_OVERLAPS_WITH.format(
+                            roster=self.roster.id,
+                            start_time=time(hour=9),
+                            end_time=time(hour=13),
+                        ),
+                    ]
+                }
+            },
+        )
+
+    def test_overlapping_rows_only_reject_the_later_row(self):
+        roster_user_schedules = [
+            self.get_roster_user_schedule(
+                shift=RosterUserSchedule.Shift.EVENING_SHIFT,
+                start_time=time(hour=12),
+                end_time=time(hour=18),
+            ),
+            self.get_roster_user_schedule(
+                shift=RosterUserSchedule.Shift.MORNING_SHIFT,
+                start_time=time(hour=9),
+                end_time=time(hour=13),
+            ),
+        ]
+
+        errors = validate_roster_user_schedules(roster_user_schedules)
+
+        self.assertEqual(
+            errors,
+            {
+                1: {
+                    NON_FIELD_ERRORS: [
+                        SCHEDULE_OVERLAPS_WITH.format(
+                            roster=self.roster.id,
+                            start_time=time(hour=12),
+                            end_time=time(hour=18),
+                        )
+                    ]
+                }
+            },
+        )
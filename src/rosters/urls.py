@@ -2,21 +2,53 @@
 This file contains all the urls used for rosters module
 """
 
+from django.conf import settings
 from django.urls import path
 
-from rosters.apis import roster, roster_user_schedule
+from rosters.apis import roster, roster_user_schedule, shift_occurrence
 
 urlpatterns = [
     path("", roster.CreateRosterAPI.as_view(), name="roster-create"),
-    path("list/", roster.ListRosterAPI.as_view(), name="roster-list"),
+    path(
+        "list/",
+        (
+            roster.AsyncListRosterAPI if settings.ASYNC_VIEWS else roster.ListRosterAPI
+        ).as_view(),
+        name="roster-list",
+    ),
+    path("<int:pk>/", roster.DeleteRosterAPI.as_view(), name="roster-delete"),
+    path(
+        "<int:pk>/restore/",
+        roster.RestoreRosterAPI.as_view(),
+        name="roster-restore",
+    ),
     path(
         "users/schedules/",
         roster_user_schedule.CreateRosterUserScheduleAPI.as_view(),
         name="roster-user-schedule-create",
     ),
+    path(
+        "users/schedules/import/",
+        roster_user_schedule.ImportRosterUserScheduleAPI.as_view(),
+        name="roster-user-schedule-import",
+    ),
+    path(
+        "users/schedules/conflicts/",
+        roster_user_schedule.ListRosterUserScheduleConflictAPI.as_view(),
+        name="roster-user-schedule-conflict-list",
+    ),
+    path(
+        "users/schedules/on-shift/",
+        roster_user_schedule.ListOnShiftRosterUserScheduleAPI.as_view(),
+        name="roster-user-schedule-on-shift-list",
+    ),
     path(
         "users/schedules/list/",
-        roster_user_schedule.ListRosterUserScheduleAPI.as_view(),
+        (
+            roster_user_schedule.AsyncListRosterUserScheduleAPI
+            if settings.ASYNC_VIEWS
+            else roster_user_schedule.ListRosterUserScheduleAPI
+        ).as_view(),
         name="roster-user-schedule-list",
     ),
     path(
@@ -24,4 +56,9 @@ urlpatterns = [
         roster_user_schedule.UpdateRosterUserScheduleAPI.as_view(),
         name="roster-user-schedule-update",
     ),
+    path(
+        "shifts/",
+        shift_occurrence.ListShiftOccurrenceAPI.as_view(),
+        name="shift-occurrence-list",
+    ),
 ]
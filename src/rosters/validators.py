@@ -0,0 +1,98 @@
+"""
+This file contains all the batch validators for rosters module
+"""
+
+from collections import defaultdict
+from typing import Dict, List
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+
+from rosters.conflicts import check_roster_user_schedule_conflicts
+from rosters.constants import DUPLICATE_ROSTER_USER_SCHEDULE
+from rosters.models import RosterUserSchedule
+from users.roles import deferred_role_validation
+
+# Index of the row in the batch -> field -> error messages
+BatchErrors = Dict[int, Dict[str, List[str]]]
+
+
+def validate_roster_user_schedules(
+    roster_user_schedules: List[RosterUserSchedule],
+) -> BatchErrors:
+    """
+    This function is used to validate a batch of unsaved roster user schedules with a fixed
+    number of queries, whatever the size of the batch:
+    - field values and start/end times of every row, without queries
+    - staff member role of all the users, collected from validate_user of every row and
+      resolved with one query
+    - duplicate (roster, user, working day, shift) rows within the batch and against the
+      existing schedules, with one query
+    - double booking of the users across rosters, with one query
+    Returns the errors of the invalid rows, keyed by their index in the batch.
+    """
+    errors: BatchErrors = defaultdict(lambda: defaultdict(list))
+    if not roster_user_schedules:
+        return {}
+
+    for index, roster_user_schedule in enumerate(roster_user_schedules):
+        try:
+            roster_user_schedule.clean_fields(
+                exclude=["roster", "user", "created_by", "updated_by"]
+            )
+            roster_user_schedule.clean()
+        except ValidationError as error:
+            for field, messages in error.message_dict.items():
+                errors[index][field].extend(messages)
+
+    with deferred_role_validation(raise_errors=False) as failed_role_checks:
+        for roster_user_schedule in roster_user_schedules:
+            roster_user_schedule.validate_user()
+
+    # Unsaved instances are not hashable, rows are found back by identity
+    positions = {
+        id(roster_user_schedule): index
+        for index, roster_user_schedule in enumerate(roster_user_schedules)
+    }
+    for role_check in failed_role_checks:
+        errors[positions[id(role_check.key)]]["user"].append(role_check.message)
+
+    user_ids = {
+        roster_user_schedule.user_id for roster_user_schedule in roster_user_schedules
+    }
+
+    # Existing schedules which are part of the batch (i.e. being updated) are not duplicates
+    existing_keys = set(
+        RosterUserSchedule.alive.filter(
+            roster_id__in={
+                roster_user_schedule.roster_id
+                for roster_user_schedule in roster_user_schedules
+            },
+            user_id__in=user_ids,
+        )
+        .exclude(
+            id__in=[
+                roster_user_schedule.id
+                for roster_user_schedule in roster_user_schedules
+                if roster_user_schedule.id
+            ]
+        )
+        .values_list("roster_id", "user_id", "working_day", "shift")
+    )
+
+    for index, roster_user_schedule in enumerate(roster_user_schedules):
+        key = (
+            roster_user_schedule.roster_id,
+            roster_user_schedule.user_id,
+            roster_user_schedule.working_day,
+            roster_user_schedule.shift,
+        )
+        if key in existing_keys:
+            errors[index][NON_FIELD_ERRORS].append(DUPLICATE_ROSTER_USER_SCHEDULE)
+        existing_keys.add(key)
+
+    for index, messages in check_roster_user_schedule_conflicts(
+        roster_user_schedules=roster_user_schedules
+    ).items():
+        errors[index][NON_FIELD_ERRORS].extend(messages)
+
+    return {index: dict(row_errors) for index, row_errors in errors.items()}
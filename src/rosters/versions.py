@@ -0,0 +1,114 @@
+"""
+This file contains the version stamps of the rosters and roster user schedules listed to a
+user, used to answer conditional requests without querying the schedule tables
+"""
+
+from typing import Iterable
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from rosters.models import RosterManager, RosterUserSchedule
+
+ROSTERS_VERSION_CACHE_KEY = "rosters:version:{user_id}"
+
+
+def get_rosters_version(user_id: int) -> str:
+    """
+    This function is used to get the version of the rosters and schedules a user sees, as a
+    manager of the rosters or as a staff member scheduled in them. A missing version is
+    replaced by a new random one, so an evicted key can only cost a full response and never
+    match a stale one.
+    """
+    cache_key = ROSTERS_VERSION_CACHE_KEY.format(user_id=user_id)
+    version = cache.get(cache_key)
+    if version is None:
+        version = uuid4().hex
+        # Another worker may have stored a version meanwhile, every worker uses the first one
+        if not cache.add(
+            cache_key, version, timeout=settings.ROSTERS_VERSION_CACHE_TIMEOUT
+        ):
+            version = cache.get(cache_key) or version
+    return version
+
+
+async def aget_rosters_version(user_id: int) -> str:
+    """
+    Async variant of get_rosters_version, for async views
+    """
+    cache_key = ROSTERS_VERSION_CACHE_KEY.format(user_id=user_id)
+    version = await cache.aget(cache_key)
+    if version is None:
+        version = uuid4().hex
+        if not await cache.aadd(
+            cache_key, version, timeout=settings.ROSTERS_VERSION_CACHE_TIMEOUT
+        ):
+            version = await cache.aget(cache_key) or version
+    return version
+
+
+def invalidate_rosters_versions(user_ids: Iterable[int]) -> None:
+    """
+    This function is used to drop the versions of given users
+    """
+    cache.delete_many(
+        [ROSTERS_VERSION_CACHE_KEY.format(user_id=user_id) for user_id in set(user_ids)]
+    )
+
+
+def invalidate_roster_versions(roster_ids: Iterable[int]) -> None:
+    """
+    This function is used to drop the versions of the managers and staff members of given
+    rosters, deleted ones included, with one query
+    """
+    roster_ids = list(roster_ids)
+    invalidate_rosters_versions(
+        user_ids=RosterManager.all_objects.filter(roster_id__in=roster_ids)
+        .values_list("manager_id", flat=True)
+        .union(
+            RosterUserSchedule.all_objects.filter(roster_id__in=roster_ids).values_list(
+                "user_id", flat=True
+            )
+        )
+    )
+
+
+def invalidate_roster_user_schedule_versions(
+    roster_user_schedule_ids: Iterable[int], roster_ids: Iterable[int] = ()
+) -> None:
+    """
+    This function is used to drop the versions of the staff members of given roster user
+    schedules and of the managers of their rosters, and of the other given rosters e.g. the
+    one a schedule was moved out of, with one query
+    """
+    roster_user_schedules = RosterUserSchedule.all_objects.filter(
+        id__in=list(roster_user_schedule_ids)
+    )
+    invalidate_rosters_versions(
+        user_ids=roster_user_schedules.values_list("user_id", flat=True).union(
+            RosterManager.all_objects.filter(
+                Q(roster_id__in=roster_user_schedules.values("roster_id"))
+                | Q(roster_id__in=list(roster_ids))
+            ).values_list("manager_id", flat=True)
+        )
+    )
+
+
+def invalidate_staff_member_versions(user_ids: Iterable[int]) -> None:
+    """
+    This function is used to drop the versions of given users and of the managers of the
+    rosters they are scheduled in, with one query
+    """
+    user_ids = list(user_ids)
+    invalidate_rosters_versions(
+        user_ids=[
+            *user_ids,
+            *RosterManager.all_objects.filter(
+                roster_id__in=RosterUserSchedule.all_objects.filter(
+                    user_id__in=user_ids
+                ).values("roster_id")
+            ).values_list("manager_id", flat=True),
+        ]
+    )
@@ -6,26 +6,28 @@ from django.contrib.auth import authenticate
 from django.db import IntegrityError
 from django.utils.timezone import now
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.serializers import (
-    TokenObtainPairSerializer,
-    TokenRefreshSerializer,
-)
 from rest_framework_simplejwt.tokens import BlacklistedToken, OutstandingToken
 
 from users.constants import TOKEN_IS_ALREADY_BLACK_LISTED, USER_LOGGED_OUT_SUCCESSFULLY
+from users.tokens import UserTokenRefreshSerializer, get_token_for_user
 from utils.constants import INVALID_FIELD_VALUE
+from utils.query_budget import QueryBudgetMixin
 from utils.response import CustomResponse
+from utils.views import AsyncAPIView
 
 
-class UserLoginAPI(APIView):
+class UserLoginAPI(QueryBudgetMixin, APIView):
     """
     This API is used for login the user
     Response codes: 200, 400
     """
 
+    query_budget = 4
+
     class InputSerializer(serializers.Serializer):
         email = serializers.EmailField()
         password = serializers.CharField()
@@ -46,7 +48,7 @@ class UserLoginAPI(APIView):
                 status=HTTP_400_BAD_REQUEST,
             )
 
-        token = TokenObtainPairSerializer.get_token(user=user)
+        token = get_token_for_user(user=user)
 
         response = CustomResponse(
             data={"access_token": str(token.access_token)}, status=HTTP_200_OK
@@ -55,16 +57,19 @@ class UserLoginAPI(APIView):
         return response
 
 
-class UserRefreshAPI(APIView):
+class UserRefreshAPI(QueryBudgetMixin, APIView):
     """
     This API used to refresh token
     Cookies: refresh_token
     Response codes: 200, 400, 401
     """
 
+    # The last two queries only run when the roles of the user are not cached
+    query_budget = 4
+
     def get(self, request, *args, **kwargs):
         refresh_token = request.COOKIES.get("refresh_token")
-        serializer = TokenRefreshSerializer(data={"refresh": refresh_token})
+        serializer = UserTokenRefreshSerializer(data={"refresh": refresh_token})
         try:
             if not serializer.is_valid():
                 return CustomResponse(
@@ -79,13 +84,41 @@ class UserRefreshAPI(APIView):
         )
 
 
-class UserLogoutAPI(APIView):
+class AsyncUserRefreshAPI(UserRefreshAPI, AsyncAPIView):
+    """
+    Async variant of UserRefreshAPI, served when ASYNC_VIEWS is set
+    Cookies: refresh_token
+    Response codes: 200, 400, 401
+    """
+
+    async def get(self, request, *args, **kwargs):
+        refresh_token = request.COOKIES.get("refresh_token")
+        serializer = UserTokenRefreshSerializer()
+        try:
+            attrs = serializer.to_internal_value(data={"refresh": refresh_token})
+        except ValidationError as error:
+            return CustomResponse(errors=error.detail, status=HTTP_400_BAD_REQUEST)
+
+        try:
+            validated_data = await serializer.avalidate(attrs)
+        except TokenError as error:
+            return CustomResponse(errors=str(error), status=HTTP_400_BAD_REQUEST)
+
+        return CustomResponse(
+            data={"access_token": validated_data["access"]},
+            status=HTTP_200_OK,
+        )
+
+
+class UserLogoutAPI(QueryBudgetMixin, APIView):
     """
     This API used to logout the user
     Cookies: refresh_token
     Response codes: 200, 400
     """
 
+    query_budget = 2
+
     def post(self, request, *args, **kwargs):
         refresh_token = request.COOKIES.get("refresh_token")
 
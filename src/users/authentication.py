@@ -0,0 +1,115 @@
+"""
+This file contains all the authentication classes for users module
+"""
+
+from typing import FrozenSet, Optional, Tuple
+
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import Token
+
+from users.models import User
+from users.roles import aget_user_roles_version, get_user_roles_version
+from users.tokens import FULL_NAME_CLAIM, ROLES_CLAIM, ROLES_VERSION_CLAIM
+
+
+class StatelessUser(TokenUser):
+    """
+    User backed by the claims of a validated token. Model fields which are not part of the
+    token are loaded from the database on first access.
+    """
+
+    USER_FIELDS = frozenset(field.attname for field in User._meta.concrete_fields)
+
+    @cached_property
+    def full_name(self) -> str:
+        return self.token[FULL_NAME_CLAIM]
+
+    @cached_property
+    def roles(self) -> FrozenSet[int]:
+        return frozenset(self.token[ROLES_CLAIM])
+
+    @cached_property
+    def _active_roles(self) -> FrozenSet[int]:
+        # Used by users.roles to resolve roles without touching the cache or database
+        return self.roles
+
+    @cached_property
+    def instance(self) -> User:
+        """
+        The user model instance, needed when the user is assigned to a model field
+        """
+        return User.objects.get(id=self.id)
+
+    def __getattr__(self, attr: str):
+        if attr in self.USER_FIELDS:
+            return getattr(self.instance, attr)
+        return super().__getattr__(attr)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates requests from the token claims without loading the user from the database.
+    Tokens issued before the roles of the user changed are rejected, so that the client
+    refreshes them.
+    """
+
+    @staticmethod
+    def has_user_claims(validated_token: Token) -> bool:
+        return all(
+            claim in validated_token
+            for claim in (FULL_NAME_CLAIM, ROLES_CLAIM, ROLES_VERSION_CLAIM)
+        )
+
+    @staticmethod
+    def get_roles_changed_error() -> AuthenticationFailed:
+        return AuthenticationFailed(
+            _("User roles have changed, token must be refreshed"),
+            code="token_roles_changed",
+        )
+
+    def get_user(self, validated_token: Token) -> StatelessUser:
+        user = super().get_user(validated_token)
+
+        if not self.has_user_claims(validated_token):
+            raise self.get_roles_changed_error()
+
+        roles_version = get_user_roles_version(user_id=user.id)
+        if validated_token[ROLES_VERSION_CLAIM] != roles_version:
+            raise self.get_roles_changed_error()
+
+        return user
+
+    async def aget_user(self, validated_token: Token) -> StatelessUser:
+        """
+        Async variant of get_user, for async views
+        """
+        user = super().get_user(validated_token)
+
+        if not self.has_user_claims(validated_token):
+            raise self.get_roles_changed_error()
+
+        roles_version = await aget_user_roles_version(user_id=user.id)
+        if validated_token[ROLES_VERSION_CLAIM] != roles_version:
+            raise self.get_roles_changed_error()
+
+        return user
+
+    async def aauthenticate(self, request) -> Optional[Tuple[StatelessUser, Token]]:
+        """
+        Async variant of authenticate, for async views. Decoding the token does not touch
+        the database, only the check of the roles version may.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
@@ -0,0 +1,61 @@
+"""
+This file contains all the system checks of the settings the users module relies on
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+LOCAL_MEMORY_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+LOCAL_MEMORY_CACHE_HINT = (
+    "Set CACHE_BACKEND and RESPONSE_CACHE_BACKEND to a shared backend, e.g. "
+    "django.core.cache.backends.redis.RedisCache."
+)
+
+
+def _get_local_memory_caches() -> list:
+    return [
+        alias
+        for alias, cache in settings.CACHES.items()
+        if cache["BACKEND"] == LOCAL_MEMORY_CACHE_BACKEND
+    ]
+
+
+@register(Tags.caches)
+def check_caches_are_shared(app_configs, **kwargs):
+    """
+    This function is used to fail when several worker processes run with local memory
+    caches. Every process would keep its own roles, roles versions, roster versions and
+    response payloads, and the invalidations made by a process would not reach the others.
+    """
+    if settings.WORKER_PROCESSES <= 1:
+        return []
+
+    return [
+        Error(
+            f"The '{alias}' cache is a local memory cache, which is not shared by the "
+            f"{settings.WORKER_PROCESSES} worker processes.",
+            hint=LOCAL_MEMORY_CACHE_HINT,
+            id="users.E001",
+        )
+        for alias in _get_local_memory_caches()
+    ]
+
+
+@register(Tags.caches, deploy=True)
+def check_caches_are_shared_on_deploy(app_configs, **kwargs):
+    """
+    This function is used to warn about local memory caches on deploy, where
+    WEB_CONCURRENCY may not be set for the number of worker processes
+    """
+    if settings.WORKER_PROCESSES > 1:
+        return []
+
+    return [
+        Warning(
+            f"The '{alias}' cache is a local memory cache, which is only correct with a "
+            "single worker process.",
+            hint=LOCAL_MEMORY_CACHE_HINT,
+            id="users.W001",
+        )
+        for alias in _get_local_memory_caches()
+    ]
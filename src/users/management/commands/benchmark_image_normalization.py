@@ -0,0 +1,114 @@
+"""
+This command is used to measure the cost of the image normalization of the attendance
+images and profile photos: the time to normalize a synthetic camera sized JPEG and the
+size of the result per output format and max dimension, with and without the draft mode
+letting the JPEG decoder skip to a close scale.
+"""
+
+import time
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Iterator
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from PIL import Image, JpegImagePlugin
+
+from users.models import Profile
+from utils.images import normalize_image
+
+
+@contextmanager
+def without_draft() -> Iterator[None]:
+    """
+    This context manager is used to make the JPEG decoder decode every pixel
+    """
+    draft = JpegImagePlugin.JpegImageFile.draft
+    JpegImagePlugin.JpegImageFile.draft = lambda image, mode, size: None
+    try:
+        yield
+    finally:
+        JpegImagePlugin.JpegImageFile.draft = draft
+
+
+def get_camera_image(width: int, height: int) -> bytes:
+    """
+    This function is used to build a JPEG of gradients and noise, which compresses about
+    like a photo unlike flat colors or pure noise
+    """
+    size = (width, height)
+    image = Image.merge(
+        "RGB",
+        (
+            Image.linear_gradient("L").resize(size),
+            Image.radial_gradient("L").resize(size),
+            Image.effect_noise(size, 48),
+        ),
+    )
+    content = BytesIO()
+    image.save(content, format="JPEG", quality=92)
+    return content.getvalue()
+
+
+class Command(BaseCommand):
+    help = "Measure the time and output size of the image normalization"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--image-size",
+            type=int,
+            nargs=2,
+            default=(4032, 3024),
+            metavar=("WIDTH", "HEIGHT"),
+            help="Size of the uploaded JPEG, defaults to a 12 MP camera",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=10, help="Number of normalizations to time"
+        )
+
+    def handle(self, *args, **options):
+        image = get_camera_image(*options["image_size"])
+        # (name, max dimension, output format) of the normalizations to measure
+        targets = [
+            ("attendance JPEG", settings.IMAGE_MAX_DIMENSION, "JPEG"),
+            ("attendance WebP", settings.IMAGE_MAX_DIMENSION, "WEBP"),
+            ("profile photo", Profile.PHOTO_MAX_DIMENSION, settings.IMAGE_FORMAT),
+        ]
+        self.stdout.write(
+            f"Uploaded JPEG of {options['image_size'][0]}x{options['image_size'][1]}: "
+            f"{len(image) / 1024:.0f} KB, quality {settings.IMAGE_QUALITY}"
+        )
+        self.stdout.write("Target: ms per image without -> with draft, output size")
+        for name, max_dimension, output_format in targets:
+            with without_draft():
+                full_duration, _ = self.time_normalization(
+                    image=image,
+                    max_dimension=max_dimension,
+                    output_format=output_format,
+                    repeat=options["repeat"],
+                )
+            draft_duration, size = self.time_normalization(
+                image=image,
+                max_dimension=max_dimension,
+                output_format=output_format,
+                repeat=options["repeat"],
+            )
+            self.stdout.write(
+                f"{name} ({max_dimension} px): {full_duration * 1000:.0f} -> "
+                f"{draft_duration * 1000:.0f} ms, {size / 1024:.0f} KB "
+                f"({size / len(image):.1%} of the upload)"
+            )
+
+    @staticmethod
+    def time_normalization(image, max_dimension, output_format, repeat):
+        started_at = time.perf_counter()
+        for _ in range(repeat):
+            content, _ = normalize_image(
+                content=ContentFile(image),
+                max_dimension=max_dimension,
+                quality=settings.IMAGE_QUALITY,
+                output_format=output_format,
+            )
+        duration = (time.perf_counter() - started_at) / repeat
+        return duration, content.size
@@ -0,0 +1,103 @@
+"""
+This command is used to count the queries run per request by the roster and attendance
+APIs of a manager and a staff member, with cold and warm caches, and how many of them
+resolve roles
+"""
+
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.utils.timezone import localdate
+
+from attendance.models import Attendance
+from users.models import User
+from users.tokens import get_token_for_user
+from utils.query_budget import count_queries
+
+ROLE_TABLE = '"users_userrole"'
+
+
+class Command(BaseCommand):
+    help = "Count the queries per request of the roster and attendance APIs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("manager_email", help="Email of a manager with rosters")
+        parser.add_argument(
+            "staff_member_email", help="Email of a staff member with schedules"
+        )
+
+    def handle(self, *args, **options):
+        users = {
+            user.email: user
+            for user in User.objects.filter(
+                email__in=(options["manager_email"], options["staff_member_email"])
+            )
+        }
+        for email in (options["manager_email"], options["staff_member_email"]):
+            if email not in users:
+                raise CommandError(f"User {email} does not exist")
+
+        manager = users[options["manager_email"]]
+        staff_member = users[options["staff_member_email"]]
+        today = localdate()
+        # (name, user, path) of the requests to count
+        apis = [
+            ("roster list", manager, "/rosters/list/"),
+            ("schedule conflict list", manager, "/rosters/users/schedules/conflicts/"),
+            ("on shift list", manager, "/rosters/users/schedules/on-shift/"),
+            (
+                "shift occurrence list",
+                manager,
+                f"/rosters/shifts/?start_date={today}&end_date={today}",
+            ),
+            (
+                "attendance report",
+                manager,
+                f"/attendance/report/?start_date={today - timedelta(days=6)}"
+                f"&end_date={today}",
+            ),
+            ("schedule list", staff_member, "/rosters/users/schedules/list/"),
+        ]
+        attendance = (
+            Attendance.alive.filter(roster_user_schedule__user_id=staff_member.id)
+            .order_by("-id")
+            .first()
+        )
+        if attendance:
+            apis.append(
+                ("attendance retrieve", staff_member, f"/attendance/{attendance.id}/")
+            )
+
+        tokens = {
+            user.id: get_token_for_user(user=user) for user in (manager, staff_member)
+        }
+        self.stdout.write("API: queries (role queries) with cold caches -> warm caches")
+        for name, user, path in apis:
+            client = Client(
+                headers={"Authorization": f"Bearer {tokens[user.id].access_token}"}
+            )
+            for alias in caches:
+                caches[alias].clear()
+            cold_queries = self.count_request_queries(client=client, path=path)
+            warm_queries = self.count_request_queries(client=client, path=path)
+            self.stdout.write(
+                f"{name}: {len(cold_queries)} ({self.count_role_queries(cold_queries)})"
+                f" -> {len(warm_queries)} ({self.count_role_queries(warm_queries)})"
+            )
+
+    @staticmethod
+    def count_request_queries(client, path):
+        with count_queries() as counter:
+            response = client.get(path)
+            if response.streaming:
+                # Streamed rows are queried while the content is consumed
+                b"".join(response.streaming_content)
+        if response.status_code != 200:
+            raise CommandError(f"{path} answered {response.status_code}")
+        return counter.queries
+
+    @staticmethod
+    def count_role_queries(queries):
+        return sum(ROLE_TABLE in sql for sql in queries)
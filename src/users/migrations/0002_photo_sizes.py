@@ -0,0 +1,48 @@
+# Generated by Django 4.2.11 on 2026-10-17 12:01
+
+import django.core.validators
+from django.db import migrations, models
+
+import utils.files
+import utils.images
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="photo_original_size",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="photo_size",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="profile",
+            name="photo",
+            field=utils.images.NormalizedImageField(
+                blank=True,
+                max_dimension=512,
+                null=True,
+                original_size_field="photo_original_size",
+                size_field="photo_size",
+                storage=utils.files.get_file_storage,
+                upload_to=utils.files.RenameFile(
+                    "files/profiles/{instance.user_id}/photo.{extension}"
+                ),
+                validators=[
+                    utils.files.ValidateFileSize(max_file_size=5),
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=("jpeg", "png", "jpg", "webp")
+                    ),
+                ],
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-17 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_photo_sizes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userrole",
+            index=models.Index(
+                condition=models.Q(("date_deleted__isnull", True)),
+                fields=["user", "role"],
+                name="user_role_alive_user_idx",
+            ),
+        ),
+    ]
@@ -2,16 +2,26 @@
 This file contains all the models for users module
 """
 
+from typing import Optional
+
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import FileExtensionValidator
 from django.db import models
 from phonenumber_field.modelfields import PhoneNumberField
 
-from utils.files import FILE_STORAGE, RenameFile, ValidateFileSize
+from utils.files import RenameFile, ValidateFileSize, get_file_storage
+from utils.images import NormalizedImageField
 from utils.models import BaseModel
 
 
+def get_full_name(first_name: str, last_name: Optional[str]) -> str:
+    """
+    This function is used to build the full name of a user from their name fields
+    """
+    return (first_name.strip() + " " + (last_name or "").strip()).rstrip()
+
+
 class UserManager(BaseUserManager):
     def create_user(self, email, first_name, password, **kwargs):
         email = self.normalize_email(email=email)
@@ -51,7 +61,7 @@ class User(AbstractUser):
 
     @property
     def full_name(self):
-        return (self.first_name.strip() + " " + (self.last_name or "").strip()).rstrip()
+        return get_full_name(first_name=self.first_name, last_name=self.last_name)
 
 
 class Profile(BaseModel):
@@ -61,18 +71,27 @@ class Profile(BaseModel):
 
     MAX_FILE_SIZE_ALLOWED = 5  # MB
     EXTENSIONS_ALLOWED = ("jpeg", "png", "jpg")
+    # Normalized images are stored as JPEG or WebP
+    STORED_EXTENSIONS_ALLOWED = EXTENSIONS_ALLOWED + ("webp",)
+    PHOTO_MAX_DIMENSION = 512  # px
 
     user = models.OneToOneField(User, on_delete=models.CASCADE)
-    photo = models.ImageField(
-        storage=FILE_STORAGE,
+    photo = NormalizedImageField(
+        storage=get_file_storage,
         upload_to=RenameFile("files/profiles/{instance.user_id}/photo.{extension}"),
+        max_dimension=PHOTO_MAX_DIMENSION,
+        original_size_field="photo_original_size",
+        size_field="photo_size",
         validators=[
             ValidateFileSize(max_file_size=MAX_FILE_SIZE_ALLOWED),
-            FileExtensionValidator(allowed_extensions=EXTENSIONS_ALLOWED),
+            FileExtensionValidator(allowed_extensions=STORED_EXTENSIONS_ALLOWED),
         ],
         null=True,
         blank=True,
     )
+    # Byte counts of the uploaded and of the stored (normalized) photo
+    photo_original_size = models.PositiveIntegerField(null=True, blank=True)
+    photo_size = models.PositiveIntegerField(null=True, blank=True)
     phone_number = PhoneNumberField()
 
     def __str__(self):
@@ -106,3 +125,10 @@ class UserRole(BaseModel):
                 fields=["user", "role"], name="user_role_unique_constraint"
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["user", "role"],
+                name="user_role_alive_user_idx",
+                condition=models.Q(date_deleted__isnull=True),
+            )
+        ]
@@ -5,21 +5,18 @@ This file contains all the permissions related to users module
 from rest_framework.permissions import IsAuthenticated
 
 from users.models import UserRole
+from users.roles import has_role
 
 
 class IsManager(IsAuthenticated):
     def has_permission(self, request, view):
-        return (
-            super().has_permission(request, view)
-            and request.user.userrole_set.filter(role=UserRole.Role.MANAGER).exists()
+        return super().has_permission(request, view) and has_role(
+            user=request.user, role=UserRole.Role.MANAGER
         )
 
 
 class IsStaffMember(IsAuthenticated):
     def has_permission(self, request, view):
-        return (
-            super().has_permission(request, view)
-            and request.user.userrole_set.filter(
-                role=UserRole.Role.STAFF_MEMBER
-            ).exists()
+        return super().has_permission(request, view) and has_role(
+            user=request.user, role=UserRole.Role.STAFF_MEMBER
         )
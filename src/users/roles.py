@@ -0,0 +1,209 @@
+"""
+This file contains all the utils related to resolving roles of a user
+"""
+
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from hashlib import md5
+from typing import Any, FrozenSet, Iterator, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from users.models import UserRole
+
+USER_ROLES_CACHE_KEY = "users:roles:{user_id}"
+USER_ROLES_VERSION_CACHE_KEY = "users:roles-version:{user_id}"
+
+
+class RoleCheck(NamedTuple):
+    user_id: Optional[int]
+    role: int
+    message: str
+    # Object the check was made for, e.g. the instance being validated
+    key: Any = None
+
+
+# Role checks collected by the innermost deferred_role_validation block
+_deferred_role_checks: ContextVar[Optional[List[RoleCheck]]] = ContextVar(
+    "deferred_role_checks", default=None
+)
+
+
+def get_user_roles(user) -> FrozenSet[int]:
+    """
+    This function is used to get the active roles of a user. Roles are memoised on the
+    user object for the rest of the request and cached in the django cache across requests.
+    """
+    roles = getattr(user, "_active_roles", None)
+    if roles is not None:
+        return roles
+
+    cache_key = USER_ROLES_CACHE_KEY.format(user_id=user.id)
+    roles = cache.get(cache_key)
+    if roles is None:
+        roles = frozenset(
+            UserRole.alive.filter(user_id=user.id).values_list("role", flat=True)
+        )
+        cache.set(cache_key, roles, timeout=settings.USER_ROLES_CACHE_TIMEOUT)
+
+    user._active_roles = roles
+    return roles
+
+
+async def aget_user_roles(user) -> FrozenSet[int]:
+    """
+    Async variant of get_user_roles, for async views
+    """
+    roles = getattr(user, "_active_roles", None)
+    if roles is not None:
+        return roles
+
+    cache_key = USER_ROLES_CACHE_KEY.format(user_id=user.id)
+    roles = await cache.aget(cache_key)
+    if roles is None:
+        roles = frozenset(
+            [
+                role
+                async for role in UserRole.alive.filter(user_id=user.id).values_list(
+                    "role", flat=True
+                )
+            ]
+        )
+        await cache.aset(cache_key, roles, timeout=settings.USER_ROLES_CACHE_TIMEOUT)
+
+    user._active_roles = roles
+    return roles
+
+
+def has_role(user, role: int) -> bool:
+    """
+    This function is used to check whether a user has given active role
+    """
+    return role in get_user_roles(user)
+
+
+def _get_user_roles_queryset(user_id: int):
+    return (
+        UserRole.objects.filter(user_id=user_id)
+        .order_by("id")
+        .values_list("id", "role", "date_updated", "date_deleted")
+    )
+
+
+def _hash_user_roles(rows: List[tuple]) -> str:
+    return md5(str(rows).encode()).hexdigest()
+
+
+def get_user_roles_version(user_id: int) -> str:
+    """
+    This function is used to get the current version of the roles of a user. The version is
+    derived from the role rows, so it is the same in every worker and changes with the roles.
+    """
+    cache_key = USER_ROLES_VERSION_CACHE_KEY.format(user_id=user_id)
+    version = cache.get(cache_key)
+    if version is None:
+        version = _hash_user_roles(rows=list(_get_user_roles_queryset(user_id=user_id)))
+        cache.set(cache_key, version, timeout=settings.USER_ROLES_VERSION_CACHE_TIMEOUT)
+
+    return version
+
+
+async def aget_user_roles_version(user_id: int) -> str:
+    """
+    Async variant of get_user_roles_version, for async views
+    """
+    cache_key = USER_ROLES_VERSION_CACHE_KEY.format(user_id=user_id)
+    version = await cache.aget(cache_key)
+    if version is None:
+        version = _hash_user_roles(
+            rows=[row async for row in _get_user_roles_queryset(user_id=user_id)]
+        )
+        await cache.aset(
+            cache_key, version, timeout=settings.USER_ROLES_VERSION_CACHE_TIMEOUT
+        )
+
+    return version
+
+
+def invalidate_user_roles(user_id: int) -> None:
+    """
+    This function is used to drop the cached roles and roles version of a user
+    """
+    cache.delete_many(
+        [
+            USER_ROLES_CACHE_KEY.format(user_id=user_id),
+            USER_ROLES_VERSION_CACHE_KEY.format(user_id=user_id),
+        ]
+    )
+
+
+def validate_role(user_id: int, role: int, message: str, key: Any = None) -> None:
+    """
+    This function is used to validate that a user has given active role, raising
+    ValidationError with the message otherwise. Inside deferred_role_validation the check
+    is only collected and resolved, with the other checks of the block, when it exits.
+    """
+    deferred_role_checks = _deferred_role_checks.get()
+    if deferred_role_checks is not None:
+        deferred_role_checks.append(
+            RoleCheck(user_id=user_id, role=role, message=message, key=key)
+        )
+        return
+
+    if not UserRole.alive.filter(user_id=user_id, role=role).exists():
+        raise ValidationError(message)
+
+
+def get_failed_role_checks(role_checks: List[RoleCheck]) -> List[RoleCheck]:
+    """
+    This function is used to resolve role checks with one query, returns the failed ones
+    """
+    if not role_checks:
+        return []
+
+    granted_roles = set(
+        UserRole.alive.filter(
+            user_id__in={check.user_id for check in role_checks},
+            role__in={check.role for check in role_checks},
+        ).values_list("user_id", "role")
+    )
+    return [
+        check
+        for check in role_checks
+        if (check.user_id, check.role) not in granted_roles
+    ]
+
+
+@contextmanager
+def deferred_role_validation(raise_errors: bool = True) -> Iterator[List[RoleCheck]]:
+    """
+    This context manager is used to resolve the role checks of all the instances validated
+    or saved inside it with one query when the block exits, instead of one query per instance.
+
+    By default the block runs in a transaction and when a check fails its ValidationError,
+    the same a single save raises, is raised on exit and nothing saved inside the block is
+    kept. Nested blocks join the outermost one.
+
+    With raise_errors=False nothing is raised, the failed checks are added to the list the
+    block yields on exit, for batch validators to report them against the rows (keys) they
+    belong to. Such a block always resolves its own checks.
+    """
+    failed_role_checks: List[RoleCheck] = []
+    if raise_errors and _deferred_role_checks.get() is not None:
+        yield failed_role_checks
+        return
+
+    deferred_role_checks: List[RoleCheck] = []
+    with transaction.atomic() if raise_errors else nullcontext():
+        token = _deferred_role_checks.set(deferred_role_checks)
+        try:
+            yield failed_role_checks
+        finally:
+            _deferred_role_checks.reset(token)
+
+        failed_role_checks.extend(get_failed_role_checks(deferred_role_checks))
+        if raise_errors and failed_role_checks:
+            raise ValidationError(failed_role_checks[0].message)
@@ -0,0 +1,18 @@
+"""
+This file contains all the signal receivers for users module
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import UserRole
+from users.roles import invalidate_user_roles
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def invalidate_user_roles_on_change(sender, instance, **kwargs):
+    """
+    Cached roles are dropped whenever a user role is saved, soft deleted or deleted
+    """
+    invalidate_user_roles(user_id=instance.user_id)
@@ -0,0 +1,112 @@
+"""
+This file contains all the tests of the async variant of the token refresh API
+"""
+
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.apis.auth import AsyncUserRefreshAPI, UserRefreshAPI
+from users.models import UserRole
+from users.tokens import get_token_for_user
+from utils.testing import (
+    AsyncViewsTestMixin,
+    QueryBudgetTestCase,
+    create_user,
+    get_json,
+)
+
+REFRESH_PATH = "/users/login/refresh/"
+# Claims differing between two access tokens of the same refresh token
+TOKEN_TIME_CLAIMS = ("jti", "iat", "exp")
+
+
+class AsyncUserRefreshAPITest(AsyncViewsTestMixin, TestCase):
+    def setUp(self):
+        self.user = create_user(email="staff@test.com", role=UserRole.Role.STAFF_MEMBER)
+        self.refresh_token = str(get_token_for_user(user=self.user))
+
+    def get_claims(self, response) -> dict:
+        claims = dict(AccessToken(get_json(response)["data"]["access_token"]).payload)
+        for claim in TOKEN_TIME_CLAIMS:
+            claims.pop(claim)
+        return claims
+
+    def send_requests(self, cookies, status_code):
+        """
+        Sends the same refresh request to the sync and async views, returns their responses
+        """
+        sync_response = self.send_sync_request(
+            view_class=UserRefreshAPI, path=REFRESH_PATH, cookies=cookies
+        )
+        async_response = self.send_async_request(path=REFRESH_PATH, cookies=cookies)
+
+        self.assertEqual(sync_response.status_code, status_code)
+        self.assertEqual(async_response.status_code, status_code)
+        return sync_response, async_response
+
+    def assertSameErrors(self, cookies, status_code):
+        sync_response, async_response = self.send_requests(
+            cookies=cookies, status_code=status_code
+        )
+        self.assertEqual(get_json(async_response), get_json(sync_response))
+
+    def test_url_serves_the_async_view(self):
+        response = self.send_async_request(path=REFRESH_PATH)
+
+        self.assertIs(response.resolver_match.func.view_class, AsyncUserRefreshAPI)
+
+    def test_refresh_matches_the_sync_view(self):
+        sync_response, async_response = self.send_requests(
+            cookies={"refresh_token": self.refresh_token}, status_code=200
+        )
+
+        self.assertEqual(
+            self.get_claims(async_response), self.get_claims(sync_response)
+        )
+        self.assertEqual(
+            self.get_claims(async_response)["roles"], [UserRole.Role.STAFF_MEMBER]
+        )
+
+    def test_refresh_picks_up_role_changes(self):
+        UserRole.objects.create(user=self.user, role=UserRole.Role.MANAGER)
+
+        sync_response, async_response = self.send_requests(
+            cookies={"refresh_token": self.refresh_token}, status_code=200
+        )
+
+        self.assertEqual(
+            self.get_claims(async_response), self.get_claims(sync_response)
+        )
+        self.assertEqual(
+            sorted(self.get_claims(async_response)["roles"]),
+            [UserRole.Role.MANAGER, UserRole.Role.STAFF_MEMBER],
+        )
+
+    def test_invalid_refresh_tokens_match_the_sync_view(self):
+        self.assertSameErrors(cookies={}, status_code=400)
+        self.assertSameErrors(cookies={"refresh_token": "invalid"}, status_code=400)
+
+    def test_blacklisted_refresh_token_matches_the_sync_view(self):
+        token = get_token_for_user(user=self.user)
+        token.blacklist()
+
+        self.assertSameErrors(cookies={"refresh_token": str(token)}, status_code=400)
+
+    def test_inactive_user_matches_the_sync_view(self):
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertSameErrors(
+            cookies={"refresh_token": self.refresh_token}, status_code=401
+        )
+
+
+class AsyncUserRefreshAPIQueryBudgetTest(AsyncViewsTestMixin, QueryBudgetTestCase):
+    def test_refresh(self):
+        user = create_user(email="staff@test.com", role=UserRole.Role.STAFF_MEMBER)
+        cookies = {"refresh_token": str(get_token_for_user(user=user))}
+
+        self.assertWithinQueryBudget(
+            lambda: self.send_async_request(path=REFRESH_PATH, cookies=cookies),
+            status_code=200,
+        )
@@ -0,0 +1,43 @@
+"""
+This file contains all the tests related to the authentication APIs
+"""
+
+from django.test import TestCase
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from rest_framework.test import APIClient
+
+from users.constants import TOKEN_IS_ALREADY_BLACK_LISTED, USER_LOGGED_OUT_SUCCESSFULLY
+from users.models import UserRole
+from utils.testing import TEST_USER_PASSWORD, create_user
+
+
+class UserLogoutAPITest(TestCase):
+    def setUp(self):
+        self.user = create_user(email="staff@test.com", role=UserRole.Role.STAFF_MEMBER)
+        self.client = APIClient()
+        response = self.client.post(
+            "/users/login/",
+            {"email": self.user.email, "password": TEST_USER_PASSWORD},
+            format="json",
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_logout_blacklists_the_refresh_token_of_login(self):
+        response = self.client.get("/users/login/refresh/")
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+        response = self.client.post("/users/logout/")
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            response.json()["data"], {"message": USER_LOGGED_OUT_SUCCESSFULLY}
+        )
+
+        response = self.client.get("/users/login/refresh/")
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["errors"], {"message": "Token is blacklisted"})
+
+        response = self.client.post("/users/logout/")
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["errors"], {"message": TOKEN_IS_ALREADY_BLACK_LISTED}
+        )
@@ -0,0 +1,50 @@
+"""
+This file contains all the tests of the system checks of the cache settings
+"""
+
+from django.test import SimpleTestCase, override_settings
+
+from users.checks import (
+    LOCAL_MEMORY_CACHE_BACKEND,
+    check_caches_are_shared,
+    check_caches_are_shared_on_deploy,
+)
+
+REDIS_CACHE_BACKEND = "django.core.cache.backends.redis.RedisCache"
+
+
+def get_caches(default_backend: str, responses_backend: str) -> dict:
+    return {
+        "default": {"BACKEND": default_backend},
+        "responses": {"BACKEND": responses_backend, "LOCATION": "responses"},
+    }
+
+
+class CacheChecksTest(SimpleTestCase):
+    def get_ids(self, check) -> list:
+        return [message.id for message in check(app_configs=None)]
+
+    def test_local_memory_caches_fail_with_several_worker_processes(self):
+        with override_settings(
+            WORKER_PROCESSES=4,
+            CACHES=get_caches(LOCAL_MEMORY_CACHE_BACKEND, REDIS_CACHE_BACKEND),
+        ):
+            self.assertEqual(self.get_ids(check_caches_are_shared), ["users.E001"])
+            self.assertEqual(self.get_ids(check_caches_are_shared_on_deploy), [])
+
+        with override_settings(
+            WORKER_PROCESSES=4,
+            CACHES=get_caches(REDIS_CACHE_BACKEND, REDIS_CACHE_BACKEND),
+        ):
+            self.assertEqual(self.get_ids(check_caches_are_shared), [])
+
+    def test_local_memory_caches_only_warn_on_deploy_with_one_worker_process(self):
+        with override_settings(
+            WORKER_PROCESSES=1,
+            CACHES=get_caches(LOCAL_MEMORY_CACHE_BACKEND, LOCAL_MEMORY_CACHE_BACKEND),
+        ):
+            self.assertEqual(self.get_ids(check_caches_are_shared), [])
+            self.assertEqual(
+                self.get_ids(check_caches_are_shared_on_deploy),
+                ["users.W001", "users.W001"],
+            )
@@ -0,0 +1,15 @@
+"""
+This file contains all the tests of the partial indexes of the alive rows of users models
+"""
+
+from django.test import TestCase
+
+from users.models import UserRole
+from utils.testing import explain
+
+
+class AliveIndexesTest(TestCase):
+    def test_roles_of_a_user_use_the_alive_index(self):
+        plan = explain(UserRole.alive.filter(user_id=1).values_list("role", flat=True))
+
+        self.assertIn("user_role_alive_user_idx", plan)
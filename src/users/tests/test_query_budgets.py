@@ -0,0 +1,41 @@
+"""
+This file contains all the tests of the query budgets of the users APIs
+"""
+
+from rest_framework.test import APIClient
+
+from users.models import UserRole
+from users.tokens import get_token_for_user
+from utils.testing import TEST_USER_PASSWORD, QueryBudgetTestCase, create_user
+
+
+class UserQueryBudgetTest(QueryBudgetTestCase):
+    def setUp(self):
+        self.user = create_user(email="staff@test.com", role=UserRole.Role.STAFF_MEMBER)
+
+    def get_client_with_refresh_token(self) -> APIClient:
+        client = APIClient()
+        client.cookies["refresh_token"] = str(get_token_for_user(user=self.user))
+        return client
+
+    def test_login(self):
+        self.assertWithinQueryBudget(
+            lambda: APIClient().post(
+                "/users/login/",
+                {"email": self.user.email, "password": TEST_USER_PASSWORD},
+                format="json",
+            ),
+            status_code=200,
+        )
+
+    def test_refresh(self):
+        client = self.get_client_with_refresh_token()
+        self.assertWithinQueryBudget(
+            lambda: client.get("/users/login/refresh/"), status_code=200
+        )
+
+    def test_logout(self):
+        self.assertWithinQueryBudget(
+            lambda: self.get_client_with_refresh_token().post("/users/logout/"),
+            status_code=200,
+        )
@@ -0,0 +1,127 @@
+"""
+This file contains all the utils related to JWT tokens of a user
+"""
+
+from typing import Any, Dict
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken, Token
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from users.models import User
+from users.roles import (
+    aget_user_roles,
+    aget_user_roles_version,
+    get_user_roles,
+    get_user_roles_version,
+)
+
+FULL_NAME_CLAIM = "full_name"
+ROLES_CLAIM = "roles"
+ROLES_VERSION_CLAIM = "roles_version"
+
+
+def add_user_claims(token: Token, user: User) -> Token:
+    """
+    This function is used to embed the user details needed by the APIs into the token, so
+    that authenticated requests do not have to load the user from the database
+    """
+    token[FULL_NAME_CLAIM] = user.full_name
+    token[ROLES_CLAIM] = sorted(get_user_roles(user=user))
+    token[ROLES_VERSION_CLAIM] = get_user_roles_version(user_id=user.id)
+    return token
+
+
+async def aadd_user_claims(token: Token, user: User) -> Token:
+    """
+    Async variant of add_user_claims, for async views
+    """
+    token[FULL_NAME_CLAIM] = user.full_name
+    token[ROLES_CLAIM] = sorted(await aget_user_roles(user=user))
+    token[ROLES_VERSION_CLAIM] = await aget_user_roles_version(user_id=user.id)
+    return token
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user claims. It is added to the outstanding token list with
+    its claims, so that the token stored is the one the client holds and logout finds it.
+    """
+
+    @classmethod
+    def for_user(cls, user: User) -> "UserRefreshToken":
+        # BlacklistMixin.for_user would store the token before the claims are added
+        token = add_user_claims(
+            token=super(BlacklistMixin, cls).for_user(user), user=user
+        )
+        OutstandingToken.objects.create(
+            user=user,
+            jti=token[api_settings.JTI_CLAIM],
+            token=str(token),
+            created_at=token.current_time,
+            expires_at=datetime_from_epoch(token["exp"]),
+        )
+        return token
+
+
+def get_token_for_user(user: User) -> RefreshToken:
+    """
+    This function is used to create a refresh token (and its access token) for a user
+    """
+    return UserRefreshToken.for_user(user)
+
+
+class UnverifiedBlacklistRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist check, a database query, is left to the caller, so that
+    async callers can run it with the async ORM
+    """
+
+    def check_blacklist(self) -> None:
+        pass
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refreshes the access token with the current details of the user, so that role changes
+    are picked up on refresh
+    """
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, str]:
+        refresh = self.token_class(attrs["refresh"])
+
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}
+        ).first()
+        if not user or not user.is_active:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        add_user_claims(token=refresh, user=user)
+        return {"access": str(refresh.access_token)}
+
+    async def avalidate(self, attrs: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Async variant of validate, for async views. Raises TokenError or
+        AuthenticationFailed when the refresh token or its user is not valid.
+        """
+        refresh = UnverifiedBlacklistRefreshToken(attrs["refresh"])
+        if await BlacklistedToken.objects.filter(
+            token__jti=refresh[api_settings.JTI_CLAIM]
+        ).aexists():
+            raise TokenError(_("Token is blacklisted"))
+
+        user = await User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}
+        ).afirst()
+        if not user or not user.is_active:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        await aadd_user_claims(token=refresh, user=user)
+        return {"access": str(refresh.access_token)}
@@ -2,12 +2,19 @@
 This file contains all the urls used for users module
 """
 
+from django.conf import settings
 from django.urls import path
 
 from users.apis import auth
 
 urlpatterns = [
     path("login/", auth.UserLoginAPI.as_view(), name="user-login"),
-    path("login/refresh/", auth.UserRefreshAPI.as_view(), name="user-login-refresh"),
+    path(
+        "login/refresh/",
+        (
+            auth.AsyncUserRefreshAPI if settings.ASYNC_VIEWS else auth.UserRefreshAPI
+        ).as_view(),
+        name="user-login-refresh",
+    ),
     path("logout/", auth.UserLogoutAPI.as_view(), name="user_logout"),
 ]
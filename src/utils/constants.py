@@ -7,3 +7,7 @@ DATE_CANNOT_BE_IN_PAST = "{date_field} cannot be in past"
 VARIABLE_MUST_BE_INSTANCE = "{variable} must be an instance of {model}"
 AT_LEAST_ONE_FIELD_MUST_BE_UPDATED = "At least one field must be updated"
 OBJECT_DELETED_SUCCESSFULLY = "{object} deleted successfully"
+OBJECT_RESTORED_SUCCESSFULLY = "{object} restored successfully"
+FILE_SIZE_LIMIT_EXCEEDED = "Max file size limit is {max_file_size} MB."
+UNSUPPORTED_IMAGE_TYPE = "Only JPEG and PNG images are allowed."
+INVALID_IMAGE = "Upload a valid image. The file uploaded was either not an image or a corrupted image."
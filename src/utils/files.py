@@ -8,7 +8,19 @@ from django.core.files import File
 from django.core.files.storage import FileSystemStorage
 from django.utils.deconstruct import deconstructible
 
+from utils.storages import ContentAddressedStorage
+
 FILE_STORAGE = FileSystemStorage(location=settings.BASE_DIR)
+CONTENT_ADDRESSED_STORAGE = ContentAddressedStorage(location=settings.BASE_DIR)
+
+
+# Used as callable storages so that migrations reference them instead of their location
+def get_file_storage() -> FileSystemStorage:
+    return FILE_STORAGE
+
+
+def get_content_addressed_storage() -> ContentAddressedStorage:
+    return CONTENT_ADDRESSED_STORAGE
 
 
 @deconstructible
@@ -0,0 +1,99 @@
+"""
+This file contains all the utils related to images
+"""
+
+import os
+from io import BytesIO
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.db.models.fields.files import ImageField, ImageFieldFile
+from PIL import Image, ImageOps
+
+from utils.constants import INVALID_IMAGE
+
+# Extension of the normalized images per output format
+IMAGE_FORMAT_EXTENSIONS = {"JPEG": "jpg", "WEBP": "webp"}
+
+
+def normalize_image(
+    content, max_dimension: int, quality: int, output_format: str
+) -> Tuple[ContentFile, str]:
+    """
+    Re-encodes an image to the output format, downscaled to fit in max_dimension x
+    max_dimension pixels. The EXIF orientation is applied to the pixels and the metadata is
+    not written back. Returns the encoded image and its extension.
+    """
+    content.seek(0)
+    try:
+        image = Image.open(content)
+        # Lets the JPEG decoder skip straight to a close scale instead of decoding every pixel
+        image.draft("RGB", (max_dimension, max_dimension))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        output = BytesIO()
+        image.save(output, format=output_format, quality=quality, optimize=True)
+    except (OSError, SyntaxError, Image.DecompressionBombError) as error:
+        raise ValidationError(INVALID_IMAGE) from error
+
+    return ContentFile(output.getvalue()), IMAGE_FORMAT_EXTENSIONS[output_format]
+
+
+class NormalizedImageFieldFile(ImageFieldFile):
+    def save(self, name, content, save=True):
+        field = self.field
+        original_size = content.size
+        if settings.IMAGE_NORMALIZATION:
+            content, extension = normalize_image(
+                content=content,
+                max_dimension=field.max_dimension or settings.IMAGE_MAX_DIMENSION,
+                quality=field.quality or settings.IMAGE_QUALITY,
+                output_format=settings.IMAGE_FORMAT,
+            )
+            name = f"{os.path.splitext(name)[0]}.{extension}"
+
+        if field.original_size_field:
+            setattr(self.instance, field.original_size_field, original_size)
+        if field.size_field:
+            setattr(self.instance, field.size_field, content.size)
+        super().save(name, content, save)
+
+
+class NormalizedImageField(ImageField):
+    """
+    Image field normalizing the images with `normalize_image` when they are saved, see the
+    IMAGE_* settings. Like width_field and height_field, original_size_field and size_field
+    name the fields storing the byte counts of the uploaded and the stored images.
+    """
+
+    attr_class = NormalizedImageFieldFile
+
+    def __init__(
+        self,
+        *args,
+        max_dimension: Optional[int] = None,
+        quality: Optional[int] = None,
+        original_size_field: Optional[str] = None,
+        size_field: Optional[str] = None,
+        **kwargs,
+    ):
+        self.max_dimension, self.quality = max_dimension, quality
+        self.original_size_field, self.size_field = original_size_field, size_field
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        for attribute in (
+            "max_dimension",
+            "quality",
+            "original_size_field",
+            "size_field",
+        ):
+            if getattr(self, attribute):
+                kwargs[attribute] = getattr(self, attribute)
+        return name, path, args, kwargs
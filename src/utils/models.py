@@ -7,6 +7,49 @@ from django.db import models
 from django.utils.timezone import now
 
 
+class SoftDeleteQuerySet(models.QuerySet):
+    """
+    Queryset of the models having a date_deleted field, rows are soft deleted by setting it
+    """
+
+    def alive(self) -> "SoftDeleteQuerySet":
+        return self.filter(date_deleted__isnull=True)
+
+    def deleted(self) -> "SoftDeleteQuerySet":
+        return self.filter(date_deleted__isnull=False)
+
+    def soft_delete(self, deleted_by=None, date_deleted=None) -> int:
+        """
+        This function is used to soft delete the alive rows of the queryset with one query,
+        returns the number of rows deleted. Rows deleted together can share date_deleted to
+        be restored together.
+        """
+        date_deleted = date_deleted or now()
+        fields = {"date_deleted": date_deleted, "date_updated": date_deleted}
+        if deleted_by is not None:
+            fields["updated_by"] = deleted_by
+        return self.alive().update(**fields)
+
+    def restore(self, restored_by=None) -> int:
+        """
+        This function is used to restore the soft deleted rows of the queryset with one query,
+        returns the number of rows restored
+        """
+        fields = {"date_deleted": None, "date_updated": now()}
+        if restored_by is not None:
+            fields["updated_by"] = restored_by
+        return self.deleted().update(**fields)
+
+
+class AliveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """
+    Manager of the rows which are not soft deleted
+    """
+
+    def get_queryset(self) -> SoftDeleteQuerySet:
+        return super().get_queryset().alive()
+
+
 class BaseModel(models.Model):
     """
     This abstract model is used to add log fields in other models.
@@ -44,6 +87,11 @@ class BaseModel(models.Model):
     date_updated = models.DateTimeField(auto_now=True)
     date_deleted = models.DateTimeField(null=True, blank=True)
 
+    # objects stays the default manager and, like all_objects, includes soft deleted rows
+    objects = SoftDeleteQuerySet.as_manager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+    alive = AliveManager()
+
     def save(self, *args, **kwargs):
         skip_clean = kwargs.pop("skip_clean", False)
         if not skip_clean:
@@ -0,0 +1,105 @@
+"""
+This file contains all the utils related to pagination
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from utils.constants import INVALID_FIELD_VALUE
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(date_created: datetime, id: int) -> str:
+    """
+    This function is used to encode the position of a row into an opaque cursor
+    """
+    return urlsafe_b64encode(
+        json.dumps([date_created.isoformat(), id]).encode()
+    ).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    This function is used to decode an opaque cursor into the position of a row.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        date_created, id = json.loads(urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(date_created), int(id)
+    except (TypeError, ValueError) as error:
+        raise ValueError(str(error))
+
+
+def _seek_by_keyset(
+    queryset: QuerySet, cursor: Optional[Tuple[datetime, int]], page_size: int
+) -> QuerySet:
+    queryset = queryset.order_by("-date_created", "-id")
+    if cursor:
+        date_created, id = cursor
+        queryset = queryset.filter(date_created__lte=date_created).exclude(
+            date_created=date_created, id__gte=id
+        )
+    return queryset[: page_size + 1]
+
+
+def _get_page(rows: List[Any], page_size: int) -> Tuple[List[Any], Optional[str]]:
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last_row = rows[-1] if isinstance(rows[-1], dict) else vars(rows[-1])
+    return rows, encode_cursor(date_created=last_row["date_created"], id=last_row["id"])
+
+
+def paginate_by_keyset(
+    queryset: QuerySet, cursor: Optional[Tuple[datetime, int]], page_size: int
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    This function is used to fetch one page of a queryset ordered by newest first on
+    (date_created, id). The page is found by seeking past the cursor instead of an offset,
+    so every page costs the same. Works with model instances as well as `.values()` rows.
+    Returns the rows of the page and the cursor of the next page.
+    """
+    rows = list(_seek_by_keyset(queryset=queryset, cursor=cursor, page_size=page_size))
+    return _get_page(rows=rows, page_size=page_size)
+
+
+async def apaginate_by_keyset(
+    queryset: QuerySet, cursor: Optional[Tuple[datetime, int]], page_size: int
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Async variant of paginate_by_keyset, for async views
+    """
+    rows = [
+        row
+        async for row in _seek_by_keyset(
+            queryset=queryset, cursor=cursor, page_size=page_size
+        )
+    ]
+    return _get_page(rows=rows, page_size=page_size)
+
+
+class KeysetPaginationSerializer(serializers.Serializer):
+    """
+    Query params serializer for APIs paginated with paginate_by_keyset
+    """
+
+    cursor = serializers.CharField(required=False)
+    page_size = serializers.IntegerField(
+        min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE
+    )
+
+    def validate_cursor(self, value):
+        try:
+            return decode_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError(
+                INVALID_FIELD_VALUE.format(field="cursor")
+            )
@@ -0,0 +1,180 @@
+"""
+This file contains all the utils related to query budgets of APIs
+"""
+
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, FrozenSet, Iterator, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Counters counting the queries executed in the current context, see QueryCounter.counting
+_active_query_counters: ContextVar[FrozenSet["QueryCounter"]] = ContextVar(
+    "active_query_counters", default=frozenset()
+)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised when an API runs more queries than its declared budget
+    """
+
+
+class QueryCounter:
+    """
+    Counts the queries executed on the default database connection from the contexts it
+    counts in. Requests sharing a connection, as async views share the one of the async ORM
+    thread, therefore only count their own queries.
+    """
+
+    def __init__(self) -> None:
+        self.queries: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def __call__(self, execute, sql, params, many, context):
+        if self in _active_query_counters.get():
+            self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def _set_counting(self, counting: bool) -> Iterator[None]:
+        active_query_counters = _active_query_counters.get()
+        token = _active_query_counters.set(
+            active_query_counters | {self}
+            if counting
+            else active_query_counters - {self}
+        )
+        try:
+            yield
+        finally:
+            _active_query_counters.reset(token)
+
+    def counting(self):
+        """
+        This context manager is used to count the queries executed inside it, including the
+        ones it hands over to other threads with sync_to_async, which copies the context
+        """
+        return self._set_counting(counting=True)
+
+    def uncounted(self):
+        """
+        This context manager is used to leave the queries executed inside it out of the
+        count of this counter only
+        """
+        return self._set_counting(counting=False)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """
+    This context manager is used to count the queries executed inside it
+    """
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter), counter.counting():
+        yield counter
+
+
+def check_query_budget(
+    counter: QueryCounter, budget: int, name: str, raise_exception: bool
+) -> None:
+    if counter.count > budget:
+        message = f"{name} executed {counter.count} queries, budget is {budget}"
+        if raise_exception:
+            raise QueryBudgetExceeded(message + ":\n" + "\n".join(counter.queries))
+        logger.warning(message)
+
+
+@contextmanager
+def query_budget(budget: int, name: str = "block", raise_exception: bool = True):
+    """
+    This context manager is used to check that the block inside it does not execute more
+    than `budget` queries. Raises QueryBudgetExceeded, or logs a warning if `raise_exception`
+    is False.
+    """
+    with count_queries() as counter:
+        yield counter
+
+    check_query_budget(
+        counter=counter, budget=budget, name=name, raise_exception=raise_exception
+    )
+
+
+@asynccontextmanager
+async def aquery_budget(
+    budget: int, name: str = "block", raise_exception: bool = True
+) -> AsyncIterator[QueryCounter]:
+    """
+    Async variant of query_budget. The async ORM runs queries in the thread sensitive worker
+    thread, on the connection of that thread, so the counter is installed from there. The
+    connection is shared by the concurrent requests, which the counter does not count.
+    """
+    counter = QueryCounter()
+    await sync_to_async(lambda: connection.execute_wrappers.append(counter))()
+    try:
+        with counter.counting():
+            yield counter
+    finally:
+        await sync_to_async(lambda: connection.execute_wrappers.remove(counter))()
+
+    check_query_budget(
+        counter=counter, budget=budget, name=name, raise_exception=raise_exception
+    )
+
+
+class QueryBudgetMixin:
+    """
+    API view mixin enforcing `query_budget`, the maximum number of queries a request may run.
+    QUERY_BUDGET_MODE setting decides what happens when it is exceeded: "raise" (use in tests),
+    "log" or "off". Works with sync and async views.
+
+    Authentication is left out of the budget, it is the same for every API and its queries
+    depend on the state of the caches, e.g. the roles version lookup of a cold cache.
+    """
+
+    query_budget: Optional[int] = None
+    query_counter: Optional[QueryCounter] = None
+
+    def dispatch(self, request, *args, **kwargs):
+        mode = settings.QUERY_BUDGET_MODE
+        if self.query_budget is None or mode == "off":
+            return super().dispatch(request, *args, **kwargs)
+
+        if self.view_is_async:
+            return self.adispatch_within_budget(request, *args, **kwargs)
+
+        with query_budget(
+            budget=self.query_budget,
+            name=self.__class__.__name__,
+            raise_exception=mode == "raise",
+        ) as self.query_counter:
+            return super().dispatch(request, *args, **kwargs)
+
+    def perform_authentication(self, request):
+        if self.query_counter is None:
+            return super().perform_authentication(request)
+
+        if self.view_is_async:
+            return self.aperform_authentication_uncounted(request)
+
+        with self.query_counter.uncounted():
+            return super().perform_authentication(request)
+
+    async def aperform_authentication_uncounted(self, request):
+        with self.query_counter.uncounted():
+            return await super().perform_authentication(request)
+
+    async def adispatch_within_budget(self, request, *args, **kwargs):
+        async with aquery_budget(
+            budget=self.query_budget,
+            name=self.__class__.__name__,
+            raise_exception=settings.QUERY_BUDGET_MODE == "raise",
+        ) as self.query_counter:
+            return await super().dispatch(request, *args, **kwargs)
@@ -2,9 +2,18 @@
 This file contains all the utils related to response.
 """
 
-from typing import Any, Optional
+from hashlib import md5
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional
 
+from django.http import StreamingHttpResponse
+from django.utils.http import quote_etag
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+# Number of items rendered into each chunk of a streaming response
+STREAMING_RESPONSE_CHUNK_SIZE = 500
 
 
 class CustomResponse(Response):
@@ -23,3 +32,64 @@ class CustomResponse(Response):
             errors = {"message": errors}
 
         super().__init__(data={"data": data, "errors": errors}, **kwargs)
+
+
+class StreamingCustomResponse(StreamingHttpResponse):
+    """
+    Streaming variant of CustomResponse for large lists, with the same envelope and the same
+    JSON as the JSONRenderer. The items of `data` are rendered and sent chunk_size at a time
+    while they are iterated, so pass a lazy iterable, e.g. built on `.iterator()`, to never
+    hold the whole list nor its rendering in memory.
+
+    The items are iterated after the view returns, so their queries are not counted by the
+    query budget of the view, and an error raised meanwhile cuts the body short.
+    """
+
+    def __init__(
+        self,
+        *,
+        data: Iterable[Any],
+        chunk_size: int = STREAMING_RESPONSE_CHUNK_SIZE,
+        **kwargs,
+    ):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(
+            streaming_content=self.render_chunks(data=data, chunk_size=chunk_size),
+            **kwargs,
+        )
+
+    @staticmethod
+    def render_chunks(data: Iterable[Any], chunk_size: int) -> Iterator[bytes]:
+        item_separator, key_separator = (
+            (",", ":") if api_settings.COMPACT_JSON else (", ", ": ")
+        )
+        encoder = JSONEncoder(
+            ensure_ascii=not api_settings.UNICODE_JSON,
+            allow_nan=not api_settings.STRICT_JSON,
+            separators=(item_separator, key_separator),
+        )
+
+        yield f'{{"data"{key_separator}['.encode()
+        items = iter(data)
+        separator = ""
+        while chunk := list(islice(items, chunk_size)):
+            rendered = separator + item_separator.join(map(encoder.encode, chunk))
+            # Same escaping as the JSONRenderer, for the output to be valid javascript
+            yield rendered.replace("\u2028", "\\u2028").replace(
+                "\u2029", "\\u2029"
+            ).encode()
+            separator = item_separator
+        yield f']{item_separator}"errors"{key_separator}null}}'.encode()
+
+
+def build_etag(request, version: str) -> str:
+    """
+    This function is used to build the ETag of a response from the version of the data it
+    is built from. The user and the query string are part of it, as each user, filter and page
+    is a representation of its own.
+    """
+    return quote_etag(
+        md5(
+            f"{version}:{request.user.id}:{request.get_full_path()}".encode()
+        ).hexdigest()
+    )
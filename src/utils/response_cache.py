@@ -0,0 +1,148 @@
+"""
+This file contains all the utils related to caching the payloads of responses
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+RESPONSE_CACHE_ALIAS = "responses"
+RESPONSE_CACHE_KEY = "responses:{name}:{key}"
+RESPONSE_CACHE_LOCK_KEY = "responses:{name}:{key}:lock"
+RESPONSE_CACHE_COUNTER_KEY = "responses:{name}:{event}"
+RESPONSE_CACHE_EVENTS = ("hits", "misses")
+# Seconds between two looks at the cache while another worker builds a payload
+RESPONSE_CACHE_POLL_INTERVAL = 0.05
+
+
+class ResponseCache:
+    """
+    Cache of response payloads stored in the RESPONSE_CACHE_ALIAS django cache. Keys are
+    expected to carry a version of the data, so entries are never invalidated in place, a
+    change of the data changes the key and the stale entry expires after
+    RESPONSE_CACHE_TIMEOUT seconds.
+
+    A cold entry is built by one worker only, the others wait for it up to
+    RESPONSE_CACHE_LOCK_TIMEOUT seconds and build it themselves after that, e.g. when the
+    building worker died. Hits and misses are counted in the cache itself, so the counters
+    are shared by the workers using a shared backend.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    @property
+    def cache(self):
+        return caches[RESPONSE_CACHE_ALIAS]
+
+    def _count(self, event: str) -> None:
+        cache_key = RESPONSE_CACHE_COUNTER_KEY.format(name=self.name, event=event)
+        try:
+            self.cache.incr(cache_key)
+        except ValueError:
+            # incr fails on a missing key, unless a concurrent first count added it meanwhile
+            if not self.cache.add(cache_key, 1, timeout=None):
+                self.cache.incr(cache_key)
+
+    def get_or_build(self, key: str, build: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        This function is used to get the payload cached under key, building and caching it
+        when missing. Returns the payload and whether it was a hit.
+        """
+        cache_key = RESPONSE_CACHE_KEY.format(name=self.name, key=key)
+        payload = self.cache.get(cache_key)
+        if payload is not None:
+            self._count("hits")
+            return payload, True
+
+        lock_key = RESPONSE_CACHE_LOCK_KEY.format(name=self.name, key=key)
+        lock_timeout = settings.RESPONSE_CACHE_LOCK_TIMEOUT
+        if not self.cache.add(lock_key, 1, timeout=lock_timeout):
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(RESPONSE_CACHE_POLL_INTERVAL)
+                payload = self.cache.get(cache_key)
+                if payload is not None:
+                    self._count("hits")
+                    return payload, True
+
+        self._count("misses")
+        try:
+            payload = build()
+            self.cache.set(cache_key, payload, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+        finally:
+            self.cache.delete(lock_key)
+        return payload, False
+
+    async def _acount(self, event: str) -> None:
+        cache_key = RESPONSE_CACHE_COUNTER_KEY.format(name=self.name, event=event)
+        try:
+            await self.cache.aincr(cache_key)
+        except ValueError:
+            if not await self.cache.aadd(cache_key, 1, timeout=None):
+                await self.cache.aincr(cache_key)
+
+    async def aget_or_build(
+        self, key: str, build: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Async variant of get_or_build, for async views. Waiting for another worker does not
+        block the event loop.
+        """
+        cache_key = RESPONSE_CACHE_KEY.format(name=self.name, key=key)
+        payload = await self.cache.aget(cache_key)
+        if payload is not None:
+            await self._acount("hits")
+            return payload, True
+
+        lock_key = RESPONSE_CACHE_LOCK_KEY.format(name=self.name, key=key)
+        lock_timeout = settings.RESPONSE_CACHE_LOCK_TIMEOUT
+        if not await self.cache.aadd(lock_key, 1, timeout=lock_timeout):
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(RESPONSE_CACHE_POLL_INTERVAL)
+                payload = await self.cache.aget(cache_key)
+                if payload is not None:
+                    await self._acount("hits")
+                    return payload, True
+
+        await self._acount("misses")
+        try:
+            payload = await build()
+            await self.cache.aset(
+                cache_key, payload, timeout=settings.RESPONSE_CACHE_TIMEOUT
+            )
+        finally:
+            await self.cache.adelete(lock_key)
+        return payload, False
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        This function is used to get the hit and miss counts of the cache
+        """
+        counts = self.cache.get_many(
+            [
+                RESPONSE_CACHE_COUNTER_KEY.format(name=self.name, event=event)
+                for event in RESPONSE_CACHE_EVENTS
+            ]
+        )
+        return {
+            event: counts.get(
+                RESPONSE_CACHE_COUNTER_KEY.format(name=self.name, event=event), 0
+            )
+            for event in RESPONSE_CACHE_EVENTS
+        }
+
+    def reset_stats(self) -> None:
+        """
+        This function is used to reset the hit and miss counts of the cache
+        """
+        self.cache.delete_many(
+            [
+                RESPONSE_CACHE_COUNTER_KEY.format(name=self.name, event=event)
+                for event in RESPONSE_CACHE_EVENTS
+            ]
+        )
@@ -0,0 +1,42 @@
+"""
+This file contains all the utils related to serializers
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def time_to_representation(value) -> Optional[str]:
+    """
+    Same output as rest_framework TimeField with the default ISO 8601 format
+    """
+    return None if value is None else value.isoformat()
+
+
+class CompiledSerializer:
+    """
+    Fast path serializer for `.values()` rows. The output fields are compiled once into a
+    tuple of (key, getter) pairs, so serializing a row is a single dict comprehension
+    instead of walking a tree of serializer fields.
+
+    `columns` are the values to fetch from the queryset and `fields` maps every output key,
+    in output order, to a getter receiving the row.
+    """
+
+    def __init__(
+        self, columns: Tuple[str, ...], fields: Dict[str, Callable[[dict], Any]]
+    ) -> None:
+        self.columns = columns
+        self.fields = tuple(fields.items())
+
+    def to_representation(self, row: dict) -> dict:
+        return {key: getter(row) for key, getter in self.fields}
+
+    def many(self, rows: Iterable[dict]) -> List[dict]:
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+    def iterate(self, rows: Iterable[dict]) -> Iterator[dict]:
+        """
+        Lazy variant of many, serializing each row only when it is consumed
+        """
+        return map(self.to_representation, rows)
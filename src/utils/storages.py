@@ -0,0 +1,86 @@
+"""
+This file contains all the storage backends
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+@deconstructible(path="utils.storages.ContentAddressedStorage")
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage naming every file by the sha256 of its content, under directories
+    sharded by the first two bytes of the hash:
+
+        <directory of the given name>/<hash[:2]>/<hash[2:4]>/<hash>.<extension>
+
+    Saving content that is already stored writes nothing and returns the existing name,
+    so identical uploads share one file. Deleting the files no longer referenced is up
+    to the owners of the references.
+    """
+
+    name_pattern = re.compile(r"(^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)?$")
+
+    def is_content_addressed(self, name: str) -> bool:
+        return bool(self.name_pattern.search(name))
+
+    def get_content_name(self, name: str, digest: str) -> str:
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        return os.path.join(directory, digest[:2], digest[2:4], digest + extension)
+
+    def _makedirs(self, directory: str) -> None:
+        if self.directory_permissions_mode is not None:
+            old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+    def _save(self, name, content):
+        """
+        The content is hashed while being written to a temporary file, which is then renamed
+        to its content name, or dropped when that content is already stored
+        """
+        directory = os.path.dirname(self.path(name))
+        self._makedirs(directory)
+
+        digest = hashlib.sha256()
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=directory, prefix=".tmp-"
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as temporary_file:
+                for chunk in content.chunks(chunk_size=HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+                    temporary_file.write(chunk)
+
+            name = self.get_content_name(name=name, digest=digest.hexdigest())
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                os.remove(temporary_path)
+            else:
+                self._makedirs(os.path.dirname(full_path))
+                if self.file_permissions_mode is not None:
+                    os.chmod(temporary_path, self.file_permissions_mode)
+                # Concurrent saves of the same content replace it with identical bytes
+                os.replace(temporary_path, full_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        return str(name).replace("\\", "/")
+
+    def get_available_name(self, name, max_length=None):
+        # The name is replaced by the content name in _save, existing names are fine
+        return name
@@ -0,0 +1,252 @@
+"""
+This file contains all the utils shared by the tests of the modules
+"""
+
+import json
+from contextlib import contextmanager
+from datetime import time
+from importlib import import_module, reload
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from typing import Callable, Dict, Iterator, List, Optional
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.http import HttpResponseBase
+from django.test import (
+    AsyncClient,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import clear_url_caches
+from PIL import Image
+from rest_framework.test import APIClient, APIRequestFactory
+
+from rosters.models import Roster, RosterUserSchedule
+from rosters.services import (
+    bulk_create_roster_user_schedules,
+    create_roster,
+    create_roster_manager,
+)
+from users.models import User, UserRole
+from users.tokens import get_token_for_user
+from utils.files import CONTENT_ADDRESSED_STORAGE, FILE_STORAGE
+
+TEST_USER_PASSWORD = "Password@123"
+# Url modules choosing between the sync and async variants of the views with ASYNC_VIEWS
+ASYNC_VIEWS_URLCONFS = ("users.urls", "rosters.urls")
+
+
+def create_user(email: str, role: int) -> User:
+    """
+    This function is used to create a user having given role
+    """
+    user = User.objects.create_user(
+        email=email, first_name=email.split("@")[0], password=TEST_USER_PASSWORD
+    )
+    UserRole.objects.create(user=user, role=role)
+    return user
+
+
+def get_client_for(user: User) -> APIClient:
+    """
+    This function is used to get an API client authenticated with an access token of a user
+    """
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {get_token_for_user(user=user).access_token}"
+    )
+    return client
+
+
+def create_roster_with_schedules(
+    manager: User,
+    staff_members: List[User],
+    shift: int = RosterUserSchedule.Shift.MORNING_SHIFT,
+) -> Roster:
+    """
+    This function is used to create an active roster of a manager, scheduling the staff
+    members every day for the morning (9 to 13) or evening (14 to 18) shift
+    """
+    _, roster = create_roster(title="Roster", is_active=True, created_by=manager)
+    create_roster_manager(roster=roster, manager=manager)
+    is_morning = shift == RosterUserSchedule.Shift.MORNING_SHIFT
+    bulk_create_roster_user_schedules(
+        roster=roster,
+        data=[
+            {
+                "user": staff_member,
+                "working_day": working_day,
+                "shift": shift,
+                "start_time": time(hour=9 if is_morning else 14),
+                "end_time": time(hour=13 if is_morning else 18),
+            }
+            for staff_member in staff_members
+            for working_day in RosterUserSchedule.WorkingDay.values
+        ],
+    )
+    return roster
+
+
+def create_all_day_roster(manager: User, staff_member: User) -> Roster:
+    """
+    This function is used to create an active roster of a manager with a shift of the staff
+    member open for attendance all day long, every day
+    """
+    _, roster = create_roster(title="Roster", is_active=True, created_by=manager)
+    create_roster_manager(roster=roster, manager=manager)
+    bulk_create_roster_user_schedules(
+        roster=roster,
+        data=[
+            {
+                "user": staff_member,
+                "working_day": working_day,
+                "shift": RosterUserSchedule.Shift.MORNING_SHIFT,
+                "start_time": time.min,
+                "end_time": time.max,
+            }
+            for working_day in RosterUserSchedule.WorkingDay.values
+        ],
+    )
+    return roster
+
+
+def get_image(
+    name: str = "attendance.jpg", size=(64, 64), image_format: str = "JPEG"
+) -> SimpleUploadedFile:
+    """
+    This function is used to get an uploaded image of the given size and format
+    """
+    content = BytesIO()
+    Image.new("RGB", size, color=(200, 120, 80)).save(content, format=image_format)
+    return SimpleUploadedFile(
+        name=name,
+        content=content.getvalue(),
+        content_type=f"image/{image_format.lower()}",
+    )
+
+
+def use_temporary_storages(test_case: SimpleTestCase) -> str:
+    """
+    This function is used to store the files of a test in a directory of its own, removed
+    once the test ends. Returns the directory.
+    """
+    media_root = TemporaryDirectory()
+    test_case.addCleanup(media_root.cleanup)
+    for storage in (FILE_STORAGE, CONTENT_ADDRESSED_STORAGE):
+        for attribute in ("base_location", "location"):
+            patcher = mock.patch.object(storage, attribute, media_root.name)
+            patcher.start()
+            test_case.addCleanup(patcher.stop)
+    return media_root.name
+
+
+def get_json(response: HttpResponseBase):
+    """
+    This function is used to get the JSON body of a response, streamed or not
+    """
+    if response.streaming:
+        return json.loads(b"".join(response.streaming_content))
+    return json.loads(response.content)
+
+
+def _reload_urlconfs() -> None:
+    for urlconf in (*ASYNC_VIEWS_URLCONFS, settings.ROOT_URLCONF):
+        reload(import_module(urlconf))
+    clear_url_caches()
+
+
+@contextmanager
+def async_views() -> Iterator[None]:
+    """
+    This context manager is used to serve the async variants of the views inside it, as
+    ASYNC_VIEWS does. The url modules pick the views when imported, so they are reloaded.
+    """
+    try:
+        with override_settings(ASYNC_VIEWS=True):
+            _reload_urlconfs()
+            yield
+    finally:
+        _reload_urlconfs()
+
+
+class AsyncViewsTestMixin:
+    """
+    Test case mixin serving the async variants of the views, as ASYNC_VIEWS does, with
+    helpers sending a GET request to an async view through the ASGI handler and to its sync
+    variant directly
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(async_views())
+
+    def send_async_request(
+        self,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+    ) -> HttpResponseBase:
+        async def send():
+            client = AsyncClient()
+            client.cookies.load(cookies or {})
+            return await client.get(path, headers=headers)
+
+        return async_to_sync(send)()
+
+    def send_sync_request(
+        self,
+        view_class,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+    ) -> HttpResponseBase:
+        factory = APIRequestFactory()
+        factory.cookies.load(cookies or {})
+        response = view_class.as_view()(factory.get(path, headers=headers))
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+
+def explain(queryset: QuerySet) -> str:
+    """
+    This function is used to get the query plan of a queryset. Sequential scans are turned
+    off on PostgreSQL, which would rather scan the few rows of the test tables.
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+
+@override_settings(QUERY_BUDGET_MODE="raise")
+class QueryBudgetTestCase(TransactionTestCase):
+    """
+    Base test case of the query budgets of the APIs, a request exceeding the budget of its
+    API fails with QueryBudgetExceeded. Tests are not wrapped in a transaction, which would
+    turn the transactions of the APIs into savepoint queries counted against the budgets.
+    """
+
+    def clear_caches(self) -> None:
+        for cache in caches.all():
+            cache.clear()
+
+    def assertWithinQueryBudget(
+        self, send_request: Callable[[], HttpResponseBase], status_code: int
+    ) -> None:
+        """
+        Sends a request with cold caches, then another one with the caches it warmed
+        """
+        self.clear_caches()
+        for _ in range(2):
+            response = send_request()
+            self.assertEqual(response.status_code, status_code)
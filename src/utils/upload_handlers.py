@@ -0,0 +1,76 @@
+"""
+This file contains all the upload handlers
+"""
+
+from typing import Dict
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+from utils.constants import FILE_SIZE_LIMIT_EXCEEDED, UNSUPPORTED_IMAGE_TYPE
+
+# Leading bytes of the image formats accepted for the checked fields
+IMAGE_SIGNATURES = (
+    b"\xff\xd8\xff",  # JPEG
+    b"\x89PNG\r\n\x1a\n",  # PNG
+)
+IMAGE_SIGNATURE_LENGTH = max(len(signature) for signature in IMAGE_SIGNATURES)
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """
+    Checks the file fields listed in IMAGE_UPLOAD_FIELDS while the multipart body is being
+    read, before the Memory and TemporaryFile handlers buffer it. The upload is aborted as
+    soon as a file is bigger than the max size of its field or does not start with a JPEG
+    or PNG signature, without reading the rest of the body. The reason is kept on the
+    request, see `get_rejected_uploads`.
+    """
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        max_file_size = settings.IMAGE_UPLOAD_FIELDS.get(field_name)
+        self.max_bytes = max_file_size * 1024 * 1024 if max_file_size else None
+        self.header = b""
+
+    def reject(self, message: str) -> None:
+        rejected_uploads = getattr(self.request, "rejected_uploads", {})
+        rejected_uploads[self.field_name] = [message]
+        self.request.rejected_uploads = rejected_uploads
+        raise StopUpload(connection_reset=True)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.max_bytes is None:
+            return raw_data
+
+        if start + len(raw_data) > self.max_bytes:
+            self.reject(
+                FILE_SIZE_LIMIT_EXCEEDED.format(
+                    max_file_size=settings.IMAGE_UPLOAD_FIELDS[self.field_name]
+                )
+            )
+
+        if len(self.header) < IMAGE_SIGNATURE_LENGTH:
+            self.header += raw_data[: IMAGE_SIGNATURE_LENGTH - len(self.header)]
+            if len(self.header) == IMAGE_SIGNATURE_LENGTH:
+                self.check_signature()
+
+        return raw_data
+
+    def check_signature(self) -> None:
+        if not self.header.startswith(IMAGE_SIGNATURES):
+            self.reject(UNSUPPORTED_IMAGE_TYPE)
+
+    def file_complete(self, file_size):
+        # Files shorter than the longest signature are only checked once complete
+        if self.max_bytes is not None and len(self.header) < IMAGE_SIGNATURE_LENGTH:
+            self.check_signature()
+        return None
+
+
+def get_rejected_uploads(request) -> Dict[str, list]:
+    """
+    Returns the errors of the uploads aborted by ImageUploadHandler keyed by field name,
+    the request body is parsed if it was not yet
+    """
+    request.data
+    return getattr(request, "rejected_uploads", {})